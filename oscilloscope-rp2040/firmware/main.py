@@ -1,8 +1,12 @@
 # pyright: reportMissingImports=false
 
+import _thread
 import array
 import gc
+import json
+import struct
 import sys
+import time
 
 import machine
 import micropython
@@ -12,12 +16,62 @@ import uselect
 ADC_PIN_NUM = 28
 MAX_SAMPLES = 16384  # Science Mode Buffer
 LIVE_SAMPLES = 1024  # Video Mode Buffer
+MAX_DECIMATION = 64  # Largest sample-skip factor accepted by 'b'
+FIRMWARE_VERSION = "1.7"
+
+# Sample Packing ('m' command): raw 16-bit words, two 12-bit codes in 3 bytes,
+# or a length-prefixed stream of zigzag varint deltas (1-2 bytes per sample)
+PACKING_RAW16 = 0
+PACKING_12BIT = 1
+PACKING_DELTA = 2
+PACKINGS = (PACKING_RAW16, PACKING_12BIT, PACKING_DELTA)
+
+# Rate Reduction ('r' command): keep every k-th conversion or average k of them
+RATE_DECIMATE = 0
+RATE_AVERAGE = 1
+
+# Edge Trigger for Video Mode ('t' command)
+TRIGGER_OFF = 0
+TRIGGER_RISING = 1
+TRIGGER_FALLING = 2
+TRIGGER_HYSTERESIS = 256  # Codes the signal must retreat past to re-arm (~13 mV)
+
+# Continuous Mode Framing: magic, n_samples, seq, ticks_us at the start and
+# end of capture (little-endian). Firmware <= 1.5 sent 0xA55A without the end.
+FRAME_MAGIC = 0xA55B
+HEADER_FMT = "<HHIII"
+HEADER_SIZE = 16
+
+# Capture Timestamps ('k' command): ticks_us at start and end of capture,
+# appended after the samples of 's' and 'b' replies
+STAMP_FMT = "<II"
+STAMP_SIZE = 8
 
 # Setup ADC
 adc = machine.ADC(machine.Pin(ADC_PIN_NUM))
 # Allocate max memory once to avoid fragmentation
 adc_buffer = array.array("H", [0] * MAX_SAMPLES)
 
+# Continuous Mode: two ping-pong buffers plus a scratch buffer that absorbs
+# frames captured while both buffers are still queued for transmission.
+stream_buffers = [array.array("H", [0] * LIVE_SAMPLES) for _ in range(2)]
+scratch_buffer = array.array("H", [0] * LIVE_SAMPLES)
+stream_seq = [0, 0]
+stream_ticks = [0, 0]
+stream_ticks_end = [0, 0]
+stream_ready = [False, False]
+stream_state = {"running": False, "worker_done": True}
+frame_header = bytearray(HEADER_SIZE)
+
+# Transmit buffer for encoded payloads (worst case: delta, 2 + 2 bytes/sample)
+packed_buffer = bytearray(2 + MAX_SAMPLES * 2)
+transport = {"packing": PACKING_RAW16}
+rate = {"factor": 1, "mode": RATE_DECIMATE}
+trigger = {"slope": TRIGGER_OFF, "level": 32768, "holdoff": 0, "timeout": 100000}
+trigger_state = {"last": 0}
+stamps = {"enabled": False}
+stamp_trailer = bytearray(STAMP_SIZE)
+
 
 # Pre-compile the capture function to arm machine code
 @micropython.native
@@ -41,6 +95,417 @@ def capture_burst(adc_obj, buf, size: int):
         buf[i] = adc_obj.read_u16()
 
 
+@micropython.native
+def capture_decimated(adc_obj, buf, size: int, step: int):
+    """
+    Like capture_burst, but keeps only every `step`-th conversion.
+
+    The skipped conversions are still performed so the effective sample
+    rate is exactly the native rate divided by `step`.
+    """
+    for i in range(size):
+        for _ in range(step - 1):
+            adc_obj.read_u16()
+        buf[i] = adc_obj.read_u16()
+
+
+@micropython.viper
+def pack12(src, dst, size: int) -> int:
+    """
+    Packs the top 12 bits of `size` read_u16() values, two per 3 bytes.
+
+    Byte layout per pair (a, b): a[7:0], b[3:0]a[11:8], b[11:4]. An odd
+    `size` packs one padding sample from the buffer. Returns bytes written.
+    """
+    s = ptr16(src)  # noqa: F821 (viper builtin)
+    d = ptr8(dst)  # noqa: F821 (viper builtin)
+    i = 0
+    j = 0
+    while i < size:
+        a = s[i] >> 4
+        b = s[i + 1] >> 4
+        d[j] = a & 0xFF
+        d[j + 1] = (a >> 8) | ((b & 0x0F) << 4)
+        d[j + 2] = b >> 4
+        i += 2
+        j += 3
+    return j
+
+
+@micropython.viper
+def pack_delta(src, dst, size: int) -> int:
+    """
+    Encodes the 12-bit codes of `size` read_u16() values as varint deltas.
+
+    Each code minus its predecessor (the first one minus 0) is zigzag
+    mapped to an unsigned value and written as a little-endian base-128
+    varint: 1 byte for |delta| < 64, else 2 bytes. Bytes 0-1 of `dst` hold
+    the encoded length (little-endian). Returns total bytes written.
+    """
+    s = ptr16(src)  # noqa: F821 (viper builtin)
+    d = ptr8(dst)  # noqa: F821 (viper builtin)
+    prev = 0
+    j = 2
+    i = 0
+    while i < size:
+        code = s[i] >> 4
+        delta = code - prev
+        prev = code
+        if delta >= 0:
+            z = delta << 1
+        else:
+            z = ((0 - delta) << 1) - 1
+        if z < 0x80:
+            d[j] = z
+            j += 1
+        else:
+            d[j] = (z & 0x7F) | 0x80
+            d[j + 1] = z >> 7
+            j += 2
+        i += 1
+    n = j - 2
+    d[0] = n & 0xFF
+    d[1] = n >> 8
+    return j
+
+
+def send_samples(out, buf, size):
+    """Writes the first `size` samples of `buf` in the current packing."""
+    packing = transport["packing"]
+    if packing == PACKING_12BIT:
+        n_bytes = pack12(buf, packed_buffer, size)
+        out.write(memoryview(packed_buffer)[:n_bytes])
+    elif packing == PACKING_DELTA:
+        n_bytes = pack_delta(buf, packed_buffer, size)
+        out.write(memoryview(packed_buffer)[:n_bytes])
+    else:
+        out.write(memoryview(buf)[:size])
+
+
+def set_packing(line):
+    """Handles 'm<mode>' (newline-terminated); unknown modes are ignored."""
+    args = parse_int_args(line)
+    if args and len(args) == 1 and args[0] in PACKINGS:
+        transport["packing"] = args[0]
+
+
+@micropython.native
+def capture_averaged(adc_obj, buf, size: int, factor: int):
+    """
+    Like capture_burst, but stores the mean of every `factor` conversions.
+
+    Box-averaging before transmission acts as a simple anti-alias filter
+    and adds resolution for slow signals (oversampling).
+    """
+    for i in range(size):
+        acc = 0
+        for _ in range(factor):
+            acc += adc_obj.read_u16()
+        buf[i] = acc // factor
+
+
+@micropython.native
+def capture_triggered(
+    adc_obj,
+    buf,
+    size: int,
+    level: int,
+    rising: bool,
+    timeout: int,
+    factor: int,
+    average: bool,
+):
+    """
+    Waits for an edge through `level`, then fills `buf` from that sample on.
+
+    The trigger arms once the signal is TRIGGER_HYSTERESIS codes on the far
+    side of `level`, so noise around the level cannot re-trigger. If no edge
+    arrives within `timeout` microseconds the frame is captured free-running
+    (scope 'auto' mode), so the host never stalls on a flat input.
+
+    The edge is searched at the native rate; the frame itself is captured
+    at the 'r' rate, starting with the crossing conversion: every `factor`-th
+    conversion is kept, or every `factor` conversions averaged.
+    """
+    start = time.ticks_us()
+    armed = False
+    v = 0
+    while True:
+        v = adc_obj.read_u16()
+        if rising:
+            if armed and v >= level:
+                break
+            if v < level - TRIGGER_HYSTERESIS:
+                armed = True
+        else:
+            if armed and v <= level:
+                break
+            if v > level + TRIGGER_HYSTERESIS:
+                armed = True
+        if time.ticks_diff(time.ticks_us(), start) > timeout:
+            break
+    if average:
+        for _ in range(factor - 1):
+            v += adc_obj.read_u16()
+        buf[0] = v // factor
+        for i in range(1, size):
+            acc = 0
+            for _ in range(factor):
+                acc += adc_obj.read_u16()
+            buf[i] = acc // factor
+    else:
+        buf[0] = v
+        for i in range(1, size):
+            for _ in range(factor - 1):
+                adc_obj.read_u16()
+            buf[i] = adc_obj.read_u16()
+
+
+def capture_video(buf, size):
+    """Captures a Video Mode frame, honouring the 't' trigger if enabled."""
+    slope = trigger["slope"]
+    if slope == TRIGGER_OFF:
+        capture(buf, size)
+        return
+
+    # Holdoff: no new trigger until `holdoff` us after the previous one
+    holdoff = trigger["holdoff"]
+    while time.ticks_diff(time.ticks_us(), trigger_state["last"]) < holdoff:
+        pass
+    capture_triggered(
+        adc,
+        buf,
+        size,
+        trigger["level"],
+        slope == TRIGGER_RISING,
+        trigger["timeout"],
+        rate["factor"],
+        rate["factor"] > 1 and rate["mode"] == RATE_AVERAGE,
+    )
+    trigger_state["last"] = time.ticks_us()
+
+
+def set_trigger(line):
+    """
+    Handles 't<slope>[,<level>,<holdoff_us>,<timeout_us>]' (newline-terminated).
+
+    Slope 0 disables the trigger, 1 triggers on rising and 2 on falling
+    edges through the raw `level` code. Replies with one JSON line echoing
+    the active setting; invalid arguments produce no reply.
+    """
+    args = parse_int_args(line)
+    if not args or len(args) not in (1, 4):
+        return
+    slope = args[0]
+    if slope not in (TRIGGER_OFF, TRIGGER_RISING, TRIGGER_FALLING):
+        return
+    if len(args) == 4:
+        level, holdoff, timeout = args[1], args[2], args[3]
+        if not (0 <= level <= 65535 and holdoff >= 0 and timeout > 0):
+            return
+        trigger["level"] = level
+        trigger["holdoff"] = holdoff
+        trigger["timeout"] = timeout
+    trigger["slope"] = slope
+    sys.stdout.write(json.dumps(trigger) + "\n")
+
+
+def capture(buf, size):
+    """Captures `size` samples into `buf` at the rate set by 'r'."""
+    factor = rate["factor"]
+    if factor == 1:
+        capture_burst(adc, buf, size)
+    elif rate["mode"] == RATE_AVERAGE:
+        capture_averaged(adc, buf, size, factor)
+    else:
+        capture_decimated(adc, buf, size, factor)
+
+
+def set_rate(line):
+    """
+    Handles 'r<factor>[,<mode>]' (newline-terminated).
+
+    Mode 0 decimates, mode 1 box-averages. Applies to every later capture
+    (s, v, c, and b without its own decimation). Replies with one JSON line
+    echoing the active setting; invalid arguments produce no reply.
+    """
+    args = parse_int_args(line)
+    if not args or len(args) > 2:
+        return
+    factor = args[0]
+    mode = args[1] if len(args) == 2 else RATE_AVERAGE
+    if not (0 < factor <= MAX_DECIMATION and mode in (RATE_DECIMATE, RATE_AVERAGE)):
+        return
+    rate["factor"] = factor
+    rate["mode"] = mode
+    sys.stdout.write(json.dumps({"factor": factor, "mode": mode}) + "\n")
+
+
+def set_stamps(line):
+    """
+    Handles 'k<0|1>' (newline-terminated).
+
+    When enabled, every 's' and 'b' reply is followed by an 8-byte trailer
+    holding ticks_us() before the first and after the last conversion, so
+    the host can measure the effective sampling rate of each burst.
+    Replies with one JSON line; invalid arguments produce no reply.
+    """
+    args = parse_int_args(line)
+    if not args or len(args) != 1 or args[0] not in (0, 1):
+        return
+    stamps["enabled"] = args[0] == 1
+    sys.stdout.write(json.dumps({"stamps": args[0]}) + "\n")
+
+
+def send_stamps(out, t0, t1):
+    """Sends the capture timestamp trailer if enabled with 'k'."""
+    if stamps["enabled"]:
+        struct.pack_into(STAMP_FMT, stamp_trailer, 0, t0, t1)
+        out.write(stamp_trailer)
+
+
+def parse_int_args(line):
+    """
+    Parses a comma-separated argument line (e.g. '1024,4') into ints.
+
+    Returns None if any field is not an integer.
+    """
+    try:
+        return [int(field) for field in line.strip().split(",") if field]
+    except ValueError:
+        return None
+
+
+def send_capabilities():
+    """Replies to '?' with a single JSON line describing buffer limits."""
+    caps = {
+        "fw": FIRMWARE_VERSION,
+        "max_samples": MAX_SAMPLES,
+        "live_samples": LIVE_SAMPLES,
+        "max_decimation": MAX_DECIMATION,
+        "commands": "svcxb?imrtk",
+        "packings": list(PACKINGS),
+    }
+    sys.stdout.write(json.dumps(caps) + "\n")
+
+
+def send_identity():
+    """Replies to 'i' so the host can detect that the firmware is ready."""
+    sys.stdout.write("SYSAUDIO-DAQ " + FIRMWARE_VERSION + "\n")
+
+
+def run_sized_burst(line):
+    """
+    Handles 'b<samples>[,<decimation>]' (newline-terminated).
+
+    Captures exactly the requested number of samples (GC disabled, as in
+    Science Mode) and sends only those. An explicit decimation overrides
+    the 'r' rate setting for this burst. Invalid arguments produce no reply;
+    the host validates against the '?' capabilities before sending.
+    """
+    args = parse_int_args(line)
+    if not args or len(args) > 2:
+        return
+    size = args[0]
+    step = args[1] if len(args) == 2 else 1
+    if not (0 < size <= MAX_SAMPLES and 0 < step <= MAX_DECIMATION):
+        return
+
+    gc.disable()
+    t0 = time.ticks_us()
+    if len(args) == 1:
+        capture(adc_buffer, size)
+    elif step == 1:
+        capture_burst(adc, adc_buffer, size)
+    else:
+        capture_decimated(adc, adc_buffer, size, step)
+    t1 = time.ticks_us()
+    gc.enable()
+    send_samples(sys.stdout.buffer, adc_buffer, size)
+    send_stamps(sys.stdout.buffer, t0, t1)
+    gc.collect()
+
+
+def continuous_capture_worker():
+    """
+    Core 1 sampler for Continuous Mode.
+
+    Fills the ping-pong buffers back-to-back. Every capture consumes one
+    sequence number, so the host can reconstruct exact sample positions.
+    If the target buffer has not been sent yet the frame is captured into
+    the scratch buffer and discarded, which shows up on the host as a
+    sequence gap rather than silently shifting time.
+    """
+    seq = 0
+    while stream_state["running"]:
+        slot = seq & 1
+        t0 = time.ticks_us()
+        if stream_ready[slot]:
+            capture(scratch_buffer, LIVE_SAMPLES)
+        else:
+            capture(stream_buffers[slot], LIVE_SAMPLES)
+            stream_seq[slot] = seq
+            stream_ticks[slot] = t0
+            stream_ticks_end[slot] = time.ticks_us()
+            stream_ready[slot] = True
+        seq += 1
+    stream_state["worker_done"] = True
+
+
+def run_continuous(poll_obj):
+    """
+    Continuous Mode transmit loop (core 0).
+
+    Starts the core 1 sampler and sends each completed buffer, prefixed
+    with a header, in sequence order until the host sends 'x'.
+
+    Parameters
+    ----------
+    poll_obj : uselect.poll
+        Poller registered on stdin, used to check for the stop command.
+    """
+    out = sys.stdout.buffer
+    stream_ready[0] = False
+    stream_ready[1] = False
+    stream_state["running"] = True
+    stream_state["worker_done"] = False
+    _thread.start_new_thread(continuous_capture_worker, ())
+
+    while True:
+        if poll_obj.poll(0) and sys.stdin.read(1) == "x":
+            break
+
+        ready_0 = stream_ready[0]
+        ready_1 = stream_ready[1]
+        if ready_0 and ready_1:
+            slot = 0 if stream_seq[0] < stream_seq[1] else 1
+        elif ready_0:
+            slot = 0
+        elif ready_1:
+            slot = 1
+        else:
+            continue
+
+        struct.pack_into(
+            HEADER_FMT,
+            frame_header,
+            0,
+            FRAME_MAGIC,
+            LIVE_SAMPLES,
+            stream_seq[slot],
+            stream_ticks[slot],
+            stream_ticks_end[slot],
+        )
+        out.write(frame_header)
+        send_samples(out, stream_buffers[slot], LIVE_SAMPLES)
+        stream_ready[slot] = False
+
+    stream_state["running"] = False
+    while not stream_state["worker_done"]:
+        time.sleep_ms(1)
+    gc.collect()
+
+
 def main():
     """
     Main firmware loop.
@@ -50,6 +515,26 @@ def main():
            during capture for stability. Sends full buffer.
     - 'v': Video Mode (Low Latency). Captures LIVE_SAMPLES. Sends partial
            buffer immediately. No GC manipulation for higher frame rates.
+           Starts on a signal edge when the 't' trigger is enabled.
+    - 'c': Continuous Mode (Gapless). Core 1 captures into ping-pong
+           buffers while core 0 sends header-prefixed frames, until 'x'.
+    - 'b': Sized Burst. Followed by a '<samples>[,<decimation>]' line; sends
+           exactly the requested number of samples.
+    - '?': Capability query. Replies with one JSON line.
+    - 'i': Identify / ping. Replies 'SYSAUDIO-DAQ <version>'.
+    - 'm': Sample packing. Followed by a '<mode>' line: 0 = raw 16-bit
+           words, 1 = 12-bit packed (3 bytes per 2 samples), 2 = delta
+           varint with a 2-byte length prefix. Applies to
+           every sample payload, including continuous frames.
+    - 'r': Rate reduction. Followed by a '<factor>[,<mode>]' line: keep
+           every factor-th conversion (mode 0) or average factor of them
+           (mode 1, default). Replies with one JSON line.
+    - 't': Edge trigger for 'v'. Followed by a
+           '<slope>[,<level>,<holdoff_us>,<timeout_us>]' line. Replies with
+           one JSON line.
+    - 'k': Capture timestamps. Followed by a '<0|1>' line; when enabled,
+           's' and 'b' replies end with a ticks_us start/end trailer.
+           Continuous frames always carry both ticks in their header.
     """
     poll_obj = uselect.poll()
     poll_obj.register(sys.stdin, uselect.POLLIN)
@@ -65,23 +550,58 @@ def main():
         # 's' = SCIENCE MODE (High Res, Deep Buffer)
         if cmd == "s":
             gc.disable()
-            capture_burst(adc, adc_buffer, MAX_SAMPLES)
+            t0 = time.ticks_us()
+            capture(adc_buffer, MAX_SAMPLES)
+            t1 = time.ticks_us()
             gc.enable()
             # Send FULL buffer
-            sys.stdout.buffer.write(memoryview(adc_buffer))
+            send_samples(sys.stdout.buffer, adc_buffer, MAX_SAMPLES)
+            send_stamps(sys.stdout.buffer, t0, t1)
             gc.collect()
 
         # 'v' = VIDEO MODE (Low Latency, Short Buffer)
         elif cmd == "v":
             # No need to disable GC for short bursts, keeps it snappy
-            capture_burst(adc, adc_buffer, LIVE_SAMPLES)
+            capture_video(adc_buffer, LIVE_SAMPLES)
 
             # Send ONLY the first 1024 samples
-            # This slicing [:LIVE_SAMPLES] is very fast (no copying)
-            sys.stdout.buffer.write(memoryview(adc_buffer)[:LIVE_SAMPLES])
+            # Raw slicing [:LIVE_SAMPLES] is very fast (no copying)
+            send_samples(sys.stdout.buffer, adc_buffer, LIVE_SAMPLES)
 
             # Note: We don't GC here to keep frame rate high
 
+        # 'c' = CONTINUOUS MODE (Gapless, Sequence-Numbered Frames)
+        elif cmd == "c":
+            run_continuous(poll_obj)
+
+        # 'b' = SIZED BURST (Length + Optional Decimation)
+        elif cmd == "b":
+            run_sized_burst(sys.stdin.readline())
+
+        # '?' = CAPABILITY QUERY
+        elif cmd == "?":
+            send_capabilities()
+
+        # 'i' = IDENTIFY (Connection Handshake)
+        elif cmd == "i":
+            send_identity()
+
+        # 'm' = SAMPLE PACKING (Raw 16-bit / 12-bit Packed / Delta)
+        elif cmd == "m":
+            set_packing(sys.stdin.readline())
+
+        # 'r' = RATE REDUCTION (Decimate / Box-Average)
+        elif cmd == "r":
+            set_rate(sys.stdin.readline())
+
+        # 't' = EDGE TRIGGER (Video Mode)
+        elif cmd == "t":
+            set_trigger(sys.stdin.readline())
+
+        # 'k' = CAPTURE TIMESTAMPS (Burst Trailer)
+        elif cmd == "k":
+            set_stamps(sys.stdin.readline())
+
 
 if __name__ == "__main__":
     main()
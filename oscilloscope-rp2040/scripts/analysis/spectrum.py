@@ -21,7 +21,7 @@ def main() -> None:
 
     if filepath:
         print(f"Loading: {filepath}")
-        signal, fs = io.load_signal(filepath)
+        signal, fs = io.load_signal(filepath, volts=True)
 
         viz.analyze_signal_plot(signal, fs, title=f"File: {os.path.basename(filepath)}")
 
@@ -0,0 +1,34 @@
+"""
+Acquisition service for sharing one DAQ stream between several processes.
+
+Owns the serial port and publishes the continuous stream into shared memory
+(`sysaudio.service`). Start this first, then attach any number of consumers
+with `service.SharedStreamReader()` in place of `daq.DAQInterface()`.
+"""
+
+from sysaudio import config, daq, service, virtual
+
+# Configuration
+DURATION: float | None = None  # Seconds to run (None = until Ctrl+C)
+USE_VIRTUAL: bool = False  # Publish the firmware emulator instead of hardware
+
+
+def main() -> None:
+    """
+    Main execution entry point.
+
+    Connects to the DAQ, creates the shared memory ring and streams into it
+    until stopped, then removes the segment.
+    """
+    transport = virtual.VirtualDAQ() if USE_VIRTUAL else None
+
+    with daq.DAQInterface(transport=transport) as device:
+        with service.AcquisitionService(device, name=config.SHM_NAME) as svc:
+            print(f"   Readers attach with SharedStreamReader('{svc.name}')")
+            svc.run(duration=DURATION)
+
+    print("✅ Acquisition service stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Benchmark for pipelined 'v' streaming.
+
+Measures the sample duty cycle (captured samples / wall time x fs) of the
+DAQ stream at several pipeline depths, so the effect of keeping multiple
+requests in flight on USB round-trip latency can be compared directly.
+"""
+
+from sysaudio import daq, virtual
+
+# Configuration
+DEPTHS: list[int] = [1, 2, 4, 8]
+DURATION: float = 3.0  # Seconds per depth
+USE_VIRTUAL: bool = False  # Benchmark against the firmware emulator instead
+
+
+def main() -> None:
+    """
+    Main execution entry point.
+
+    Connects once, runs `measure_duty_cycle` for each configured depth,
+    and prints a comparison table.
+    """
+    print(f"{'depth':>5} {'frames/s':>9} {'duty':>7}")
+
+    transport = None
+    if USE_VIRTUAL:
+        transport = virtual.VirtualDAQ(latency=0.001, jitter=0.0005)
+
+    with daq.DAQInterface(transport=transport) as device:
+        for depth in DEPTHS:
+            result = device.measure_duty_cycle(depth=depth, duration=DURATION)
+            print(
+                f"{result['depth']:>5d} {result['frame_rate']:>9.1f} "
+                f"{result['duty_cycle'] * 100:>6.1f}%"
+            )
+
+
+if __name__ == "__main__":
+    main()
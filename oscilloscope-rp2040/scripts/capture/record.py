@@ -2,33 +2,40 @@
 Simple script to capture a single burst of data from the DAQ.
 
 This script connects to the RP2040, triggers a standard burst capture
-(defined in config), converts the raw ADC values to voltages, and saves
-the result to the burst data directory.
+(defined in config) and saves the raw ADC codes to the burst data
+directory (load them with ``io.load_signal(path, volts=True)``).
 """
 
-from sysaudio import config, daq, dsp, io
+from sysaudio import config, daq, io
 
 
 def main() -> None:
     """
     Main execution entry point.
 
-    Connects to the DAQ, captures a single burst of samples,
-    converts them to voltages, and saves the file to disk.
+    Connects to the DAQ, captures a single burst of samples
+    and saves the file to disk.
     """
     print("Initializing Burst Capture...")
 
     try:
         with daq.DAQInterface() as device:
+            try:
+                device.set_timestamps()  # Measure Fs on the MCU clock
+            except IOError:
+                print("⚠️ Firmware has no capture timestamps; using nominal Fs.")
+
             print("Requesting capture...")
             raw_data = device.capture_burst()
 
-            # Scale raw ADC values to voltages
-            voltages = dsp.raw_to_volts(raw_data)
-
-            # Save to disk
+            # Save to disk (raw codes; load with volts=True)
             io.save_signal(
-                voltages, config.FS_DEFAULT, config.DATA_DIR_BURST, prefix="burst"
+                raw_data,
+                device.measured_fs or device.fs,
+                config.DATA_DIR_BURST,
+                prefix="burst",
+                fs_nominal=device.fs,
+                telemetry=device.telemetry.snapshot(),
             )
 
     except Exception as e:
@@ -0,0 +1,48 @@
+"""
+Captures one synchronized burst from several DAQ boards.
+
+Typical setup: one board on the DUT input, one on its output and one on the
+power rail. All boards are triggered together by `multidaq.DAQPool`, so
+source and response come from the same shot. The stacked (channels, samples)
+array is saved together with host timestamps and the estimated skew.
+"""
+
+from sysaudio import config, io, multidaq
+
+# Configuration
+PORTS: list[str] = ["/dev/tty.usbmodem101", "/dev/tty.usbmodem201"]
+LABELS: list[str] = ["input", "output"]
+MAX_LAG: int = 200  # Skew search window in samples (keep < half a period)
+
+
+def main() -> None:
+    """
+    Main execution entry point.
+
+    Connects all boards, captures a burst from each in parallel, reports the
+    inter-board skew and saves the stacked result.
+    """
+    print(f"Initializing {len(PORTS)}-channel capture...")
+
+    with multidaq.DAQPool(PORTS) as pool:
+        result = pool.capture_burst(max_lag=MAX_LAG)
+
+    for label, lag, skew_s in zip(LABELS, result["skew_samples"], result["skew_s"]):
+        print(f"   {label:>8}: skew {lag:+d} samples ({skew_s * 1e6:+.1f} us)")
+    print(f"   Request spread: {result['request_spread_s'] * 1e3:.2f} ms")
+
+    io.save_signal(
+        result["data"],
+        pool.devices[0].fs,
+        config.DATA_DIR_BURST,
+        prefix="multi",
+        channels=LABELS,
+        ports=result["ports"],
+        t_request=result["t_request"],
+        t_complete=result["t_complete"],
+        skew_samples=result["skew_samples"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,20 +3,32 @@ Entry point for continuous data streaming.
 
 This script initiates an infinite capture loop, streaming data from the DAQ
 to disk until interrupted by the user (Ctrl+C). It is useful for long-duration
-logging or monitoring sessions.
+logging or monitoring sessions: the session is split into fixed-length
+segment files listed in a manifest, which ``io.load_signal`` opens as one
+signal.
 """
 
 from sysaudio import experiments
 
+# Configuration
+RATE_FACTOR: int = 1  # > 1 averages on the MCU for long low-frequency sessions
+SEGMENT_SECONDS: float = 300.0  # Length of each segment file
+
 
 def main() -> None:
     """
     Main execution entry point.
 
     Calls `experiments.capture_continuous_stream`, which handles the
-    infinite loop, buffering, and graceful shutdown upon KeyboardInterrupt.
+    infinite loop, segment rollover, and graceful shutdown upon
+    KeyboardInterrupt. With RATE_FACTOR > 1 the firmware box-averages before
+    transmission and the session is saved with the reduced sampling rate.
     """
-    experiments.capture_continuous_stream()
+    path = experiments.capture_continuous_stream(
+        rate_factor=RATE_FACTOR, segment_seconds=SEGMENT_SECONDS
+    )
+    if path:
+        print(f"Open with io.open_session('{path}')")
 
 
 if __name__ == "__main__":
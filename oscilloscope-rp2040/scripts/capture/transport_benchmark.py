@@ -0,0 +1,103 @@
+"""
+Benchmark for the sample transport encodings.
+
+Runs the recordings in data/continuous through the host-side encoders that
+mirror the firmware's 'm' modes (raw 16-bit, 12-bit packed, delta varint)
+and compares bytes on the wire per sample, the resulting frame rate on a
+USB link of given throughput, and the host decoder speed.
+"""
+
+import glob
+import os
+import time
+
+import numpy as np
+from sysaudio import config, daq, io, virtual
+
+# Configuration
+FRAME_SAMPLES: int = config.LIVE_SAMPLES  # Encode per frame, like 'v' / 'c'
+LINK_BYTES_PER_S: float = 1.0e6  # Typical sustained CDC throughput
+MAX_FRAMES: int = 200  # Per file, keeps the run short on long sessions
+
+PACKINGS = {
+    "raw16": daq.PACKING_RAW16,
+    "packed12": daq.PACKING_12BIT,
+    "delta": daq.PACKING_DELTA,
+}
+
+
+def encode(frame: np.ndarray, packing: int) -> bytes:
+    """Encodes one frame exactly as the firmware would send it."""
+    if packing == daq.PACKING_12BIT:
+        return daq.pack12(frame)
+    if packing == daq.PACKING_DELTA:
+        return daq.pack_delta(frame)
+    return frame.astype("<u2").tobytes()
+
+
+def decode(payload: bytes, n: int, packing: int, out: np.ndarray) -> None:
+    """Decodes one frame the way DAQInterface does."""
+    if packing == daq.PACKING_12BIT:
+        daq.unpack12(payload, n, out)
+    elif packing == daq.PACKING_DELTA:
+        daq.unpack_delta(payload, n, out)
+    else:
+        out[:] = np.frombuffer(payload, dtype="<u2")
+
+
+def load_frames(filepath: str) -> np.ndarray:
+    """Loads a recording as (frames, FRAME_SAMPLES) raw ADC codes."""
+    volts, _ = io.load_signal(filepath, volts=True)
+    signal = virtual.volts_to_adc(np.ravel(volts))
+    n_frames = min(signal.size // FRAME_SAMPLES, MAX_FRAMES)
+    return signal[: n_frames * FRAME_SAMPLES].astype(np.uint16).reshape(n_frames, -1)
+
+
+def main() -> None:
+    """
+    Main execution entry point.
+
+    Encodes and decodes every file with each packing, verifies the round
+    trip is lossless and prints a comparison table.
+    """
+    files = sorted(glob.glob(os.path.join(config.DATA_DIR_CONTINUOUS, "*.npz")))
+    if not files:
+        print(f"No recordings found in {config.DATA_DIR_CONTINUOUS}.")
+        return
+
+    print(
+        f"{'file':<32} {'packing':>9} {'B/sample':>9} {'ratio':>6} "
+        f"{'frames/s':>9} {'decode MS/s':>12}"
+    )
+    for filepath in files:
+        frames = load_frames(filepath)
+        if frames.size == 0:
+            continue
+        out = np.empty(FRAME_SAMPLES, dtype="<u2")
+        name = os.path.basename(filepath)[:32]
+
+        for label, packing in PACKINGS.items():
+            payloads = [encode(frame, packing) for frame in frames]
+            n_bytes = sum(len(p) for p in payloads)
+
+            start = time.perf_counter()
+            for payload in payloads:
+                decode(payload, FRAME_SAMPLES, packing, out)
+            elapsed = time.perf_counter() - start
+
+            for frame, payload in zip(frames, payloads):
+                decode(payload, FRAME_SAMPLES, packing, out)
+                if not np.array_equal(out, frame):
+                    raise RuntimeError(f"{label} round trip failed on {name}")
+
+            bytes_per_sample = n_bytes / frames.size
+            print(
+                f"{name:<32} {label:>9} {bytes_per_sample:>9.2f} "
+                f"{2.0 / bytes_per_sample:>5.2f}x "
+                f"{LINK_BYTES_PER_S / (bytes_per_sample * FRAME_SAMPLES):>9.0f} "
+                f"{frames.size / elapsed / 1e6:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
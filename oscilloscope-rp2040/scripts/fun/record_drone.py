@@ -7,12 +7,14 @@ DAQ interface. The resulting data is saved for use in harmonic landscape
 visualizations.
 """
 
+import asyncio
 import time
-from typing import List
+from contextlib import aclosing
+from typing import List, Tuple
 
 import numpy as np
 import sounddevice as sd
-from sysaudio import audio, config, daq, dsp, io
+from sysaudio import asyncdaq, audio, config, io
 
 # Configuration
 FREQ: float = 55.0
@@ -22,47 +24,58 @@ AMP: float = 0.2
 FILENAME: str = "fun_drone"
 
 
-def main() -> None:
+async def capture(wave: np.ndarray, fs_audio: int) -> Tuple[List[np.ndarray], float]:
     """
-    Main execution entry point.
+    Plays `wave` and streams DAQ frames until playback finishes.
 
-    Generates the audio stimulus, manages the playback/capture synchronization,
-    processes the raw ADC data, and saves the result to disk.
+    Frames arrive through the event loop, so the loop stays free for other
+    work (analysis, disk writes) while each frame is in transit. Returns
+    the frames and the device's effective sampling rate.
     """
-    fs_audio: int = 48000
-    print(f"🔹 Generating Pulsing Drone ({FREQ}Hz)...")
-    wave = audio.generate_pulsing_drone(DURATION, fs_audio, AMP, FREQ, BEAT_FREQ)
-
     frames: List[np.ndarray] = []
-    print("🔴 Capturing (Check your volume!)...")
 
-    with daq.DAQInterface() as device:
+    async with asyncdaq.AsyncDAQInterface() as device:
         # Start non-blocking playback
         sd.play(wave, samplerate=fs_audio, blocking=False)
         start_time = time.time()
 
         # Stream capture loop
-        for chunk in device.stream_generator():
-            frames.append(chunk)
+        async with aclosing(device.stream()) as stream:
+            async for chunk in stream:
+                frames.append(chunk)
+
+                # Stop if audio playback has finished
+                if not sd.get_stream().active:
+                    break
 
-            # Stop if audio playback has finished
-            if not sd.get_stream().active:
-                break
+                # Safety timeout
+                if (time.time() - start_time) > (DURATION + 1.0):
+                    break
 
-            # Safety timeout
-            if (time.time() - start_time) > (DURATION + 1.0):
-                break
+    return frames, device.fs
+
+
+def main() -> None:
+    """
+    Main execution entry point.
+
+    Generates the audio stimulus, manages the playback/capture synchronization,
+    processes the raw ADC data, and saves the result to disk.
+    """
+    fs_audio: int = 48000
+    print(f"🔹 Generating Pulsing Drone ({FREQ}Hz)...")
+    wave = audio.generate_pulsing_drone(DURATION, fs_audio, AMP, FREQ, BEAT_FREQ)
+
+    print("🔴 Capturing (Check your volume!)...")
+    frames, fs = asyncio.run(capture(wave, fs_audio))
 
     print("✅ Capture Complete. Processing...")
     raw_data = np.concatenate(frames)
 
-    # Signal conditioning
-    volts = dsp.raw_to_volts(raw_data)
-
-    # Save to disk with metadata
+    # Save to disk with metadata (raw codes; load with volts=True)
     io.save_signal(
-        volts,
-        config.FS_DEFAULT,
+        raw_data,
+        fs,
         config.DATA_DIR_BURST,
         prefix=FILENAME,
         user_notes="Harmonic Landscape Source Data",
@@ -18,7 +18,9 @@ def main() -> None:
     """
     # 1. Load Data
     print("📂 Searching for latest drone recording...")
-    voltages, fs = io.load_latest_file(config.DATA_DIR_BURST, "fun_drone*.npz")
+    voltages, fs = io.load_latest_file(
+        config.DATA_DIR_BURST, "fun_drone*.npz", volts=True
+    )
 
     if voltages is None or fs is None:
         print("❌ No matching file found.")
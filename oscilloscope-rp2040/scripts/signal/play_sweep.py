@@ -39,11 +39,13 @@ def main() -> None:
     # 2. Start Scope
     # on_launch triggers playback only when the window is visible
     with daq.DAQInterface() as device:
+        hw_trigger = viz.arm_scope_trigger(device)
         viz.run_live_scope(
             device.stream_generator(),
             title="Transfer Function: Log Sine Sweep",
             stop_condition=lambda: not sd.get_stream().active,
             on_launch=start_playback,
+            software_trigger=not hw_trigger,
         )
 
     print("Done.")
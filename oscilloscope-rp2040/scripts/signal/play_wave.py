@@ -28,10 +28,12 @@ def main() -> None:
     with audio.ContinuousOscillator(SHAPE, FREQ_HZ, AMPLITUDE, auto_start=False) as osc:
         # 2. Start Scope
         with daq.DAQInterface() as device:
+            hw_trigger = viz.arm_scope_trigger(device)
             viz.run_live_scope(
                 device.stream_generator(),
                 title=f"Generator: {SHAPE.title()} @ {FREQ_HZ}Hz",
                 on_launch=osc.play,
+                software_trigger=not hw_trigger,
             )
 
 
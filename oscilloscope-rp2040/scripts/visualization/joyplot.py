@@ -35,8 +35,8 @@ def main() -> None:
     args = parser.parse_args()
 
     # Load signal using the standard project loader
-    # io.load_signal handles FileNotFoundError and legacy formats internally
-    signal, _ = io.load_signal(args.input)
+    # io.load_signal handles legacy formats (and raises FileNotFoundError)
+    signal, _ = io.load_signal(args.input, volts=True)
 
     plots.plot_joyplot_stacked(
         signal,
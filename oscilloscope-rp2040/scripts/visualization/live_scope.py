@@ -37,12 +37,17 @@ def main() -> None:
     try:
         # Connect to DAQ and stream data
         with daq.DAQInterface() as device:
+            # Frames start on a rising edge when the firmware supports it
+            hw_trigger = viz.arm_scope_trigger(device)
             stream = device.stream_generator()
 
             for raw_data in stream:
                 # 1. DSP Processing
                 voltages = dsp.raw_to_volts(raw_data)
-                stable_wave = dsp.software_trigger(voltages)
+                if hw_trigger:
+                    stable_wave = voltages
+                else:
+                    stable_wave = dsp.software_trigger(voltages)
 
                 # 2. Update Plot (Blitting)
                 # Restore the clean background
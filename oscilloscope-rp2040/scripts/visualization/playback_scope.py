@@ -8,16 +8,16 @@ experience. It is useful for reviewing long capture sessions.
 
 import os
 
-import numpy as np
-from sysaudio import config, dsp, io, viz
+from sysaudio import config, io, viz
 
 
 def main() -> None:
     """
     Main execution entry point.
 
-    Prompts the user to select a file, loads the signal data, converts raw
-    ADC values to voltages if necessary, and launches the playback visualization.
+    Prompts the user to select a file, loads the signal data and launches
+    the playback visualization. Raw captures are memory-mapped, and each
+    displayed window is converted to volts on the fly.
     """
     # 1. Select File via CLI menu
     filepath = io.select_file_cli(config.DATA_DIR_CONTINUOUS)
@@ -25,15 +25,17 @@ def main() -> None:
         return
 
     print(f"Loading {filepath}...")
-    data, fs = io.load_signal(filepath)
-
-    # 2. Normalize Data if needed (handle raw uint16 captures vs processed floats)
-    if np.issubdtype(data.dtype, np.integer):
-        print("Detected Raw ADC data. Converting to Volts...")
-        data = dsp.raw_to_volts(data)
-
-    # 3. Launch Visualization
-    viz.run_playback_scope(data, fs, title=f"PLAYBACK: {os.path.basename(filepath)}")
+    data, fs = io.load_signal(filepath, volts=False)
+    scale, offset = io.load_scale(filepath)
+
+    # 2. Launch Visualization
+    viz.run_playback_scope(
+        data,
+        fs,
+        title=f"PLAYBACK: {os.path.basename(filepath)}",
+        scale=scale,
+        offset=offset,
+    )
 
 
 if __name__ == "__main__":
@@ -1,11 +1,22 @@
+# Defined before the submodules: cache keys include it
+__version__ = "1.0.0"
+
+from . import asyncdaq as asyncdaq
 from . import audio as audio
+from . import buffers as buffers
+from . import cache as cache
 from . import calibration as calibration
+from . import catalog as catalog
 from . import config as config
 from . import daq as daq
+from . import dataset as dataset
 from . import diagnostics as diagnostics
 from . import dsp as dsp
 from . import experiments as experiments
 from . import io as io
+from . import multidaq as multidaq
+from . import recorder as recorder
+from . import service as service
+from . import telemetry as telemetry
+from . import virtual as virtual
 from . import viz as viz
-
-__version__ = "1.0.0"
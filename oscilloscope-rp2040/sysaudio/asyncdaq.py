@@ -0,0 +1,356 @@
+"""
+Asyncio front end for the DAQ.
+
+`AsyncDAQInterface` wraps a regular `daq.DAQInterface` (same config, same
+connection cache, same telemetry) and replaces its blocking reads with
+non-blocking ones driven by the event loop, so acquisition, audio playback,
+analysis and disk writes can be interleaved in one loop without threads.
+
+On POSIX serial ports the file descriptor is registered with
+``loop.add_reader``; transports without one (e.g. `virtual.VirtualDAQ`)
+are polled via ``in_waiting``.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncGenerator, Optional, Type
+
+import numpy as np
+
+from . import config, daq
+
+
+class AsyncDAQInterface:
+    """
+    Event-loop driven DAQ client.
+
+    Use as ``async with AsyncDAQInterface() as device:``. While connected,
+    all input from the port is consumed by the event loop, so the wrapped
+    synchronous interface must not be used for reads until disconnect.
+
+    Parameters
+    ----------
+    device : Optional[daq.DAQInterface]
+        Synchronous interface to wrap. Created from the remaining arguments
+        if omitted.
+    port : Optional[str]
+        Serial port; defaults to config.SERIAL_PORT.
+    baud : int, optional
+        Baud rate; defaults to config.BAUD_RATE.
+    transport : Optional[Any]
+        Pre-opened serial-compatible object, as for DAQInterface.
+    poll_interval : float, optional
+        Polling period for transports without a file descriptor, in seconds.
+
+    Attributes
+    ----------
+    device : daq.DAQInterface
+        The wrapped interface (packing, capabilities and telemetry live here).
+    resyncs : int
+        Times stream() lost framing and flushed its pipeline.
+    """
+
+    def __init__(
+        self,
+        device: Optional[daq.DAQInterface] = None,
+        port: Optional[str] = None,
+        baud: int = config.BAUD_RATE,
+        transport: Optional[Any] = None,
+        poll_interval: float = 0.001,
+    ) -> None:
+        self.device = device or daq.DAQInterface(port, baud, transport)
+        self.poll_interval = poll_interval
+        self._rx = bytearray()
+        self._data_ready = asyncio.Event()
+        self._fd: Optional[int] = None
+        self._fd_blocking: bool = True
+        self.resyncs: int = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self) -> "AsyncDAQInterface":
+        await self.connect()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[Any],
+    ) -> None:
+        await self.disconnect()
+
+    async def connect(self) -> None:
+        """
+        Connects the wrapped interface and attaches the port to the loop.
+
+        The identify handshake and capability query run synchronously (tens
+        of milliseconds) before the event loop takes over the input side.
+
+        Raises
+        ------
+        IOError
+            If the port cannot be opened (see DAQInterface.connect).
+        """
+        if self.device.ser is None or not self.device.ser.is_open:
+            self.device.connect()
+        if not self.device.capabilities:
+            try:
+                self.device.query_capabilities()
+            except IOError:
+                pass  # Legacy firmware: fixed-size 's' / 'v' only
+
+        ser = self.device.ser
+        self._loop = asyncio.get_running_loop()
+        self._rx.clear()
+        try:
+            fd = ser.fileno() if ser is not None else None
+        except (AttributeError, OSError):
+            fd = None
+        if fd is not None:
+            # Restored on disconnect: the port may go back to daq's cache
+            self._fd_blocking = os.get_blocking(fd)
+            os.set_blocking(fd, False)
+            self._loop.add_reader(fd, self._on_readable)
+            self._fd = fd
+
+    async def disconnect(self) -> None:
+        """
+        Detaches from the loop and disconnects the wrapped interface.
+
+        The port's blocking mode is restored first, so a synchronous
+        DAQInterface that reuses it from the connection cache reads
+        normally.
+        """
+        if self._fd is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._fd)
+            try:
+                os.set_blocking(self._fd, self._fd_blocking)
+            except OSError:
+                pass  # Port already closed
+            self._fd = None
+        self._rx.clear()
+        self.device.disconnect()
+
+    async def capture_burst(
+        self, samples: int = config.BURST_SAMPLES, decimation: int = 1
+    ) -> np.ndarray:
+        """
+        Async counterpart of DAQInterface.capture_burst().
+
+        Parameters
+        ----------
+        samples : int, optional
+            The number of samples to capture. Defaults to config.BURST_SAMPLES.
+        decimation : int, optional
+            Keep every n-th conversion. Defaults to 1.
+
+        Returns
+        -------
+        np.ndarray
+            (samples,) array of uint16 raw ADC values.
+
+        Raises
+        ------
+        ValueError
+            If samples or decimation exceed the firmware limits.
+        IOError
+            If the device does not deliver the burst within
+            DAQInterface.burst_timeout(), or the firmware does not support sized bursts.
+        """
+        sized = samples != config.BURST_SAMPLES or decimation != 1
+        if sized and not self.device.capabilities:
+            raise IOError("Firmware does not support sized bursts ('b').")
+
+        out = np.empty(samples, dtype="<u2")
+        self._rx.clear()
+        self._write(self.device._burst_command(samples, decimation))
+        await self._read_samples(out, self.device.burst_timeout(samples, decimation))
+        if self.device.stamps:
+            size = daq.STAMP_TRAILER.size
+            await self._wait_for(size)
+            ticks = daq.STAMP_TRAILER.unpack(self._rx[:size])
+            del self._rx[:size]
+            self.device.measured_fs = daq.ticks_fs(samples, *ticks)
+        return out
+
+    async def stream(
+        self,
+        depth: int = config.PIPELINE_DEPTH,
+        chunk_size: int = config.LIVE_SAMPLES,
+    ) -> AsyncGenerator[np.ndarray, None]:
+        """
+        Async iterator over 'v' frames with `depth` requests in flight.
+
+        Usage: ``async for chunk in device.stream(): ...``. Other coroutines
+        run while each frame is in transit.
+
+        Parameters
+        ----------
+        depth : int, optional
+            Outstanding requests, as in DAQInterface.pipelined_stream().
+        chunk_size : int, optional
+            Samples per frame. Defaults to config.LIVE_SAMPLES.
+
+        Yields
+        ------
+        np.ndarray
+            (chunk_size,) array of uint16 raw ADC values.
+        """
+        if depth < 1:
+            raise ValueError("Pipeline depth must be >= 1")
+
+        self._rx.clear()
+        self._write(b"v" * depth)
+        in_flight = depth
+        try:
+            while True:
+                chunk = np.empty(chunk_size, dtype="<u2")
+                try:
+                    await self._read_samples(chunk)
+                except IOError:
+                    # Lost framing: discard the replies still in flight, as
+                    # DAQInterface does, then re-prime the pipeline
+                    self.resyncs += 1
+                    await self._read_until_idle()
+                    self._write(b"v" * depth)
+                    in_flight = depth
+                    continue
+
+                self._write(b"v")
+                yield chunk
+        finally:
+            await self._drain(in_flight * daq.payload_bytes(chunk_size, self.packing))
+
+    @property
+    def fs(self) -> float:
+        """Effective sampling rate of the wrapped interface."""
+        return self.device.fs
+
+    @property
+    def packing(self) -> int:
+        """Sample packing of the wrapped interface."""
+        return self.device.packing
+
+    def _write(self, data: bytes) -> None:
+        """Writes a command (small, so the OS buffer never blocks)."""
+        if self.device.ser is None:
+            raise AttributeError("Serial device not connected.")
+        self.device.ser.write(data)
+
+    def _on_readable(self) -> None:
+        """Event loop callback: moves whatever is available into the buffer."""
+        if self._fd is None:
+            return
+        try:
+            data = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        if data:
+            self._rx += data
+            self._data_ready.set()
+
+    def _poll(self) -> None:
+        """Non-blocking read for transports without a file descriptor."""
+        ser = self.device.ser
+        if ser is None:
+            return
+        waiting = ser.in_waiting
+        if waiting:
+            self._rx += ser.read(waiting)
+
+    async def _wait_for(self, n_bytes: int, timeout: float = config.TIMEOUT) -> None:
+        """Waits until `n_bytes` are buffered; raises IOError on timeout."""
+        deadline = time.perf_counter() + timeout
+        while len(self._rx) < n_bytes:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                raise IOError(
+                    f"Incomplete read: Got {len(self._rx)} bytes, expected {n_bytes}"
+                )
+            if self._fd is None:
+                self._poll()
+                if len(self._rx) < n_bytes:
+                    await asyncio.sleep(self.poll_interval)
+                continue
+
+            self._data_ready.clear()
+            try:
+                await asyncio.wait_for(self._data_ready.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _read_samples(
+        self, out: np.ndarray, timeout: float = config.TIMEOUT
+    ) -> None:
+        """Reads one sample payload into `out`, decoding the packing."""
+        n_bytes = daq.payload_bytes(out.size, self.packing)
+        started = time.perf_counter()
+        try:
+            if self.packing == daq.PACKING_DELTA:
+                await self._wait_for(daq.DELTA_PREFIX.size, timeout)
+                length = daq.DELTA_PREFIX.unpack_from(self._rx)[0]
+                n_bytes = daq.DELTA_PREFIX.size + length
+            await self._wait_for(n_bytes, timeout)
+        except IOError:
+            self.device.telemetry.record_read(len(self._rx), n_bytes, started)
+            raise
+
+        payload = memoryview(self._rx)[:n_bytes]
+        if self.packing == daq.PACKING_12BIT:
+            daq.unpack12(payload, out.size, out)
+        elif self.packing == daq.PACKING_DELTA:
+            try:
+                daq.unpack_delta(payload, out.size, out)
+            except ValueError as e:
+                payload.release()
+                raise IOError(str(e))
+        else:
+            memoryview(out).cast("B")[:] = payload
+        payload.release()
+        del self._rx[:n_bytes]
+
+        now = self.device.telemetry.record_read(n_bytes, n_bytes, started)
+        self.device.telemetry.record_frame(out.size, now)
+
+    async def _drain(self, n_bytes: int) -> None:
+        """Discards responses still in flight."""
+        if self.packing == daq.PACKING_DELTA:
+            # Variable-size payloads: n_bytes is only an upper bound
+            await self._read_until_idle()
+            return
+        try:
+            await self._wait_for(n_bytes, timeout=config.HANDSHAKE_INTERVAL * 5)
+        except IOError:
+            pass
+        self._rx.clear()
+        if self.device.ser is not None and self.device.ser.is_open:
+            self.device.ser.reset_input_buffer()
+
+    async def _read_until_idle(
+        self, quiet: float = 0.05, timeout: float = config.TIMEOUT
+    ) -> None:
+        """
+        Discards input until nothing arrives for `quiet` seconds.
+
+        Async counterpart of DAQInterface._read_until_idle(); gives up after
+        `timeout` seconds of continuous input.
+        """
+        deadline = time.perf_counter() + timeout
+        while True:
+            self._rx.clear()
+            if self._fd is None:
+                await asyncio.sleep(quiet)
+                self._poll()
+            else:
+                self._data_ready.clear()
+                try:
+                    await asyncio.wait_for(self._data_ready.wait(), quiet)
+                except asyncio.TimeoutError:
+                    pass
+            if not self._rx or time.perf_counter() >= deadline:
+                break
+        self._rx.clear()
+        if self.device.ser is not None and self.device.ser.is_open:
+            self.device.ser.reset_input_buffer()
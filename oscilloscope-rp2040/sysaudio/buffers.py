@@ -0,0 +1,208 @@
+"""
+Preallocated frame buffers shared between acquisition threads and consumers.
+
+Everything here is allocated once up front so the steady-state acquisition
+path never touches the allocator.
+"""
+
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+
+class FrameRingBuffer:
+    """
+    Single-producer / single-consumer ring of fixed-size uint16 frames.
+
+    The writer fills ``writable_slot()`` and publishes it with ``commit()``;
+    it never waits for the consumer. The consumer detects that it was lapped
+    by comparing its cursor against the monotonic ``write_count`` after
+    copying a frame out (a seqlock-style check), so no locks are needed on
+    the data path under CPython's GIL.
+
+    Attributes
+    ----------
+    frames : np.ndarray
+        (n_frames, frame_size) backing storage.
+    write_count : int
+        Total number of frames committed by the writer.
+    overruns : int
+        Frames lost because the writer lapped the consumer in every-frame mode.
+    skipped : int
+        Frames intentionally passed over by ``latest()``.
+    """
+
+    def __init__(
+        self, n_frames: int, frame_size: int, dtype: np.dtype = np.dtype("<u2")
+    ) -> None:
+        if n_frames < 2:
+            raise ValueError("FrameRingBuffer needs at least 2 slots")
+        self.n_frames = n_frames
+        self.frame_size = frame_size
+        self.frames = np.zeros((n_frames, frame_size), dtype=dtype)
+        self.write_count: int = 0
+        self.overruns: int = 0
+        self.skipped: int = 0
+        self._read_count: int = 0
+
+    # --- Producer side ---
+    def writable_slot(self) -> np.ndarray:
+        """Returns the slot the writer should fill next (a view, no copy)."""
+        return self.frames[self.write_count % self.n_frames]  # type: ignore[no-any-return]
+
+    def commit(self) -> None:
+        """Publishes the slot returned by ``writable_slot()``."""
+        self.write_count += 1
+
+    # --- Consumer side ---
+    def available(self) -> int:
+        """Number of committed frames the consumer has not read yet."""
+        return self.write_count - self._read_count
+
+    def pop(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Returns the oldest unread frame (every-frame mode).
+
+        Parameters
+        ----------
+        out : Optional[np.ndarray]
+            Destination for the copy. A new array is allocated if omitted.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The frame, or None if nothing new has been committed.
+        """
+        while True:
+            written = self.write_count
+            if written == self._read_count:
+                return None
+
+            # Writer lapped us: jump to the oldest slot that is still intact
+            oldest = written - (self.n_frames - 1)
+            if self._read_count < oldest:
+                self.overruns += oldest - self._read_count
+                self._read_count = oldest
+
+            idx = self._read_count
+            frame = self._copy_slot(idx, out)
+            if self.write_count - idx < self.n_frames:
+                self._read_count = idx + 1
+                return frame
+
+            # Slot was overwritten while copying; count it and retry
+            self.overruns += 1
+            self._read_count = idx + 1
+
+    def latest(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Returns the most recently committed frame (latest-only mode).
+
+        Frames committed since the previous call are counted in ``skipped``.
+
+        Parameters
+        ----------
+        out : Optional[np.ndarray]
+            Destination for the copy. A new array is allocated if omitted.
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            The newest frame, or None if nothing new has been committed.
+        """
+        while True:
+            written = self.write_count
+            if written == self._read_count:
+                return None
+
+            idx = written - 1
+            frame = self._copy_slot(idx, out)
+            if self.write_count - idx < self.n_frames:
+                self.skipped += idx - self._read_count
+                self._read_count = idx + 1
+                return frame
+
+    def stats(self) -> Dict[str, int]:
+        """Returns a snapshot of the ring counters."""
+        return {
+            "written": self.write_count,
+            "read": self._read_count,
+            "pending": self.available(),
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+        }
+
+    def _copy_slot(self, idx: int, out: Optional[np.ndarray]) -> np.ndarray:
+        slot = self.frames[idx % self.n_frames]
+        if out is None:
+            return slot.copy()  # type: ignore[no-any-return]
+        out[...] = slot
+        return out
+
+
+class BufferPool:
+    """
+    Free-list of equally sized uint16 frame arrays.
+
+    Frames are handed out by ``acquire()`` and returned with ``release()``.
+    A new array is only allocated when the free list is empty, so the
+    ``allocations`` counter stays flat once the pool has warmed up.
+
+    Attributes
+    ----------
+    frame_size : int
+        Samples per frame.
+    allocations : int
+        Arrays allocated because the free list was empty (after warm-up).
+    """
+
+    def __init__(
+        self,
+        frame_size: int,
+        capacity: int,
+        dtype: np.dtype = np.dtype("<u2"),
+    ) -> None:
+        self.frame_size = frame_size
+        self.dtype = dtype
+        self.allocations: int = 0
+        self.acquires: int = 0
+        self.releases: int = 0
+        self._free: List[np.ndarray] = [
+            np.empty(frame_size, dtype=dtype) for _ in range(capacity)
+        ]
+        self._owned: Set[int] = {id(buf) for buf in self._free}
+
+    def acquire(self) -> np.ndarray:
+        """Returns a frame array, reusing a released one when available."""
+        self.acquires += 1
+        if self._free:
+            return self._free.pop()
+
+        self.allocations += 1
+        buf = np.empty(self.frame_size, dtype=self.dtype)
+        self._owned.add(id(buf))
+        return buf
+
+    def release(self, buf: np.ndarray) -> None:
+        """
+        Returns a frame array to the pool.
+
+        Raises
+        ------
+        ValueError
+            If `buf` was not handed out by this pool.
+        """
+        if id(buf) not in self._owned:
+            raise ValueError("Buffer does not belong to this pool")
+        self.releases += 1
+        self._free.append(buf)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns a snapshot of the pool counters."""
+        return {
+            "allocations": self.allocations,
+            "acquires": self.acquires,
+            "releases": self.releases,
+            "in_use": self.acquires - self.releases,
+            "free": len(self._free),
+        }
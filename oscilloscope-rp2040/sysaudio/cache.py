@@ -0,0 +1,259 @@
+"""
+Disk cache for derived analysis results.
+
+Spectra, harmonic tables and impulse responses are pure functions of the
+capture data, so notebooks re-running them on unchanged files can reuse
+earlier results. `cached` stores a function's result under a hash of the
+array contents, the other parameters, the function itself and the source of
+the code it may call, in ``config.CACHE_DIR``. When the directory outgrows
+``config.CACHE_MAX_BYTES`` the least recently used entries are evicted.
+
+The cache is opt-in: set ``config.CACHE_ENABLED = True`` to use it. Entries
+are pickles, so only enable it for a cache directory you trust.
+"""
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import threading
+import types
+from typing import Any, Callable, Dict, Optional, TypeVar, Union, cast, overload
+
+import numpy as np
+
+from . import __version__, config
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Hit/miss counters for the current process (see stats())
+_counters: Dict[str, int] = {"hits": 0, "misses": 0}
+_lock = threading.Lock()
+
+
+class _Uncacheable(Exception):
+    """An argument has no stable content hash."""
+
+
+def _feed(h: "hashlib.blake2b", value: Any) -> None:
+    """Adds a parameter value to the hash, by content for arrays."""
+    if isinstance(value, np.ndarray):
+        h.update(f"nd{value.dtype.str}{value.shape}".encode())
+        h.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, (list, tuple)):
+        h.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _feed(h, item)
+    elif isinstance(value, dict):
+        h.update(f"dict{len(value)}".encode())
+        for key in sorted(value, key=repr):
+            _feed(h, key)
+            _feed(h, value[key])
+    elif value is None or isinstance(value, (bool, int, float, str, np.generic)):
+        h.update(f"{type(value).__name__}:{value!r}".encode())
+    else:
+        raise _Uncacheable(type(value).__name__)
+
+
+def _feed_code(h: "hashlib.blake2b", code: types.CodeType) -> None:
+    """Adds bytecode and constants (nested functions included) to the hash."""
+    h.update(code.co_code)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            _feed_code(h, const)
+        elif isinstance(const, frozenset):
+            # Set order follows string hashing, which varies between processes
+            h.update(f"frozenset{sorted(map(repr, const))}".encode())
+        else:
+            h.update(f"{type(const).__name__}:{const!r}".encode())
+
+
+@functools.lru_cache(maxsize=None)
+def _file_hash(path: str, mtime_ns: int, size: int) -> str:
+    """Hash of a file's contents; re-read only when mtime or size change."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=8).hexdigest()
+
+
+def _source_hash(path: str) -> str:
+    """Hash of a source file, or of every module in a package directory."""
+    files = (
+        sorted(os.path.join(path, name) for name in os.listdir(path))
+        if os.path.isdir(path)
+        else [path]
+    )
+    h = hashlib.blake2b(digest_size=8)
+    for file in files:
+        if file.endswith(".py"):
+            st = os.stat(file)
+            h.update(_file_hash(file, st.st_mtime_ns, st.st_size).encode())
+    return h.hexdigest()
+
+
+def _dependency_hash(fn: Callable[..., Any]) -> str:
+    """
+    Source hash of everything `fn` may call: the sysaudio package plus the
+    module that defines `fn`, if that lives outside it.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    parts = [_source_hash(package_dir)]
+    module_file = getattr(sys.modules.get(fn.__module__), "__file__", None)
+    if module_file and os.path.dirname(os.path.abspath(module_file)) != package_dir:
+        parts.append(_source_hash(os.path.abspath(module_file)))
+    return "+".join(parts)
+
+
+def _largest_array(args: Dict[str, Any]) -> int:
+    sizes = [v.size for v in args.values() if isinstance(v, np.ndarray)]
+    return max(sizes, default=0)
+
+
+def _evict(directory: str, max_bytes: int) -> None:
+    """Deletes least recently used entries until the cache fits."""
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith(".pkl"):
+            path = os.path.join(directory, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue  # Evicted by another process
+            entries.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+
+
+@overload
+def cached(func: F) -> F: ...
+
+
+@overload
+def cached(
+    *, min_samples: Optional[int] = None, version: str = ""
+) -> Callable[[F], F]: ...
+
+
+def cached(
+    func: Optional[F] = None, *, min_samples: Optional[int] = None, version: str = ""
+) -> Union[F, Callable[[F], F]]:
+    """
+    Decorator caching a function's result on disk by content.
+
+    Use as ``@cache.cached`` or ``@cache.cached(min_samples=..., version=...)``.
+    The key covers every bound parameter (defaults included; arrays by
+    dtype, shape and bytes), the function's qualified name, bytecode and
+    constants, the source of the sysaudio package and of the defining
+    module (so edits to helpers it calls invalidate old entries),
+    ``sysaudio.__version__`` and `version`. Results must be picklable.
+    Calls whose largest array has fewer than `min_samples` samples, or with
+    arguments that cannot be hashed by content, run uncached. Does nothing
+    unless config.CACHE_ENABLED is set.
+
+    Parameters
+    ----------
+    func : Callable
+        The function to wrap.
+    min_samples : Optional[int]
+        Minimum array size worth caching. Defaults to
+        config.CACHE_MIN_SAMPLES, which keeps live-scope frames off the disk.
+    version : str, optional
+        Extra key component. Change it when the function depends on code
+        the source hash cannot see (e.g. another package).
+
+    Returns
+    -------
+    Callable
+        The wrapped function; the original is available as ``__wrapped__``.
+    """
+
+    def decorate(fn: F) -> F:
+        signature = inspect.signature(fn)
+        code = hashlib.blake2b(digest_size=8)
+        _feed_code(code, fn.__code__)
+        name = f"{fn.__module__}.{fn.__qualname__}"
+        prefix = f"{name}|{code.hexdigest()}|{__version__}|{version}"
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            threshold = config.CACHE_MIN_SAMPLES if min_samples is None else min_samples
+            if not config.CACHE_ENABLED:
+                return fn(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if _largest_array(bound.arguments) < threshold:
+                return fn(*args, **kwargs)
+
+            h = hashlib.blake2b(prefix.encode(), digest_size=20)
+            h.update(_dependency_hash(fn).encode())
+            try:
+                _feed(h, dict(bound.arguments))
+            except _Uncacheable:
+                return fn(*args, **kwargs)
+            path = os.path.join(config.CACHE_DIR, h.hexdigest() + ".pkl")
+
+            try:
+                with open(path, "rb") as f:
+                    result = pickle.load(f)
+                os.utime(path)  # Mark as recently used for eviction
+                with _lock:
+                    _counters["hits"] += 1
+                return result
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass  # Miss, or an entry evicted or truncated under us
+
+            result = fn(*args, **kwargs)
+            with _lock:
+                _counters["misses"] += 1
+            try:
+                os.makedirs(config.CACHE_DIR, exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, path)
+                _evict(config.CACHE_DIR, config.CACHE_MAX_BYTES)
+            except OSError as e:
+                print(f"⚠️ Cache write failed: {e}")
+            return result
+
+        return cast(F, wrapper)
+
+    if func is not None:
+        return decorate(func)
+    return decorate
+
+
+def stats() -> Dict[str, int]:
+    """
+    Returns cache hits and misses in this process, plus entries and bytes
+    currently on disk.
+    """
+    entries = 0
+    size = 0
+    if os.path.isdir(config.CACHE_DIR):
+        for name in os.listdir(config.CACHE_DIR):
+            if name.endswith(".pkl"):
+                entries += 1
+                size += os.path.getsize(os.path.join(config.CACHE_DIR, name))
+    with _lock:
+        return {**_counters, "entries": entries, "bytes": size}
+
+
+def clear() -> int:
+    """Deletes every cache entry and returns how many were removed."""
+    removed = 0
+    if os.path.isdir(config.CACHE_DIR):
+        for name in os.listdir(config.CACHE_DIR):
+            if name.endswith((".pkl", ".tmp")):
+                os.remove(os.path.join(config.CACHE_DIR, name))
+                removed += 1
+    return removed
@@ -0,0 +1,201 @@
+"""
+Persistent metadata index for the capture directories.
+
+``io.scan_metadata`` opens every archive on each call, which takes seconds
+once a directory holds thousands of captures. `MetadataCatalog` keeps the
+rows it produces in a SQLite database (``config.CATALOG_PATH``) keyed by
+path, size and mtime: a query only stats the files and opens those that are
+new or changed, then returns the same DataFrame from the index.
+"""
+
+import json
+import os
+import sqlite3
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from . import config, io
+
+# Bump when io.metadata_row() changes so stale rows are rebuilt
+SCHEMA_VERSION: int = 1
+
+
+def _encode(value: Any) -> Any:
+    """json.dumps hook for the arrays a metadata row may hold."""
+    if isinstance(value, np.ndarray):
+        return {"__ndarray__": value.tolist(), "dtype": value.dtype.str}
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Cannot store {type(value).__name__} in the catalog")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    """json.loads hook restoring arrays stored by _encode()."""
+    if "__ndarray__" in obj:
+        return np.array(obj["__ndarray__"], dtype=obj["dtype"])
+    return obj
+
+
+def _signature(filepath: str) -> Tuple[int, int]:
+    """(size, mtime_ns) that changes whenever a capture's metadata can."""
+    if filepath.endswith(io.RAW_SUFFIX):
+        # A recording's metadata lives in its sidecar, rewritten on each fsync
+        filepath = os.path.splitext(filepath)[0] + io.HEADER_SUFFIX
+    st = os.stat(filepath)
+    return st.st_size, st.st_mtime_ns
+
+
+class MetadataCatalog:
+    """
+    SQLite-backed cache of io.metadata_row() for every capture file.
+
+    One database can index any number of directories; rows are keyed by
+    absolute path. Use as a context manager or call close().
+
+    Parameters
+    ----------
+    db_path : str, optional
+        Database file, created if missing. Defaults to config.CATALOG_PATH.
+
+    Attributes
+    ----------
+    opened : int
+        Files opened (new or changed) by the last update().
+    """
+
+    def __init__(self, db_path: str = config.CATALOG_PATH) -> None:
+        io.ensure_dir(os.path.dirname(os.path.abspath(db_path)))
+        self.db_path = db_path
+        self.opened: int = 0
+        self._db = sqlite3.connect(db_path)
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            self._db.execute("DROP TABLE IF EXISTS files")
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, row TEXT)"
+        )
+        self._db.commit()
+
+    def __enter__(self) -> "MetadataCatalog":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        self._db.close()
+
+    def update(self, directory: str) -> List[str]:
+        """
+        Brings the index for `directory` (recursively) up to date.
+
+        New and changed files are opened and stored; rows of files that
+        no longer exist are dropped. Unreadable files are reported and
+        skipped, as in io.scan_metadata(), and retried on the next call.
+
+        Parameters
+        ----------
+        directory : str
+            Root directory to index.
+
+        Returns
+        -------
+        List[str]
+            Absolute paths of the indexed files, in io.scan_metadata() order.
+        """
+        root_dir = os.path.abspath(directory)
+        known: Dict[str, Tuple[int, int]] = {
+            path: (size, mtime_ns)
+            for path, size, mtime_ns in self._db.execute(
+                "SELECT path, size, mtime_ns FROM files"
+            )
+            if path.startswith(os.path.join(root_dir, ""))
+        }
+
+        paths: List[str] = []
+        self.opened = 0
+        for root, _, files in os.walk(root_dir):
+            for filename in sorted(files):
+                if not io.is_capture_file(filename):
+                    continue
+                filepath = os.path.join(root, filename)
+                try:
+                    signature = _signature(filepath)
+                    if known.pop(filepath, None) != signature:
+                        self.opened += 1
+                        row = json.dumps(io.metadata_row(filepath), default=_encode)
+                        self._db.execute(
+                            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                            (filepath, *signature, row),
+                        )
+                except Exception as e:
+                    print(f"Error reading {filename}: {e}")
+                    continue
+                paths.append(filepath)
+
+        # Whatever is left in `known` was deleted or renamed
+        self._db.executemany(
+            "DELETE FROM files WHERE path = ?", [(path,) for path in known]
+        )
+        self._db.commit()
+        return paths
+
+    def query(self, directory: str, include_path: bool = False) -> pd.DataFrame:
+        """
+        Updates the index for `directory` and returns its metadata.
+
+        Parameters
+        ----------
+        directory : str
+            Root directory to scan.
+        include_path : bool, optional
+            Add a ``path`` column with each file's absolute path (used by
+            dataset.Dataset.from_catalog). Defaults to False.
+
+        Returns
+        -------
+        pd.DataFrame
+            Same rows and columns as io.scan_metadata(directory).
+        """
+        paths = self.update(directory)
+        rows: Dict[str, str] = {}
+        # Fetch in batches below SQLite's bound-parameter limit
+        for i in range(0, len(paths), 500):
+            batch = paths[i : i + 500]
+            marks = ",".join("?" * len(batch))
+            rows.update(
+                self._db.execute(
+                    f"SELECT path, row FROM files WHERE path IN ({marks})", batch
+                )
+            )
+        df = pd.DataFrame(
+            [json.loads(rows[path], object_hook=_decode) for path in paths]
+        )
+        if include_path:
+            df["path"] = paths
+        return df
+
+
+def scan_metadata(directory: str, db_path: Optional[str] = None) -> pd.DataFrame:
+    """
+    Drop-in replacement for io.scan_metadata() backed by the catalog.
+
+    Parameters
+    ----------
+    directory : str
+        Root directory to scan.
+    db_path : Optional[str]
+        Database file. Defaults to config.CATALOG_PATH.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame containing metadata for all found files.
+    """
+    with MetadataCatalog(db_path or config.CATALOG_PATH) as catalog:
+        return catalog.query(directory)
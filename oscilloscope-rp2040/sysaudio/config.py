@@ -11,17 +11,43 @@ import os
 SERIAL_PORT: str = "/dev/tty.usbmodem101"
 BAUD_RATE: int = 115200
 TIMEOUT: float = 3.0  # seconds
+CONNECT_TIMEOUT: float = 2.0  # Max time to wait for the identify reply
+HANDSHAKE_INTERVAL: float = 0.02  # Identify poll period (seconds)
+REUSE_CONNECTIONS: bool = True  # Keep ports open across DAQInterface blocks
+PACKED_TRANSPORT: bool = False  # Request 12-bit packed samples on connect
 
 # ADC / Hardware Params
-ADC_BITS: int = 16
+ADC_BITS: int = 16  # Host-side word width (see ADC_NATIVE_BITS)
 ADC_MAX_VAL: int = 65535
+ADC_NATIVE_BITS: int = 12  # RP2040 conversion width; read_u16() left-justifies it
 V_REF: float = 3.3
 V_MID: float = 1.65  # Virtual ground / Bias voltage
+ADC_MID_VAL: int = 32768  # Raw code at V_MID (AC zero)
+TICKS_PERIOD: int = 2**30  # MicroPython ticks_us() wrap-around
 
 # Acquisition Settings
 FS_DEFAULT: float = 97793.1  # Hz
 BURST_SAMPLES: int = 16384
 LIVE_SAMPLES: int = 1024  # For streaming/scope views
+PIPELINE_DEPTH: int = 4  # Outstanding 'v' requests in pipelined streaming
+POOL_FRAMES: int = 32  # Preallocated frames for pooled streaming
+RING_FRAMES: int = 256  # Background reader ring depth (~2.7 s of video frames)
+RATE_FACTOR: int = 1  # Firmware rate reduction on connect (fs = FS_DEFAULT / k)
+RATE_AVERAGE: bool = True  # Box-average (True) or plain decimation (False)
+SHM_NAME: str = "sysaudio_stream"  # Acquisition service shared memory segment
+SHM_SLOTS: int = 512  # Frames held in the shared ring (~5 s of live frames)
+FSYNC_INTERVAL: float = 1.0  # Seconds between fsyncs of streaming recordings
+RECORDER_QUEUE_FRAMES: int = 256  # Frames buffered ahead of the disk writer
+SEGMENT_SECONDS: float = 300.0  # Segment length of session recordings (recorder)
+CHUNK_SAMPLES: int = 65536  # Samples per block of chunked containers (io)
+CHUNK_COMPRESSLEVEL: int = 6  # zlib level for chunked containers
+SAVE_COMPRESSLEVEL: int = 6  # zlib level of .npz captures (io.save_signal)
+SAVE_QUEUE_DEPTH: int = 4  # Background saves queued before callers block
+BACKGROUND_SAVE: bool = False  # Opt-in: experiments save while the next capture runs
+DATASET_WORKERS: int = 4  # Loader threads (and files read ahead) in dataset
+CACHE_ENABLED: bool = False  # Opt-in disk cache for analysis results (cache)
+CACHE_MAX_BYTES: int = 512 * 1024**2  # LRU eviction above this size
+CACHE_MIN_SAMPLES: int = 8192  # Smaller inputs (e.g. live frames) skip the cache
 
 # Data Locations
 PROJECT_ROOT: str = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -29,3 +55,5 @@ DATA_DIR: str = os.path.join(PROJECT_ROOT, "data")
 CALIBRATION_FILE_PATH: str = os.path.join(DATA_DIR, "calibration.json")
 DATA_DIR_CONTINUOUS: str = os.path.join(DATA_DIR, "continuous")
 DATA_DIR_BURST: str = os.path.join(DATA_DIR, "burst")
+CATALOG_PATH: str = os.path.join(DATA_DIR, "catalog.sqlite")  # Metadata index
+CACHE_DIR: str = os.path.join(DATA_DIR, "cache")  # Derived results (cache)
@@ -1,10 +1,109 @@
+import atexit
+import json
+import struct
+import threading
 import time
-from typing import Any, Generator, Optional, Type
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import numpy as np
 import serial
 
-from . import config
+from . import buffers, config, telemetry
+
+# Continuous ('c') framing: magic, n_samples, seq, ticks_us (see firmware/main.py).
+# Firmware >= 1.6 uses FRAME_MAGIC_STAMPED and appends the end-of-capture tick.
+FRAME_MAGIC: int = 0xA55A
+FRAME_MAGIC_STAMPED: int = 0xA55B
+FRAME_HEADER = struct.Struct("<HHII")
+FRAME_TICKS_END = struct.Struct("<I")
+
+# Capture timestamp trailer of 's' / 'b' replies after 'k1': start, end ticks_us
+STAMP_TRAILER = struct.Struct("<II")
+
+# Sample packing modes for the 'm' command (see firmware/main.py)
+PACKING_RAW16: int = 0
+PACKING_12BIT: int = 1
+PACKING_DELTA: int = 2
+
+# Length prefix of PACKING_DELTA payloads: encoded bytes that follow
+DELTA_PREFIX = struct.Struct("<H")
+
+# Rate reduction modes for the 'r' command
+RATE_DECIMATE: int = 0
+RATE_AVERAGE: int = 1
+
+# Edge trigger slopes for the 't' command
+TRIGGER_SLOPES: Dict[str, int] = {"off": 0, "rising": 1, "falling": 2}
+
+# Reply prefix of the firmware's identify ('i') command
+IDENTIFY_PREFIX: bytes = b"SYSAUDIO"
+
+# Process-wide connection cache: port -> open serial handle. Ports in
+# _active_ports are currently owned by a connected DAQInterface.
+_connections: Dict[str, serial.Serial] = {}
+_identities: Dict[str, str] = {}
+_active_ports: Set[str] = set()
+
+
+def close_cached_connections() -> None:
+    """Closes every idle serial port held open by the connection cache."""
+    for port in list(_connections):
+        if port in _active_ports:
+            continue
+        ser = _connections.pop(port)
+        if ser.is_open:
+            ser.close()
+
+
+atexit.register(close_cached_connections)
+
+
+class StreamFrame(NamedTuple):
+    """
+    One frame from the gapless continuous protocol.
+
+    Attributes
+    ----------
+    seq : int
+        Firmware sequence number; consecutive frames are contiguous in time.
+    ticks_us : int
+        MCU ticks_us() at the start of capture (wraps at config.TICKS_PERIOD).
+    samples : np.ndarray
+        (n,) array of uint16 raw ADC values.
+    dropped_before : int
+        Number of frames missing between this frame and the previous one.
+    late : bool
+        True if the frame started later than its sequence number implies.
+    filled : bool
+        True if this frame was synthesized to fill a gap.
+    ticks_end_us : int
+        MCU ticks_us() after the last conversion (estimated for legacy
+        firmware and filled frames).
+    fs : float
+        Effective sampling rate of this frame measured from the MCU ticks,
+        or the nominal rate if the firmware does not send end ticks.
+    """
+
+    seq: int
+    ticks_us: int
+    samples: np.ndarray
+    dropped_before: int
+    late: bool
+    filled: bool
+    ticks_end_us: int
+    fs: float
 
 
 class DAQInterface:
@@ -22,14 +121,62 @@ class DAQInterface:
         The baud rate for communication.
     ser : Optional[serial.Serial]
         The underlying pySerial object, or None if not connected.
+    transport : Optional[Any]
+        A pre-opened serial-compatible object (e.g. virtual.VirtualDAQ)
+        used instead of opening `port`.
+    reuse : bool
+        If True, the port stays open after disconnect() and is reused by
+        the next DAQInterface on the same port.
+    connect_latency : float
+        Seconds spent in the last connect() call.
+    identity : str
+        The firmware's identify reply, or '' for legacy firmware.
+    packing : int
+        Sample packing in use on the link (PACKING_RAW16 or PACKING_12BIT).
+    telemetry : telemetry.AcquisitionTelemetry
+        Always-on read counters (throughput, short reads, read latency,
+        inter-frame gaps). Call ``telemetry.snapshot()`` to inspect them.
+    rate_factor : int
+        Firmware rate reduction factor set with set_rate() (1 = native).
+    rate_mode : int
+        RATE_AVERAGE or RATE_DECIMATE.
+    trigger : Optional[Dict[str, Any]]
+        Active on-device trigger for 'v' frames (see set_trigger()), or None.
+    stamps : bool
+        True while bursts carry MCU capture timestamps (see set_timestamps()).
+    measured_fs : Optional[float]
+        Effective sampling rate measured from the MCU ticks of the most
+        recent stamped burst or continuous frame; None until one arrives.
     """
 
     def __init__(
-        self, port: str = config.SERIAL_PORT, baud: int = config.BAUD_RATE
+        self,
+        port: Optional[str] = None,
+        baud: int = config.BAUD_RATE,
+        transport: Optional[Any] = None,
+        reuse: bool = config.REUSE_CONNECTIONS,
     ) -> None:
-        self.port = port
+        # Resolved at call time so config.SERIAL_PORT can be redirected
+        # (e.g. to a virtual device's pty) after import
+        self.port = port or config.SERIAL_PORT
         self.baud = baud
+        self.transport = transport
+        self.reuse = reuse
+        self.connect_latency: float = 0.0
+        self.identity: str = ""
         self.ser: Optional[serial.Serial] = None
+        self.reader: Optional["BackgroundReader"] = None
+        self.stream_stats: Dict[str, int] = {}
+        self.pool: Optional[buffers.BufferPool] = None
+        self.capabilities: Dict[str, Any] = {}
+        self.packing: int = PACKING_RAW16
+        self._packed = np.empty(0, dtype=np.uint8)  # Grown on first packed read
+        self.telemetry = telemetry.AcquisitionTelemetry()
+        self.rate_factor: int = 1
+        self.rate_mode: int = RATE_AVERAGE
+        self.trigger: Optional[Dict[str, Any]] = None
+        self.stamps: bool = False
+        self.measured_fs: Optional[float] = None
 
     def __enter__(self) -> "DAQInterface":
         self.connect()
@@ -45,41 +192,483 @@ class DAQInterface:
 
     def connect(self) -> None:
         """
-        Establishes the serial connection and waits for MCU stabilization.
+        Establishes the serial connection and waits until the MCU answers.
+
+        A port left open by a previous DAQInterface is reused from the
+        process-wide cache. Otherwise the port is opened and the identify
+        command is polled until the firmware replies, which typically
+        takes tens of milliseconds instead of a fixed stabilization sleep.
 
         Raises
         ------
         IOError
-            If the serial port cannot be opened or configured.
+            If the serial port cannot be opened or configured, or is already
+            owned by another connected DAQInterface.
         """
+        start = time.perf_counter()
+
+        if self.transport is not None:
+            self.ser = self.transport
+            self._handshake()
+            try:
+                self._apply_config_defaults()
+            except BaseException:
+                self._restore_defaults()
+                raise
+            self.connect_latency = time.perf_counter() - start
+            return
+
+        if self.port in _active_ports:
+            raise IOError(f"DAQ on {self.port} is already in use.")
+
+        cached = _connections.get(self.port)
+        reused = self.reuse and cached is not None and cached.is_open
+        if cached is not None and reused:
+            ser = cached
+            self.identity = _identities.get(self.port, "")
+            ser.reset_input_buffer()
+        else:
+            try:
+                ser = serial.Serial(self.port, self.baud, timeout=config.TIMEOUT)
+            except serial.SerialException as e:
+                raise IOError(f"Could not connect to DAQ on {self.port}: {e}")
+        self.ser = ser
+
+        # Never cache or register a port whose setup failed
         try:
-            self.ser = serial.Serial(self.port, self.baud, timeout=config.TIMEOUT)
-            time.sleep(2)  # Allow MCU reset/stabilization
-            self.ser.reset_input_buffer()
-        except serial.SerialException as e:
-            raise IOError(f"Could not connect to DAQ on {self.port}: {e}")
+            if not reused:
+                self._handshake()
+            self._apply_config_defaults()
+        except BaseException:
+            self._abort_connect()
+            raise
+
+        if self.reuse:
+            _connections[self.port] = ser
+            _identities[self.port] = self.identity
+        _active_ports.add(self.port)
+        self.connect_latency = time.perf_counter() - start
+
+    def _abort_connect(self) -> None:
+        """Undoes a partial connect(): best-effort reset, then close the port."""
+        ser = self.ser
+        if ser is None:
+            return
+        if ser.is_open:
+            self._restore_defaults()
+        if _connections.get(self.port) is ser:
+            del _connections[self.port]
+        if ser.is_open:
+            ser.close()
 
     def disconnect(self) -> None:
-        """Closes the serial connection if it is currently open."""
-        if self.ser and self.ser.is_open:
-            self.ser.close()
+        """
+        Releases the serial connection.
+
+        With `reuse` enabled the port is returned to the connection cache
+        (see close_cached_connections()); otherwise it is closed. Restoring
+        the firmware's default modes is best-effort: a failure (e.g. while
+        unwinding from a serial error) is reported, the port is closed
+        instead of cached, and the original exception is not masked.
+        """
+        restored = True
+        try:
+            self.stop_reader()
+            if self.ser and self.ser.is_open:
+                restored = self._restore_defaults()
+        finally:
+            if self.transport is None:
+                _active_ports.discard(self.port)
+                cached = _connections.get(self.port) is self.ser
+                if cached and not restored:
+                    # Unknown firmware state: the next user reconnects
+                    del _connections[self.port]
+                elif cached and self.reuse:
+                    return
+            if self.ser and self.ser.is_open:
+                self.ser.close()
+
+    def _restore_defaults(self) -> bool:
+        """
+        Leaves the firmware in its default modes for the next user.
+
+        Returns
+        -------
+        bool
+            False if a reset failed; the remaining ones are skipped, as the
+            link is most likely down.
+        """
+        resets: List[Callable[[], Any]] = []
+        if self.packing != PACKING_RAW16:
+            resets.append(lambda: self.set_packing(PACKING_RAW16))
+        if self.rate_factor != 1:
+            resets.append(lambda: self.set_rate(1))
+        if self.trigger is not None:
+            resets.append(self.clear_trigger)
+        if self.stamps:
+            resets.append(lambda: self.set_timestamps(False))
+
+        for reset in resets:
+            try:
+                reset()
+            except (IOError, ValueError, serial.SerialException) as e:
+                print(f"⚠️ Could not restore DAQ defaults: {e}")
+                return False
+        return True
+
+    def _handshake(self, timeout: float = config.CONNECT_TIMEOUT) -> None:
+        """
+        Polls the identify command ('i') until the firmware answers.
+
+        Firmware that predates 'i' never answers; in that case the poll
+        loop itself has provided the legacy stabilization delay.
+        """
+        if self.ser is None:
+            return
+
+        read_timeout = self.ser.timeout
+        self.ser.timeout = config.HANDSHAKE_INTERVAL
+        deadline = time.perf_counter() + timeout
+        try:
+            while time.perf_counter() < deadline:
+                self.ser.reset_input_buffer()
+                self.ser.write(b"i")
+                reply = self.ser.readline()
+                if reply.startswith(IDENTIFY_PREFIX):
+                    self.identity = reply.decode(errors="replace").strip()
+                    break
+            else:
+                print(
+                    f"⚠️ No identify reply from {self.port}; assuming legacy firmware."
+                )
+
+            # Discard replies to earlier polls that were still in flight
+            while self.ser.read(4096):
+                pass
+        finally:
+            self.ser.timeout = read_timeout
+        self.ser.reset_input_buffer()
+
+    def query_capabilities(self) -> Dict[str, Any]:
+        """
+        Asks the firmware for its buffer limits ('?').
+
+        The reply is cached on ``self.capabilities`` and used to validate
+        burst requests.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Firmware version, max_samples, live_samples, max_decimation and
+            the supported command characters.
+
+        Raises
+        ------
+        IOError
+            If the device does not answer with a valid capability line
+            (e.g. firmware that predates the '?' command).
+        """
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        self._require_idle()
+
+        self.ser.reset_input_buffer()
+        self.ser.write(b"?")
+        line = self.ser.readline()
+
+        try:
+            caps = json.loads(line)
+        except ValueError:
+            raise IOError(f"No capability reply from DAQ: {line!r}")
+
+        self.capabilities = dict(caps)
+        return self.capabilities
+
+    def set_packing(self, packing: int) -> None:
+        """
+        Selects how the firmware encodes samples on the USB link ('m').
+
+        PACKING_12BIT sends the 12-bit ADC codes two per three bytes, cutting
+        the transfer by 25%. PACKING_DELTA sends zigzag varint deltas of the
+        codes (1 byte per sample for audio-band signals, never more than 2),
+        roughly halving the transfer for smooth signals. Either way samples
+        are restored to the exact 16-bit ``read_u16()`` values on the host,
+        so every capture method keeps returning the same uint16 arrays.
+
+        Parameters
+        ----------
+        packing : int
+            PACKING_RAW16, PACKING_12BIT or PACKING_DELTA.
+
+        Raises
+        ------
+        ValueError
+            If `packing` is not a known mode.
+        IOError
+            If the firmware does not support the 'm' command or the mode.
+        """
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        if packing not in (PACKING_RAW16, PACKING_12BIT, PACKING_DELTA):
+            raise ValueError(f"Unknown packing mode: {packing}")
+        self._require_idle()
+        if packing == self.packing:
+            return
+
+        if not self.capabilities:
+            self.query_capabilities()
+        if "m" not in self.capabilities.get("commands", ""):
+            raise IOError("Firmware does not support packed transport ('m').")
+        if packing not in self.capabilities.get("packings", [PACKING_12BIT]):
+            raise IOError(f"Firmware does not support packing mode {packing}.")
 
-    def capture_burst(self, samples: int = config.BURST_SAMPLES) -> np.ndarray:
+        self.ser.write(f"m{packing}\n".encode())
+        self.packing = packing
+
+    def set_rate(self, factor: int, mode: int = RATE_AVERAGE) -> float:
         """
-        Sends the burst command ('s') and retrieves a synchronous block of data.
+        Reduces the firmware sample rate before transmission ('r').
+
+        The setting persists for all later captures (bursts, 'v' frames and
+        the continuous stream) until changed. RATE_AVERAGE box-averages
+        `factor` conversions per sample, which low-pass filters the signal
+        before decimating; RATE_DECIMATE keeps every `factor`-th conversion.
+
+        Parameters
+        ----------
+        factor : int
+            Reduction factor; 1 restores the native rate.
+        mode : int, optional
+            RATE_AVERAGE (default) or RATE_DECIMATE.
+
+        Returns
+        -------
+        float
+            The effective sampling rate, also available as ``self.fs``.
+
+        Raises
+        ------
+        ValueError
+            If the factor exceeds the firmware limit or the mode is unknown.
+        IOError
+            If the firmware does not support or acknowledge the 'r' command.
+        """
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        if mode not in (RATE_DECIMATE, RATE_AVERAGE):
+            raise ValueError(f"Unknown rate mode: {mode}")
+        self._require_idle()
+
+        if not self.capabilities:
+            self.query_capabilities()
+        if "r" not in self.capabilities.get("commands", ""):
+            raise IOError("Firmware does not support rate reduction ('r').")
+        max_factor = int(self.capabilities["max_decimation"])
+        if not 0 < factor <= max_factor:
+            raise ValueError(f"Rate factor {factor} outside 1..{max_factor}")
+
+        self.ser.reset_input_buffer()
+        self.ser.write(f"r{factor},{mode}\n".encode())
+        line = self.ser.readline()
+        try:
+            ack = json.loads(line)
+        except ValueError:
+            raise IOError(f"No rate acknowledgement from DAQ: {line!r}")
+
+        self.rate_factor = int(ack["factor"])
+        self.rate_mode = int(ack["mode"])
+        self.telemetry.fs = self.fs
+        return self.fs
+
+    def set_trigger(
+        self,
+        level: float = config.V_MID,
+        slope: str = "rising",
+        holdoff: float = 0.0,
+        timeout: float = 0.05,
+    ) -> Dict[str, Any]:
+        """
+        Arms the firmware edge trigger for Video Mode ('t').
+
+        Every later 'v' frame (stream_generator, pipelined_stream,
+        threaded_stream, ...) starts at the crossing, so frames no longer
+        need dsp.software_trigger and the full frame is usable waveform.
+
+        Parameters
+        ----------
+        level : float, optional
+            Trigger level in volts. Defaults to config.V_MID.
+        slope : str, optional
+            'rising' or 'falling'. Defaults to 'rising'.
+        holdoff : float, optional
+            Minimum time between triggers in seconds. Defaults to 0.
+        timeout : float, optional
+            Seconds to wait for an edge before capturing free-running
+            (scope 'auto' mode). Must stay below config.TIMEOUT.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The setting acknowledged by the firmware (raw level code, slope,
+            holdoff and timeout in microseconds), also stored on
+            ``self.trigger``.
+
+        Raises
+        ------
+        ValueError
+            If an argument is out of range.
+        IOError
+            If the firmware does not support or acknowledge the 't' command.
+        """
+        if slope not in ("rising", "falling"):
+            raise ValueError(f"Unknown trigger slope: {slope}")
+        if not 0.0 <= level <= config.V_REF:
+            raise ValueError(f"Trigger level {level} V outside 0..{config.V_REF} V")
+        if holdoff < 0 or not 0 < timeout < config.TIMEOUT:
+            raise ValueError("Holdoff must be >= 0 and timeout below config.TIMEOUT")
+
+        code = int(round(level / config.V_REF * config.ADC_MAX_VAL))
+        args = (
+            f"{TRIGGER_SLOPES[slope]},{code},{int(holdoff * 1e6)},{int(timeout * 1e6)}"
+        )
+        self.trigger = self._send_trigger(args)
+        return self.trigger
+
+    def clear_trigger(self) -> None:
+        """Disables the firmware trigger; 'v' frames free-run again."""
+        self._send_trigger(str(TRIGGER_SLOPES["off"]))
+        self.trigger = None
+
+    def _send_trigger(self, args: str) -> Dict[str, Any]:
+        """Sends a 't' command line and returns the JSON acknowledgement."""
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        self._require_idle()
+        if not self.capabilities:
+            self.query_capabilities()
+        if "t" not in self.capabilities.get("commands", ""):
+            raise IOError("Firmware does not support the edge trigger ('t').")
+
+        self.ser.reset_input_buffer()
+        self.ser.write(f"t{args}\n".encode())
+        line = self.ser.readline()
+        try:
+            return dict(json.loads(line))
+        except ValueError:
+            raise IOError(f"No trigger acknowledgement from DAQ: {line!r}")
+
+    def set_timestamps(self, enabled: bool = True) -> None:
+        """
+        Makes the firmware append MCU capture timestamps to bursts ('k').
+
+        Each 's' / 'b' reply then ends with the ticks_us() taken before the
+        first and after the last conversion, and capture_burst() updates
+        ``self.measured_fs`` from them. The Python-loop sampler drifts with
+        temperature and GC, so this tracks the rate of every capture rather
+        than relying on config.FS_DEFAULT. Video frames stay unstamped.
+
+        Parameters
+        ----------
+        enabled : bool, optional
+            Turn the trailer on (True, default) or off.
+
+        Raises
+        ------
+        IOError
+            If the firmware does not support or acknowledge the 'k' command.
+        """
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        self._require_idle()
+        if not self.capabilities:
+            self.query_capabilities()
+        if "k" not in self.capabilities.get("commands", ""):
+            raise IOError("Firmware does not support capture timestamps ('k').")
+
+        self.ser.reset_input_buffer()
+        self.ser.write(f"k{int(enabled)}\n".encode())
+        line = self.ser.readline()
+        try:
+            ack = json.loads(line)
+        except ValueError:
+            raise IOError(f"No timestamp acknowledgement from DAQ: {line!r}")
+        self.stamps = bool(ack["stamps"])
+
+    @property
+    def fs(self) -> float:
+        """Effective sampling rate: config.FS_DEFAULT / rate_factor."""
+        return config.FS_DEFAULT / self.rate_factor
+
+    def _apply_config_defaults(self) -> None:
+        """Applies config.PACKED_TRANSPORT and config.RATE_FACTOR on connect."""
+        if config.PACKED_TRANSPORT:
+            try:
+                self.set_packing(PACKING_12BIT)
+            except IOError:
+                print("⚠️ Firmware does not support packed transport; using 16-bit.")
+        if config.RATE_FACTOR != 1:
+            mode = RATE_AVERAGE if config.RATE_AVERAGE else RATE_DECIMATE
+            self.set_rate(config.RATE_FACTOR, mode)
+
+    def capture_burst(
+        self, samples: int = config.BURST_SAMPLES, decimation: int = 1
+    ) -> np.ndarray:
+        """
+        Captures a synchronous block of data of the requested length.
+
+        A full-length, undecimated burst uses the legacy 's' command; any
+        other length or decimation uses the sized 'b' command so only the
+        requested samples cross the USB link. With decimation 1 the rate set
+        by set_rate() applies; an explicit decimation overrides it.
 
         Parameters
         ----------
         samples : int, optional
             The number of samples to capture. Defaults to config.BURST_SAMPLES.
+        decimation : int, optional
+            Keep every n-th conversion, for an effective rate of fs / n.
+            Defaults to 1.
 
         Returns
         -------
         np.ndarray
-            (samples,) array of uint16 raw ADC values.
+            (samples,) array of uint16 raw ADC values. With set_timestamps()
+            enabled, ``self.measured_fs`` holds the burst's measured rate.
 
         Raises
         ------
+        ValueError
+            If samples or decimation exceed the firmware limits.
+        IOError
+            If the number of bytes read does not match the expected count.
+        AttributeError
+            If the serial connection is not established.
+        """
+        return self.capture_burst_into(np.empty(samples, dtype="<u2"), decimation)
+
+    def capture_burst_into(self, out: np.ndarray, decimation: int = 1) -> np.ndarray:
+        """
+        Burst capture that reads straight into a caller-owned array.
+
+        Uses ``readinto`` so no intermediate ``bytes`` object or new array is
+        created per call; reuse `out` across calls for allocation-free loops.
+
+        Parameters
+        ----------
+        out : np.ndarray
+            C-contiguous uint16 destination. Its size sets the sample count.
+        decimation : int, optional
+            Keep every n-th conversion. Defaults to 1.
+
+        Returns
+        -------
+        np.ndarray
+            `out`, filled with raw ADC values.
+
+        Raises
+        ------
+        ValueError
+            If the size or decimation exceed the firmware limits.
         IOError
             If the number of bytes read does not match the expected count.
         AttributeError
@@ -87,19 +676,43 @@ class DAQInterface:
         """
         if self.ser is None:
             raise AttributeError("Serial device not connected.")
+        self._require_idle()
+        _check_frame_buffer(out)
+        command = self._burst_command(out.size, decimation)
 
         self.ser.reset_input_buffer()
-        self.ser.write(b"s")
+        self.ser.write(command)
+
+        # Nothing is sent before the capture ends, so wait out the capture too
+        read_timeout = self.ser.timeout
+        self.ser.timeout = self.burst_timeout(out.size, decimation)
+        try:
+            got, expected_bytes = self._read_samples(out)
+            if got != expected_bytes:
+                raise IOError(
+                    f"Incomplete read: Got {got} bytes, expected {expected_bytes}"
+                )
 
-        expected_bytes = samples * 2
-        raw = self.ser.read(expected_bytes)
+            if self.stamps:
+                trailer = self._read_exact(STAMP_TRAILER.size)
+                if len(trailer) < STAMP_TRAILER.size:
+                    raise IOError("Incomplete read: missing capture timestamps")
+                self.measured_fs = ticks_fs(out.size, *STAMP_TRAILER.unpack(trailer))
+        finally:
+            self.ser.timeout = read_timeout
 
-        if len(raw) != expected_bytes:
-            raise IOError(
-                f"Incomplete read: Got {len(raw)} bytes, expected {expected_bytes}"
-            )
+        return out
 
-        return np.frombuffer(raw, dtype="<u2")
+    def burst_timeout(self, samples: int, decimation: int = 1) -> float:
+        """
+        Read timeout for a burst: config.TIMEOUT plus the capture duration.
+
+        The firmware performs samples * k conversions at config.FS_DEFAULT
+        before replying, where k is the explicit decimation or, without one,
+        the rate factor set by set_rate().
+        """
+        factor = decimation if decimation != 1 else self.rate_factor
+        return config.TIMEOUT + samples * factor / config.FS_DEFAULT
 
     def stream_generator(
         self, chunk_size: int = config.LIVE_SAMPLES
@@ -122,13 +735,910 @@ class DAQInterface:
         """
         if self.ser is None:
             raise AttributeError("Serial device not connected.")
+        self._require_idle()
 
         self.ser.reset_input_buffer()
         while True:
             self.ser.write(b"v")
-            raw = self.ser.read(chunk_size * 2)
+            chunk = np.empty(chunk_size, dtype="<u2")
 
-            if len(raw) != chunk_size * 2:
+            if not self._read_samples_complete(chunk):
                 continue
 
-            yield np.frombuffer(raw, dtype="<u2")
+            yield chunk
+
+    def pooled_stream(
+        self,
+        pool: Optional[buffers.BufferPool] = None,
+        depth: int = config.PIPELINE_DEPTH,
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Pipelined 'v' stream that recycles frame arrays from a BufferPool.
+
+        Each yielded array is owned by the consumer until it is handed back
+        with ``pool.release(frame)``; released arrays are reused for later
+        frames, so a consumer that releases promptly runs allocation-free.
+        Check ``pool.stats()['allocations']`` to confirm the steady state.
+
+        Parameters
+        ----------
+        pool : Optional[buffers.BufferPool]
+            Pool to draw frames from. If omitted, a pool of
+            config.POOL_FRAMES x config.LIVE_SAMPLES is created and stored
+            on ``self.pool``.
+        depth : int, optional
+            Outstanding requests, as in pipelined_stream().
+
+        Yields
+        ------
+        np.ndarray
+            (pool.frame_size,) array of uint16 raw ADC values.
+        """
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        if depth < 1:
+            raise ValueError("Pipeline depth must be >= 1")
+        self._require_idle()
+
+        if pool is None:
+            pool = buffers.BufferPool(config.LIVE_SAMPLES, config.POOL_FRAMES)
+        self.pool = pool
+
+        frame_bytes = payload_bytes(pool.frame_size, self.packing)
+        self.ser.reset_input_buffer()
+        self.ser.write(b"v" * depth)
+        in_flight = depth
+
+        try:
+            while True:
+                frame = pool.acquire()
+                complete = self._read_samples_complete(frame)
+                in_flight -= 1
+
+                if not complete:
+                    pool.release(frame)
+                    self._drain(in_flight * frame_bytes)
+                    self.ser.write(b"v" * depth)
+                    in_flight = depth
+                    continue
+
+                self.ser.write(b"v")
+                in_flight += 1
+                yield frame
+        finally:
+            if self.ser is not None and self.ser.is_open:
+                self._drain(in_flight * frame_bytes)
+
+    def pipelined_stream(
+        self,
+        depth: int = config.PIPELINE_DEPTH,
+        chunk_size: int = config.LIVE_SAMPLES,
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Yields 'v' frames while keeping `depth` requests in flight.
+
+        The firmware services commands strictly in order, so queuing several
+        'v' bytes ahead hides the host->MCU->host round trip behind the
+        capture of the following frames. Responses are matched to requests
+        in FIFO order; a short read desynchronizes the pipe, so the pipeline
+        is flushed and re-primed.
+
+        Parameters
+        ----------
+        depth : int, optional
+            Number of outstanding requests. 1 is equivalent to
+            stream_generator(). Defaults to config.PIPELINE_DEPTH.
+        chunk_size : int, optional
+            The number of samples per yielded chunk. Defaults to config.LIVE_SAMPLES.
+
+        Yields
+        ------
+        np.ndarray
+            (chunk_size,) array of uint16 raw ADC values.
+        """
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        if depth < 1:
+            raise ValueError("Pipeline depth must be >= 1")
+        self._require_idle()
+
+        expected_bytes = payload_bytes(chunk_size, self.packing)
+        self.ser.reset_input_buffer()
+        self.ser.write(b"v" * depth)
+        in_flight = depth
+
+        try:
+            while True:
+                chunk = np.empty(chunk_size, dtype="<u2")
+                complete = self._read_samples_complete(chunk)
+                in_flight -= 1
+
+                if not complete:
+                    # Lost framing: discard whatever is still queued and re-prime
+                    self._drain(in_flight * expected_bytes)
+                    self.ser.write(b"v" * depth)
+                    in_flight = depth
+                    continue
+
+                # Refill the slot before handing the frame to the consumer
+                self.ser.write(b"v")
+                in_flight += 1
+                yield chunk
+        finally:
+            if self.ser is not None and self.ser.is_open:
+                self._drain(in_flight * expected_bytes)
+
+    def continuous_stream(
+        self,
+        fill_gaps: bool = False,
+        fill_value: int = config.ADC_MID_VAL,
+        late_tolerance: float = 0.25,
+        fs: Optional[float] = None,
+    ) -> Generator[StreamFrame, None, None]:
+        """
+        Yields gapless, sequence-numbered frames from the 'c' command.
+
+        The firmware captures into ping-pong buffers on core 1 while core 0
+        transmits, so consecutive sequence numbers are contiguous in time.
+        Missing sequence numbers are reported as dropped frames, and frames
+        whose MCU timestamp is further from the previous one than their
+        sequence distance implies are flagged as late. Counters are kept in
+        ``self.stream_stats``.
+
+        Parameters
+        ----------
+        fill_gaps : bool, optional
+            If True, synthesize a frame of `fill_value` for every dropped
+            frame so concatenated output keeps correct sample positions.
+        fill_value : int, optional
+            Raw ADC code used for synthesized frames. Defaults to the
+            mid-rail code (AC zero).
+        late_tolerance : float, optional
+            Fractional excess over the expected frame interval before a
+            frame is flagged late. Defaults to 0.25.
+        fs : Optional[float]
+            Sampling rate used to derive the expected frame interval.
+            Defaults to ``self.fs``.
+
+        Yields
+        ------
+        StreamFrame
+            Frame data plus sequence, timestamp and gap annotations, and the
+            frame's measured sampling rate (also kept in
+            ``self.measured_fs``).
+        """
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        self._require_idle()
+
+        fs = fs or self.fs
+        self.stream_stats = {"frames": 0, "dropped": 0, "late": 0, "resyncs": 0}
+        prev_seq: Optional[int] = None
+        prev_ticks = 0
+
+        self.ser.reset_input_buffer()
+        self.ser.write(b"c")
+        try:
+            while True:
+                header = self._read_frame_header()
+                if header is None:
+                    continue
+                _, n, seq, ticks, ticks_end = header
+
+                samples = np.empty(n, dtype="<u2")
+                if not self._read_samples_complete(samples):
+                    self.stream_stats["resyncs"] += 1
+                    continue
+
+                frame_us = n / fs * 1e6
+                frame_fs = fs
+                if ticks_end is None:
+                    ticks_end = int(ticks + frame_us) % config.TICKS_PERIOD
+                else:
+                    frame_fs = ticks_fs(n, ticks, ticks_end) or fs
+                    self.measured_fs = frame_fs
+                dropped = 0
+                late = False
+                if prev_seq is not None and seq > prev_seq:
+                    dropped = seq - prev_seq - 1
+                    elapsed_us = (ticks - prev_ticks) % config.TICKS_PERIOD
+                    expected_us = (seq - prev_seq) * frame_us
+                    late = elapsed_us > expected_us * (1.0 + late_tolerance)
+
+                if dropped and fill_gaps and prev_seq is not None:
+                    fill_fs = self.measured_fs or fs
+                    for k in range(1, dropped + 1):
+                        t_fill = int(prev_ticks + k * frame_us) % config.TICKS_PERIOD
+                        t_end = int(t_fill + frame_us) % config.TICKS_PERIOD
+                        # One array per frame: consumers may modify frames in place
+                        filler = np.full(n, fill_value, dtype="<u2")
+                        yield StreamFrame(
+                            prev_seq + k, t_fill, filler, 0, False, True, t_end, fill_fs
+                        )
+
+                self.stream_stats["frames"] += 1
+                self.stream_stats["dropped"] += dropped
+                self.stream_stats["late"] += int(late)
+                prev_seq, prev_ticks = seq, ticks
+
+                yield StreamFrame(
+                    seq, ticks, samples, dropped, late, False, ticks_end, frame_fs
+                )
+        finally:
+            self._stop_continuous()
+
+    def measure_duty_cycle(
+        self,
+        depth: int = config.PIPELINE_DEPTH,
+        duration: float = 2.0,
+        chunk_size: int = config.LIVE_SAMPLES,
+        fs: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Measures how much of wall time is covered by captured samples.
+
+        duty_cycle = captured samples / (wall time * fs). A value of 1.0
+        means the stream is gapless; the remainder is time lost to USB
+        round trips and transmission.
+
+        Parameters
+        ----------
+        depth : int, optional
+            Pipeline depth to test. Defaults to config.PIPELINE_DEPTH.
+        duration : float, optional
+            Measurement window in seconds. Defaults to 2.0.
+        chunk_size : int, optional
+            Samples per frame. Defaults to config.LIVE_SAMPLES.
+        fs : Optional[float]
+            Sampling rate in Hz. Defaults to ``self.fs``.
+
+        Returns
+        -------
+        Dict[str, Any]
+            depth, frames, samples, wall_time, frame_rate and duty_cycle.
+        """
+        fs = fs or self.fs
+        frames = 0
+        stream = self.pipelined_stream(depth, chunk_size)
+        start = time.perf_counter()
+        try:
+            for _ in stream:
+                frames += 1
+                if time.perf_counter() - start >= duration:
+                    break
+        finally:
+            wall_time = time.perf_counter() - start
+            stream.close()
+
+        samples = frames * chunk_size
+        return {
+            "depth": depth,
+            "frames": frames,
+            "samples": samples,
+            "wall_time": wall_time,
+            "frame_rate": frames / wall_time,
+            "duty_cycle": samples / (wall_time * fs),
+        }
+
+    def _read_frame_header(
+        self,
+    ) -> Optional[tuple[int, int, int, int, Optional[int]]]:
+        """
+        Reads one continuous-mode header, resynchronizing on the magic word.
+
+        Returns
+        -------
+        Optional[tuple[int, int, int, int, Optional[int]]]
+            (magic, n_samples, seq, ticks_us, ticks_end_us), or None on
+            timeout. ticks_end_us is None for legacy (unstamped) frames.
+        """
+        if self.ser is None:
+            return None
+
+        buf = bytearray(self._read_exact(FRAME_HEADER.size))
+        self.telemetry.bytes_read += len(buf)
+        if len(buf) < FRAME_HEADER.size:
+            return None
+
+        # Slide byte-by-byte until the magic word and a sane length line up
+        resynced = False
+        while True:
+            magic, n, seq, ticks = FRAME_HEADER.unpack(buf)
+            stamped = magic == FRAME_MAGIC_STAMPED
+            if (stamped or magic == FRAME_MAGIC) and 0 < n <= config.BURST_SAMPLES:
+                break
+            resynced = True
+            nxt = self.ser.read(1)
+            if not nxt:
+                return None
+            del buf[0]
+            buf += nxt
+
+        if resynced:
+            self.stream_stats["resyncs"] = self.stream_stats.get("resyncs", 0) + 1
+        if not stamped:
+            return magic, n, seq, ticks, None
+
+        tail = self._read_exact(FRAME_TICKS_END.size)
+        self.telemetry.bytes_read += len(tail)
+        if len(tail) < FRAME_TICKS_END.size:
+            return None
+        return magic, n, seq, ticks, FRAME_TICKS_END.unpack(tail)[0]
+
+    def _read_exact(self, n_bytes: int) -> bytes:
+        """Reads `n_bytes`, tolerating short reads; fewer means a timeout."""
+        if self.ser is None:
+            return b""
+        data = bytearray()
+        while len(data) < n_bytes:
+            chunk = self.ser.read(n_bytes - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return bytes(data)
+
+    def _stop_continuous(self) -> None:
+        """Sends the stop command and discards frames still in the pipe."""
+        if self.ser is None or not self.ser.is_open:
+            return
+
+        self.ser.write(b"x")
+        self._read_until_idle()
+        self.ser.reset_input_buffer()
+
+    def _read_until_idle(self, quiet: float = 0.05) -> None:
+        """Discards input until nothing arrives for `quiet` seconds."""
+        if self.ser is not None:
+            _read_until_idle(self.ser, quiet)
+
+    def _read_samples(self, out: np.ndarray) -> Tuple[int, int]:
+        """
+        Reads one sample payload into `out`, decoding the current packing.
+
+        Returns
+        -------
+        Tuple[int, int]
+            (bytes read, bytes expected); fewer bytes read means a timeout
+            (or an undecodable payload), in which case `out` is incomplete.
+        """
+        if self.ser is None:
+            return 0, payload_bytes(out.size, self.packing)
+        started = time.perf_counter()
+        got, expected = _read_samples(self.ser, out, self.packing, self._packed)
+        now = self.telemetry.record_read(got, expected, started)
+        if got == expected:
+            self.telemetry.record_frame(out.size, now)
+        return got, expected
+
+    def _read_samples_complete(self, out: np.ndarray) -> bool:
+        """True if a full payload was read into `out`."""
+        got, expected = self._read_samples(out)
+        return got == expected
+
+    def _drain(self, n_bytes: int) -> None:
+        """Reads and discards responses still in flight, then clears the input."""
+        if self.ser is None:
+            return
+        if self.packing == PACKING_DELTA:
+            # Variable-size payloads: n_bytes is only an upper bound
+            self._read_until_idle()
+        elif n_bytes > 0:
+            self.ser.read(n_bytes)
+        self.ser.reset_input_buffer()
+
+    def start_reader(
+        self,
+        chunk_size: int = config.LIVE_SAMPLES,
+        ring_frames: int = config.RING_FRAMES,
+    ) -> "BackgroundReader":
+        """
+        Starts a dedicated thread that keeps the serial pipe drained.
+
+        The thread issues 'v' requests back-to-back and writes each frame into
+        a preallocated ring buffer, so a slow consumer no longer stalls
+        acquisition. While the reader runs, the synchronous capture methods
+        are unavailable.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            Samples per frame. Defaults to config.LIVE_SAMPLES.
+        ring_frames : int, optional
+            Number of frames held in the ring. Defaults to config.RING_FRAMES.
+
+        Returns
+        -------
+        BackgroundReader
+            The running reader (also stored on ``self.reader``).
+        """
+        if self.ser is None:
+            raise AttributeError("Serial device not connected.")
+        self._require_idle()
+
+        ring = buffers.FrameRingBuffer(ring_frames, chunk_size)
+        self.reader = BackgroundReader(self.ser, ring, self.packing, self.telemetry)
+        self.reader.start()
+        return self.reader
+
+    def stop_reader(self) -> None:
+        """Stops the background reader thread, if one is running."""
+        if self.reader is not None:
+            self.reader.stop()
+            self.reader = None
+
+    def threaded_stream(
+        self,
+        mode: str = "all",
+        chunk_size: int = config.LIVE_SAMPLES,
+        ring_frames: int = config.RING_FRAMES,
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Drop-in replacement for ``stream_generator`` backed by a reader thread.
+
+        Parameters
+        ----------
+        mode : str, optional
+            'all' yields every frame in order (counting overruns if the
+            consumer falls a full ring behind); 'latest' always yields the
+            newest frame and skips the rest. Defaults to 'all'.
+        chunk_size : int, optional
+            Samples per frame. Defaults to config.LIVE_SAMPLES.
+        ring_frames : int, optional
+            Number of frames held in the ring. Defaults to config.RING_FRAMES.
+
+        Yields
+        ------
+        np.ndarray
+            (chunk_size,) array of uint16 raw ADC values (a private copy).
+        """
+        reader = self.start_reader(chunk_size, ring_frames)
+        try:
+            yield from reader.frames(mode)
+        finally:
+            self.stop_reader()
+
+    def _burst_command(self, samples: int, decimation: int) -> bytes:
+        """Validates a burst request and encodes the matching command."""
+        if samples == config.BURST_SAMPLES and decimation == 1:
+            return b"s"
+
+        if not self.capabilities:
+            self.query_capabilities()
+        max_samples = int(self.capabilities["max_samples"])
+        max_decimation = int(self.capabilities["max_decimation"])
+
+        if not 0 < samples <= max_samples:
+            raise ValueError(f"Burst length {samples} outside 1..{max_samples}")
+        if not 0 < decimation <= max_decimation:
+            raise ValueError(f"Decimation {decimation} outside 1..{max_decimation}")
+
+        if decimation == 1:
+            return f"b{samples}\n".encode()
+        return f"b{samples},{decimation}\n".encode()
+
+    def _require_idle(self) -> None:
+        """Guards synchronous commands against a running background reader."""
+        if self.reader is not None:
+            raise RuntimeError("Background reader is active; call stop_reader().")
+
+
+class BackgroundReader:
+    """
+    Reader thread that drains 'v' frames into a FrameRingBuffer.
+
+    Attributes
+    ----------
+    ring : buffers.FrameRingBuffer
+        The ring the thread writes into.
+    short_reads : int
+        Requests that returned fewer bytes than a full frame.
+    error : Optional[BaseException]
+        The exception that terminated the thread, if any.
+    telemetry : telemetry.AcquisitionTelemetry
+        Counters updated by the thread (shared with the DAQInterface).
+    """
+
+    def __init__(
+        self,
+        ser: serial.Serial,
+        ring: buffers.FrameRingBuffer,
+        packing: int = PACKING_RAW16,
+        counters: Optional[telemetry.AcquisitionTelemetry] = None,
+    ) -> None:
+        self.ser = ser
+        self.ring = ring
+        self.packing = packing
+        self.telemetry = counters or telemetry.AcquisitionTelemetry()
+        self.short_reads: int = 0
+        self.error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="daq-reader", daemon=True
+        )
+
+    def start(self) -> None:
+        """Flushes stale input and launches the reader thread."""
+        self.ser.reset_input_buffer()
+        self._thread.start()
+
+    def stop(self, timeout: float = config.TIMEOUT) -> None:
+        """Signals the thread to exit and waits for the in-flight read."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
+        if self.ser.is_open:
+            self.ser.reset_input_buffer()
+
+    @property
+    def is_alive(self) -> bool:
+        """True while the reader thread is running."""
+        return self._thread.is_alive()
+
+    def frames(
+        self, mode: str = "all", poll_interval: float = 0.001
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Yields frames from the ring until the reader stops.
+
+        Parameters
+        ----------
+        mode : str, optional
+            'all' for every frame or 'latest' for newest-only. Defaults to 'all'.
+        poll_interval : float, optional
+            Sleep between checks when the ring is empty, in seconds.
+
+        Yields
+        ------
+        np.ndarray
+            (frame_size,) array of uint16 raw ADC values.
+
+        Raises
+        ------
+        IOError
+            If the reader thread died on a serial error.
+        """
+        if mode == "all":
+            pull = self.ring.pop
+        elif mode == "latest":
+            pull = self.ring.latest
+        else:
+            raise ValueError(f"Unknown mode: {mode}")
+
+        while self.is_alive or self.ring.available():
+            frame = pull()
+            if frame is None:
+                time.sleep(poll_interval)
+                continue
+            yield frame
+
+        if self.error is not None:
+            raise IOError(f"Background reader failed: {self.error}") from self.error
+
+    def stats(self) -> Dict[str, int]:
+        """Returns ring counters plus reader-side short reads."""
+        return {**self.ring.stats(), "short_reads": self.short_reads}
+
+    def _run(self) -> None:
+        expected_bytes = payload_bytes(self.ring.frame_size, self.packing)
+        packed = np.empty(expected_bytes, dtype=np.uint8)
+        try:
+            while not self._stop.is_set():
+                self.ser.write(b"v")
+                # Read straight into the ring slot; it is only published on
+                # commit(), so a short read leaves nothing visible
+                slot = self.ring.writable_slot()
+                started = time.perf_counter()
+                got, expected = _read_samples(self.ser, slot, self.packing, packed)
+                now = self.telemetry.record_read(got, expected, started)
+                if got != expected:
+                    self.short_reads += 1
+                    self._drain(expected - got)
+                    continue
+                self.ring.commit()
+                self.telemetry.record_frame(self.ring.frame_size, now)
+        except (serial.SerialException, OSError) as e:
+            self.error = e
+
+    def _drain(self, missing: int) -> None:
+        """
+        Discards the rest of a short frame before the next request.
+
+        Bytes of the frame that arrive late would otherwise be read as the
+        start of the next one and misalign every frame after it.
+        """
+        if self.packing == PACKING_DELTA:
+            # Variable-size payloads: the missing count is only a bound
+            _read_until_idle(self.ser)
+        elif missing > 0:
+            self.ser.read(missing)
+        self.ser.reset_input_buffer()
+
+
+def ticks_fs(n_samples: int, ticks_start: int, ticks_end: int) -> Optional[float]:
+    """
+    Effective sampling rate from MCU capture timestamps.
+
+    Parameters
+    ----------
+    n_samples : int
+        Samples captured between the two ticks.
+    ticks_start : int
+        ticks_us() before the first conversion.
+    ticks_end : int
+        ticks_us() after the last conversion (may have wrapped).
+
+    Returns
+    -------
+    Optional[float]
+        n_samples per elapsed second, or None if no time elapsed.
+    """
+    elapsed_us = (ticks_end - ticks_start) % config.TICKS_PERIOD
+    if elapsed_us == 0:
+        return None
+    return n_samples * 1e6 / elapsed_us
+
+
+def payload_bytes(n_samples: int, packing: int = PACKING_RAW16) -> int:
+    """
+    Number of bytes the firmware sends for `n_samples` in `packing`.
+
+    PACKING_DELTA payloads vary with the signal; this returns their upper
+    bound (length prefix plus 2 bytes per sample).
+    """
+    if packing == PACKING_12BIT:
+        return 3 * ((n_samples + 1) // 2)
+    if packing == PACKING_DELTA:
+        return DELTA_PREFIX.size + 2 * n_samples
+    return 2 * n_samples
+
+
+def pack12(samples: np.ndarray) -> bytes:
+    """
+    Packs read_u16() values the way the firmware's 'm1' mode does.
+
+    Keeps the top 12 bits of each sample and stores pairs (a, b) as the
+    bytes a[7:0], b[3:0]a[11:8], b[11:4]. An odd count is padded with zero.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        Array of uint16 raw ADC values.
+
+    Returns
+    -------
+    bytes
+        The packed payload, payload_bytes(samples.size, PACKING_12BIT) long.
+    """
+    codes = np.asarray(samples, dtype=np.uint16) >> 4
+    if codes.size % 2:
+        codes = np.append(codes, np.uint16(0))
+    a = codes[0::2]
+    b = codes[1::2]
+
+    packed = np.empty((a.size, 3), dtype=np.uint8)
+    packed[:, 0] = a & 0xFF
+    packed[:, 1] = (a >> 8) | ((b & 0x0F) << 4)
+    packed[:, 2] = b >> 4
+    return packed.tobytes()
+
+
+def unpack12(
+    packed: Union[bytes, bytearray, memoryview, np.ndarray],
+    n_samples: int,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Decodes a 12-bit packed payload into 16-bit read_u16() values.
+
+    The 12-bit codes are expanded with ``(v << 4) | (v >> 8)``, the same
+    scaling MicroPython's read_u16() applies, so the result is identical to
+    what the raw 16-bit transport would have delivered.
+
+    Parameters
+    ----------
+    packed : bytes-like or np.ndarray
+        At least payload_bytes(n_samples, PACKING_12BIT) bytes.
+    n_samples : int
+        Number of samples to decode.
+    out : Optional[np.ndarray]
+        uint16 destination of size `n_samples`. Allocated if omitted.
+
+    Returns
+    -------
+    np.ndarray
+        (n_samples,) array of uint16 raw ADC values (`out` if given).
+
+    Raises
+    ------
+    ValueError
+        If `packed` is shorter than the payload for `n_samples`.
+    """
+    n_pairs = (n_samples + 1) // 2
+    data = np.frombuffer(packed, dtype=np.uint8)
+    if data.size < 3 * n_pairs:
+        raise ValueError("Truncated 12-bit payload")
+    raw = data[: 3 * n_pairs].reshape(-1, 3)
+    if out is None:
+        out = np.empty(n_samples, dtype="<u2")
+
+    b0 = raw[:, 0].astype(np.uint16)
+    b1 = raw[:, 1].astype(np.uint16)
+    b2 = raw[:, 2].astype(np.uint16)
+    out[0::2] = b0 | ((b1 & 0x0F) << 8)
+    out[1::2] = ((b1 >> 4) | (b2 << 4))[: n_samples // 2]
+
+    out <<= 4
+    out |= out >> 12
+    return out
+
+
+def pack_delta(samples: np.ndarray) -> bytes:
+    """
+    Encodes read_u16() values the way the firmware's 'm2' mode does.
+
+    The 12-bit codes are differenced (the first against 0), zigzag mapped
+    so small negative steps stay small, and written as base-128 varints:
+    1 byte for |delta| < 64, otherwise 2. A 2-byte little-endian prefix
+    holds the number of encoded bytes that follow.
+
+    Parameters
+    ----------
+    samples : np.ndarray
+        Array of uint16 raw ADC values.
+
+    Returns
+    -------
+    bytes
+        The length-prefixed payload.
+    """
+    codes = (np.asarray(samples, dtype=np.uint16) >> 4).astype(np.int32)
+    delta = np.diff(codes, prepend=0)
+    zigzag = ((delta << 1) ^ (delta >> 31)).astype(np.uint16)
+
+    wide = zigzag >= 0x80
+    sizes = 1 + wide.astype(np.intp)
+    ends = np.cumsum(sizes) - 1
+    body = np.empty(int(sizes.sum()), dtype=np.uint8)
+    body[ends] = np.where(wide, zigzag >> 7, zigzag)
+    body[ends[wide] - 1] = (zigzag[wide] & 0x7F) | 0x80
+    return DELTA_PREFIX.pack(body.size) + body.tobytes()
+
+
+def unpack_delta(
+    payload: Union[bytes, bytearray, memoryview, np.ndarray],
+    n_samples: int,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Decodes a delta/varint payload into 16-bit read_u16() values.
+
+    Fully vectorized: varint boundaries are the bytes without the
+    continuation bit, two-byte values are merged with one masked gather,
+    and the deltas are integrated with a cumulative sum.
+
+    Parameters
+    ----------
+    payload : bytes-like or np.ndarray
+        The length-prefixed payload (as produced by pack_delta()).
+    n_samples : int
+        Number of samples encoded.
+    out : Optional[np.ndarray]
+        uint16 destination of size `n_samples`. Allocated if omitted.
+
+    Returns
+    -------
+    np.ndarray
+        (n_samples,) array of uint16 raw ADC values (`out` if given).
+
+    Raises
+    ------
+    ValueError
+        If the payload does not decode to exactly `n_samples` valid codes.
+    """
+    raw = np.frombuffer(payload, dtype=np.uint8)
+    if raw.size < DELTA_PREFIX.size:
+        raise ValueError("Corrupt delta payload: missing length prefix")
+    n_bytes = DELTA_PREFIX.unpack_from(raw)[0]
+    body = raw[DELTA_PREFIX.size : DELTA_PREFIX.size + n_bytes]
+    if out is None:
+        out = np.empty(n_samples, dtype="<u2")
+    if n_samples == 0 and n_bytes == 0:
+        return out
+
+    ends = np.flatnonzero(body < 0x80)
+    if ends.size != n_samples or body.size != n_bytes or ends[-1] != n_bytes - 1:
+        raise ValueError("Corrupt delta payload: sample count mismatch")
+
+    sizes = np.diff(ends, prepend=-1)
+    if sizes.max() > 2:
+        raise ValueError("Corrupt delta payload: varint longer than 2 bytes")
+    zigzag = body[ends].astype(np.int32)
+    wide = sizes == 2
+    zigzag[wide] = (zigzag[wide] << 7) | (body[ends[wide] - 1] & 0x7F)
+
+    codes = np.cumsum((zigzag >> 1) ^ -(zigzag & 1), dtype=np.int32)
+    if codes.min() < 0 or codes.max() > 0xFFF:
+        raise ValueError("Corrupt delta payload: code out of range")
+
+    out[:] = (codes << 4) | (codes >> 8)
+    return out
+
+
+def _read_samples(
+    ser: Any, out: np.ndarray, packing: int, packed: np.ndarray
+) -> Tuple[int, int]:
+    """
+    Reads one sample payload from `ser` into `out`.
+
+    Raw payloads are read in place; packed payloads are read into the
+    `packed` scratch buffer and decoded into `out` once complete.
+
+    Returns
+    -------
+    Tuple[int, int]
+        (bytes read, bytes expected). The payload is complete, and `out`
+        valid, only if both are equal.
+    """
+    if packing == PACKING_RAW16:
+        return _readinto(ser, out), 2 * out.size
+
+    n_bytes = payload_bytes(out.size, packing)
+    if packed.size < n_bytes:
+        packed.resize(n_bytes, refcheck=False)
+
+    if packing == PACKING_DELTA:
+        got = _readinto(ser, packed[: DELTA_PREFIX.size])
+        if got < DELTA_PREFIX.size:
+            return got, n_bytes
+        n_bytes = DELTA_PREFIX.size + DELTA_PREFIX.unpack_from(packed)[0]
+        if n_bytes > packed.size:
+            return got, n_bytes  # Corrupt prefix: let the caller resync
+        got += _readinto(ser, packed[DELTA_PREFIX.size : n_bytes])
+        if got == n_bytes:
+            try:
+                unpack_delta(packed[:n_bytes], out.size, out)
+            except ValueError:
+                return got, n_bytes + 1  # Undecodable: report as incomplete
+        return got, n_bytes
+
+    view = packed[:n_bytes]
+    got = _readinto(ser, view)
+    if got == n_bytes:
+        unpack12(view, out.size, out)
+    return got, n_bytes
+
+
+def _readinto(ser: Any, buf: np.ndarray) -> int:
+    """
+    Reads from `ser` directly into the memory of `buf`.
+
+    Returns
+    -------
+    int
+        Number of bytes read.
+    """
+    view = memoryview(buf).cast("B")
+    total = 0
+    while total < len(view):
+        n = ser.readinto(view[total:])
+        if not n:
+            break
+        total += n
+    return total
+
+
+def _read_until_idle(ser: Any, quiet: float = 0.05) -> None:
+    """Discards input from `ser` until nothing arrives for `quiet` seconds."""
+    timeout = ser.timeout
+    ser.timeout = quiet
+    try:
+        while ser.read(4096):
+            pass
+    finally:
+        ser.timeout = timeout
+
+
+def _check_frame_buffer(buf: np.ndarray) -> None:
+    """Validates that `buf` can be filled in place with raw ADC words."""
+    if buf.dtype != np.dtype("<u2") or not buf.flags.c_contiguous:
+        raise ValueError("Frame buffers must be C-contiguous little-endian uint16")
@@ -0,0 +1,214 @@
+"""
+Bulk access to many captures for batch analysis.
+
+A `Dataset` is a list of capture files, selected by glob pattern or by a
+metadata query against the catalog. Files are loaded concurrently on a
+thread pool (decompression and disk reads release the GIL), and a file
+that fails to load is recorded in ``Dataset.errors`` instead of stopping
+the batch. ``frames()`` cuts every file into fixed-size, optionally
+overlapping frames tagged with their source file and offset.
+"""
+
+import glob
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from . import catalog, config, io
+
+
+class Frame(NamedTuple):
+    """
+    One frame cut from a capture by Dataset.frames().
+
+    Attributes
+    ----------
+    path : str
+        Source file.
+    offset : int
+        Index of the frame's first sample within the file.
+    samples : np.ndarray
+        (size,) view into the loaded signal.
+    fs : float
+        Sampling rate of the source file in Hz.
+    """
+
+    path: str
+    offset: int
+    samples: np.ndarray
+    fs: float
+
+
+class Dataset:
+    """
+    A set of capture files loaded concurrently.
+
+    Parameters
+    ----------
+    paths : Sequence[str]
+        Capture files (.npz, raw captures or chunked containers).
+    volts : Optional[bool]
+        Load voltages (True), uint16 ADC codes (False) or the stored samples
+        (None, the default); see io.load_signal.
+    dtype : np.dtype, optional
+        Float dtype of the voltages. Defaults to float64.
+    workers : int, optional
+        Loader threads. Defaults to config.DATASET_WORKERS.
+
+    Attributes
+    ----------
+    errors : Dict[str, Exception]
+        Files that failed to load in the last load() or frames() call.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        volts: Optional[bool] = None,
+        dtype: np.dtype = np.dtype(np.float64),
+        workers: int = config.DATASET_WORKERS,
+    ) -> None:
+        self.paths: List[str] = [str(p) for p in paths]
+        self.volts = volts
+        self.dtype = dtype
+        self.workers = workers
+        self.errors: Dict[str, Exception] = {}
+
+    @classmethod
+    def from_glob(cls, pattern: str, **kwargs: Any) -> "Dataset":
+        """
+        Selects files by glob pattern (``**`` recurses), in sorted order.
+
+        Parameters
+        ----------
+        pattern : str
+            e.g. ``os.path.join(config.DATA_DIR_BURST, "llama_*.npz")``.
+        **kwargs
+            Passed on to Dataset().
+        """
+        paths = sorted(glob.glob(pattern, recursive=True))
+        return cls([p for p in paths if io.is_capture_file(p)], **kwargs)
+
+    @classmethod
+    def from_catalog(
+        cls,
+        directory: str,
+        query: Optional[str] = None,
+        db_path: str = config.CATALOG_PATH,
+        **kwargs: Any,
+    ) -> "Dataset":
+        """
+        Selects files by their metadata via the catalog.
+
+        Parameters
+        ----------
+        directory : str
+            Root directory to index (see catalog.MetadataCatalog).
+        query : Optional[str]
+            pandas.DataFrame.query expression over the scan_metadata
+            columns, e.g. ``"audio_type == 'steady' and freq == 1000"``.
+            None selects every capture.
+        db_path : str, optional
+            Catalog database. Defaults to config.CATALOG_PATH.
+        **kwargs
+            Passed on to Dataset().
+        """
+        with catalog.MetadataCatalog(db_path) as cat:
+            df = cat.query(directory, include_path=True)
+        if query is not None and not df.empty:
+            df = df.query(query)
+        return cls(list(df["path"]) if not df.empty else [], **kwargs)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _load(self, path: str) -> Tuple[np.ndarray, float]:
+        return io.load_signal(path, volts=self.volts, dtype=self.dtype)
+
+    def _record_error(self, path: str, error: Exception) -> None:
+        self.errors[path] = error
+        print(f"⚠️ Skipping {path}: {error}")
+
+    def load(self) -> Dict[str, Tuple[np.ndarray, float]]:
+        """
+        Loads every file concurrently.
+
+        Returns
+        -------
+        Dict[str, Tuple[np.ndarray, float]]
+            (signal, fs) keyed by path, in dataset order. Files that failed
+            are left out and listed in `errors`.
+        """
+        self.errors = {}
+        results: Dict[str, Tuple[np.ndarray, float]] = {}
+        with ThreadPoolExecutor(self.workers) as pool:
+            futures = [(path, pool.submit(self._load, path)) for path in self.paths]
+            for path, future in futures:
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    self._record_error(path, e)
+        return results
+
+    def frames(self, size: int, hop: Optional[int] = None) -> Iterator[Frame]:
+        """
+        Yields fixed-size frames from every file, in dataset order.
+
+        Up to `workers` files are loaded ahead of the consumer, so memory
+        is bounded by a few files whatever the dataset size. Frames do not
+        span files, and a file's trailing samples that do not fill a frame
+        are dropped.
+
+        Parameters
+        ----------
+        size : int
+            Samples per frame.
+        hop : Optional[int]
+            Samples between frame starts; smaller than `size` for
+            overlapping frames. Defaults to `size` (no overlap).
+
+        Yields
+        ------
+        Frame
+            Read-only view of the samples with file and offset provenance.
+        """
+        hop = hop or size
+        self.errors = {}
+        with ThreadPoolExecutor(self.workers) as pool:
+            pending: Deque[Tuple[str, Future[Tuple[np.ndarray, float]]]] = deque()
+            queued = iter(self.paths)
+            for path in queued:
+                pending.append((path, pool.submit(self._load, path)))
+                if len(pending) >= self.workers:
+                    break
+
+            while pending:
+                path, future = pending.popleft()
+                # Keep the look-ahead full while this file is consumed
+                next_path = next(queued, None)
+                if next_path is not None:
+                    pending.append((next_path, pool.submit(self._load, next_path)))
+                try:
+                    signal, fs = future.result()
+                except Exception as e:
+                    self._record_error(path, e)
+                    continue
+
+                signal = np.ravel(signal)
+                if signal.size < size:
+                    continue
+                windows = np.lib.stride_tricks.sliding_window_view(signal, size)
+                for offset in range(0, windows.shape[0], hop):
+                    yield Frame(path, offset, windows[offset], fs)
@@ -1,26 +1,73 @@
-from typing import Tuple
+from typing import Optional, Tuple
 
 import numpy as np
 import scipy.signal as spsig
 
-from . import config
+from . import cache, config
 
 
-def raw_to_volts(raw_data: np.ndarray) -> np.ndarray:
+def raw_to_volts(
+    raw_data: np.ndarray,
+    scale: Optional[float] = None,
+    offset: float = 0.0,
+    dtype: np.dtype = np.dtype(np.float64),
+) -> np.ndarray:
     """
-    Converts raw uint16 ADC values to float64 voltages.
+    Converts raw uint16 ADC values to voltages.
 
     Parameters
     ----------
     raw_data : np.ndarray
         Array of raw ADC integer values (0 to config.ADC_MAX_VAL).
+    scale : Optional[float]
+        Volts per code. Defaults to config.V_REF / config.ADC_MAX_VAL; pass
+        the ``adc_scale`` stored with a capture (see io.load_scale).
+    offset : float, optional
+        Volts at code 0. Defaults to 0.0.
+    dtype : np.dtype, optional
+        Output dtype (float64 or float32). Defaults to float64.
 
     Returns
     -------
     np.ndarray
         Array of voltage values scaled to config.V_REF.
     """
-    return (raw_data / config.ADC_MAX_VAL) * config.V_REF
+    if scale is None:
+        scale = config.V_REF / config.ADC_MAX_VAL
+    volts: np.ndarray = np.multiply(raw_data, scale, dtype=dtype)
+    if offset:
+        volts += offset
+    return volts
+
+
+def volts_to_raw(
+    volts: np.ndarray, scale: Optional[float] = None, offset: float = 0.0
+) -> np.ndarray:
+    """
+    Quantizes voltages to uint16 codes; the inverse of raw_to_volts().
+
+    Voltages that came from raw_to_volts() with the same scale and offset
+    map back to exactly the original codes. Values outside the ADC range
+    are clipped.
+
+    Parameters
+    ----------
+    volts : np.ndarray
+        Voltage values.
+    scale : Optional[float]
+        Volts per code. Defaults to config.V_REF / config.ADC_MAX_VAL.
+    offset : float, optional
+        Volts at code 0. Defaults to 0.0.
+
+    Returns
+    -------
+    np.ndarray
+        uint16 ADC codes.
+    """
+    if scale is None:
+        scale = config.V_REF / config.ADC_MAX_VAL
+    codes = np.rint((np.asarray(volts, dtype=np.float64) - offset) / scale)
+    return np.clip(codes, 0, config.ADC_MAX_VAL).astype(np.uint16)
 
 
 def remove_dc(signal: np.ndarray) -> np.ndarray:
@@ -66,6 +113,7 @@ def software_trigger(signal: np.ndarray, threshold: float = config.V_MID) -> np.
     return signal
 
 
+@cache.cached
 def compute_spectrum(signal: np.ndarray, fs: float) -> Tuple[np.ndarray, np.ndarray]:
     """
     Computes the one-sided FFT magnitude spectrum using a Hann window.
@@ -238,3 +286,38 @@ def smart_align(sig_ref: np.ndarray, sig_target: np.ndarray) -> np.ndarray:
         aligned = np.roll(sig_target, -lag)
 
     return aligned
+
+
+def estimate_lag(
+    sig_ref: np.ndarray, sig_target: np.ndarray, max_lag: Optional[int] = None
+) -> int:
+    """
+    Estimates how many samples 'sig_target' lags 'sig_ref' via Cross-Correlation.
+
+    Both signals are DC-removed first, so raw ADC codes can be passed directly.
+
+    Parameters
+    ----------
+    sig_ref : np.ndarray
+        The reference signal.
+    sig_target : np.ndarray
+        The signal whose delay is measured.
+    max_lag : Optional[int]
+        Only consider lags within +/- max_lag samples. Defaults to all lags.
+
+    Returns
+    -------
+    int
+        Positive if sig_target is delayed relative to sig_ref.
+    """
+    ref = remove_dc(np.asarray(sig_ref, dtype=np.float64))
+    target = remove_dc(np.asarray(sig_target, dtype=np.float64))
+
+    correlation = spsig.correlate(target, ref, mode="full", method="fft")
+    lags = spsig.correlation_lags(target.size, ref.size, mode="full")
+    if max_lag is not None:
+        window = np.abs(lags) <= max_lag
+        correlation = correlation[window]
+        lags = lags[window]
+
+    return int(lags[np.argmax(correlation)])
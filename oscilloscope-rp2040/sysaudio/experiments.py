@@ -1,9 +1,37 @@
 import time
+from typing import Any, Optional, Tuple
 
 import numpy as np
 import sounddevice as sd
 
-from . import audio, config, daq, diagnostics, dsp, io, plots
+from . import audio, config, daq, diagnostics, dsp, io, plots, recorder
+
+
+def _stamped_burst(device: daq.DAQInterface) -> Tuple[np.ndarray, float]:
+    """
+    Captures a burst and returns it with its MCU-measured sampling rate.
+
+    Falls back to the nominal ``device.fs`` on firmware without capture
+    timestamps.
+    """
+    try:
+        device.set_timestamps()
+    except IOError:
+        pass  # Legacy firmware: nominal rate
+    raw = device.capture_burst()
+    return raw, device.measured_fs or device.fs
+
+
+def _save(background: bool, signal: np.ndarray, fs: float, **kwargs: Any) -> str:
+    """
+    Saves via io.save_signal, or io.save_signal_async when `background`.
+
+    Either way the final path is returned; a background save completes
+    while the next capture runs (io.flush_saves() waits for it).
+    """
+    if background:
+        return io.save_signal_async(signal, fs, **kwargs).path
+    return io.save_signal(signal, fs, **kwargs)
 
 
 def capture_sweep_transfer(
@@ -14,6 +42,7 @@ def capture_sweep_transfer(
     fs_audio: int = 48000,
     prefix: str = "sweep",
     notes: str = "",
+    background: bool = config.BACKGROUND_SAVE,
 ) -> str:
     """
     Orchestrates a Transfer Function Sweep experiment.
@@ -38,6 +67,11 @@ def capture_sweep_transfer(
         Filename prefix for the saved data.
     notes : str, optional
         User notes to attach to the metadata.
+    background : bool, optional
+        Compress and write the file on io's background writer, so the next
+        capture does not wait for it. The returned path then exists only
+        once the save finished (io.flush_saves() waits for it). Defaults to
+        config.BACKGROUND_SAVE (off).
 
     Returns
     -------
@@ -48,6 +82,7 @@ def capture_sweep_transfer(
     wave = audio.generate_log_sweep(f_start, f_end, duration, fs_audio, amp)
 
     frames = []
+    frame_fs = []
 
     print("🔴 Starting Capture...")
     with daq.DAQInterface() as device:
@@ -55,9 +90,12 @@ def capture_sweep_transfer(
         sd.play(wave, samplerate=fs_audio, blocking=False)
         start_time = time.time()
 
-        # Capture loop (Continuous Stream)
-        for chunk in device.stream_generator():
-            frames.append(chunk)
+        # Capture loop (Gapless Continuous Stream)
+        # Dropped frames are zero-filled so sample positions stay exact for
+        # ESS deconvolution at FS_DEFAULT.
+        for frame in device.continuous_stream(fill_gaps=True):
+            frames.append(frame.samples)
+            frame_fs.append(frame.fs)
 
             if not sd.get_stream().active:
                 break
@@ -66,8 +104,20 @@ def capture_sweep_transfer(
                 print("⚠️ Timeout reached.")
                 break
 
+        stream_stats = dict(device.stream_stats)
+        stats = device.telemetry.snapshot()
+        fs_nominal = device.fs
+
+    if stream_stats.get("dropped") or stream_stats.get("late"):
+        print(
+            f"⚠️ Stream gaps: {stream_stats['dropped']} dropped, "
+            f"{stream_stats['late']} late frames."
+        )
+
     print("💾 Saving Capture...")
     full_array_raw = np.concatenate(frames)
+    # MCU-measured rate; the sampler drifts away from the nominal constant
+    fs = float(np.median(frame_fs))
 
     # --- METRICS CALCULATION ---
     # Convert to volts temporarily for stats (RAM efficient enough for <10s clips)
@@ -80,11 +130,13 @@ def capture_sweep_transfer(
     # Check saturation (clipping)
     is_healthy = diagnostics.check_signal_health(volts)
 
-    return io.save_signal(
+    return _save(
+        background,
         full_array_raw,
-        config.FS_DEFAULT,
-        config.DATA_DIR_CONTINUOUS,
+        fs,
+        directory=config.DATA_DIR_CONTINUOUS,
         prefix=prefix,
+        frame_fs=np.array(frame_fs),
         # Experiment Config
         audio_type="sweep",
         f_start=f_start,
@@ -99,6 +151,10 @@ def capture_sweep_transfer(
         dc_offset=float(v_mean),
         clipped=(not is_healthy),
         peak_voltage=float(peak_amp),
+        dropped_frames=stream_stats.get("dropped", 0),
+        late_frames=stream_stats.get("late", 0),
+        fs_nominal=fs_nominal,
+        telemetry=stats,
         user_notes=notes,
     )
 
@@ -110,6 +166,7 @@ def capture_steady_transfer(
     duration_buffer: float = 0.5,
     prefix: str = "steady",
     notes: str = "",
+    background: bool = config.BACKGROUND_SAVE,
 ) -> str:
     """
     Orchestrates a Steady-State Transfer Capture with sanity checks.
@@ -131,6 +188,11 @@ def capture_steady_transfer(
         Filename prefix for saved data.
     notes : str, optional
         User notes to attach to metadata.
+    background : bool, optional
+        Compress and write the file on io's background writer, so the next
+        capture does not wait for it. The returned path then exists only
+        once the save finished (io.flush_saves() waits for it). Defaults to
+        config.BACKGROUND_SAVE (off).
 
     Returns
     -------
@@ -144,12 +206,12 @@ def capture_steady_transfer(
 
         print("📸 Capturing Burst...")
         with daq.DAQInterface() as device:
-            raw = device.capture_burst()
+            raw, fs = _stamped_burst(device)
             volts = dsp.raw_to_volts(raw)
 
             # --- DIAGNOSTICS & METRICS ---
             is_healthy = diagnostics.check_signal_health(volts)
-            dom_freq, _ = diagnostics.analyze_spectrum_peaks(volts, config.FS_DEFAULT)
+            dom_freq, _ = diagnostics.analyze_spectrum_peaks(volts, fs)
 
             v_mean = np.mean(volts)
             v_max = np.max(volts)
@@ -157,10 +219,11 @@ def capture_steady_transfer(
             peak_amp = np.max(np.abs(volts - v_mean))
 
             # Save
-            path = io.save_signal(
-                volts,
-                config.FS_DEFAULT,
-                config.DATA_DIR_BURST,
+            path = _save(
+                background,
+                raw,
+                fs,
+                directory=config.DATA_DIR_BURST,
                 prefix=prefix,
                 # Experiment Config
                 audio_type="steady",
@@ -176,16 +239,20 @@ def capture_steady_transfer(
                 dc_offset=float(v_mean),
                 clipped=(not is_healthy),
                 peak_voltage=float(peak_amp),
+                fs_nominal=device.fs,
+                telemetry=device.telemetry.snapshot(),
                 user_notes=notes,
             )
 
             # Plot
             title = f"{prefix} (Meas: {dom_freq:.1f}Hz)"
-            plots.plot_health_check(volts, config.FS_DEFAULT, title, is_healthy)
+            plots.plot_health_check(volts, fs, title, is_healthy)
             return path
 
 
-def capture_instrument_clip(filename: str, notes: str = "") -> str:
+def capture_instrument_clip(
+    filename: str, notes: str = "", background: bool = config.BACKGROUND_SAVE
+) -> str:
     """
     Captures a manual instrument input (e.g., Guitar, Bass).
 
@@ -195,6 +262,11 @@ def capture_instrument_clip(filename: str, notes: str = "") -> str:
         The specific filename/prefix to use for saving.
     notes : str, optional
         User notes to attach to metadata.
+    background : bool, optional
+        Compress and write the file on io's background writer, so the next
+        capture does not wait for it. The returned path then exists only
+        once the save finished (io.flush_saves() waits for it). Defaults to
+        config.BACKGROUND_SAVE (off).
 
     Returns
     -------
@@ -204,23 +276,22 @@ def capture_instrument_clip(filename: str, notes: str = "") -> str:
     print(f"🔴 Recording Instrument: '{filename}' ...")
 
     with daq.DAQInterface() as device:
-        raw = device.capture_burst()
+        raw, fs = _stamped_burst(device)
         volts = dsp.raw_to_volts(raw)
 
         # --- DIAGNOSTICS & METRICS ---
         is_healthy = diagnostics.check_signal_health(volts)
-        dom_freq, harmonics = diagnostics.analyze_spectrum_peaks(
-            volts, config.FS_DEFAULT
-        )
+        dom_freq, harmonics = diagnostics.analyze_spectrum_peaks(volts, fs)
 
         v_mean = np.mean(volts)
         peak_amp = np.max(np.abs(volts - v_mean))
 
         # --- SAVE ---
-        path = io.save_signal(
-            volts,
-            config.FS_DEFAULT,
-            config.DATA_DIR_BURST,
+        path = _save(
+            background,
+            raw,
+            fs,
+            directory=config.DATA_DIR_BURST,
             prefix=filename,
             v_ref=config.V_REF,
             adc_bits=config.ADC_BITS,
@@ -230,60 +301,125 @@ def capture_instrument_clip(filename: str, notes: str = "") -> str:
             clipped=(not is_healthy),
             peak_voltage=float(peak_amp),
             dominant_freq=dom_freq,
+            fs_nominal=device.fs,
+            telemetry=device.telemetry.snapshot(),
             user_notes=notes,
         )
 
         # --- PLOT ---
         title = f"{filename} (Pitch: {dom_freq:.1f} Hz)"
         # Fixed: Usage of diagnostics.plot_health_check -> plots.plot_health_check
-        plots.plot_health_check(volts, config.FS_DEFAULT, title, is_healthy)
+        plots.plot_health_check(volts, fs, title, is_healthy)
 
         return path
 
 
-def capture_continuous_stream(prefix: str = "session") -> None:
+def capture_continuous_stream(
+    prefix: str = "session",
+    rate_factor: int = 1,
+    average: bool = True,
+    segment_seconds: float = config.SEGMENT_SECONDS,
+) -> Optional[str]:
     """
     Captures data indefinitely until KeyboardInterrupt.
 
-    Designed for long-running captures. Data is accumulated in memory
-    and saved only upon stopping the stream via Ctrl+C.
+    Designed for multi-hour sessions. Gapless frames from the continuous
+    protocol are streamed to disk by a recorder.SegmentedRecorder, which
+    rolls over to a new segment file every `segment_seconds` and compresses
+    finished segments in the background, so memory use is constant and a
+    crash keeps everything up to the last fsync. Frames dropped on the USB
+    link are recorded as gaps in the session manifest. Open the session
+    with ``io.open_session(manifest_path)``. Any other error (serial link,
+    disk) closes the session the same way before it propagates.
 
     Parameters
     ----------
     prefix : str, optional
-        Filename prefix for the saved data.
+        Filename prefix for the session.
+    rate_factor : int, optional
+        Firmware rate reduction (see DAQInterface.set_rate). Values > 1
+        record low-frequency sessions at a fraction of the bandwidth.
+    average : bool, optional
+        Box-average (True) or decimate (False) when rate_factor > 1.
+    segment_seconds : float, optional
+        Segment length. Defaults to config.SEGMENT_SECONDS.
+
+    Returns
+    -------
+    Optional[str]
+        The path of the session manifest, or None if nothing was captured.
     """
-    frames = []
+    rec: Optional[recorder.SegmentedRecorder] = None
+    frames = 0
     start_time = time.time()
 
-    # Calculate approx data rate for user info
-    bytes_per_sec = config.LIVE_SAMPLES * 2 * (config.FS_DEFAULT / config.LIVE_SAMPLES)
-    mb_per_min = (bytes_per_sec * 60) / (1024 * 1024)
-
     print("🔴 RECORDING STREAM... Press Ctrl+C to stop.")
-    print(f"   (Approx Data Rate: ~{mb_per_min:.2f} MB/min)")
 
     try:
         with daq.DAQInterface() as device:
-            # We iterate over the generator. It yields chunks indefinitely.
-            for chunk_u16 in device.stream_generator():
-                frames.append(chunk_u16)
-
-                # Feedback every 100 frames
-                if len(frames) % 100 == 0:
-                    duration = time.time() - start_time
-                    print(f"   Captured {len(frames)} frames ({duration:.1f}s)...")
+            if rate_factor != 1:
+                mode = daq.RATE_AVERAGE if average else daq.RATE_DECIMATE
+                device.set_rate(rate_factor, mode)
+                print(f"   (Rate reduced {rate_factor}x: Fs = {device.fs:.1f} Hz)")
+
+            # Calculate approx data rate for user info
+            mb_per_min = (2 * device.fs * 60) / (1024 * 1024)
+            print(f"   (Approx Data Rate: ~{mb_per_min:.2f} MB/min)")
+
+            rec = recorder.SegmentedRecorder(
+                config.DATA_DIR_CONTINUOUS,
+                device.fs,
+                prefix=prefix,
+                segment_seconds=segment_seconds,
+                rate_factor=rate_factor,
+                rate_mode="average" if average else "decimate",
+            )
+            device.telemetry.start_logger(interval=10.0)
+            try:
+                # The generator yields frames indefinitely
+                for frame in device.continuous_stream():
+                    rec.write(
+                        frame.samples, gap=frame.dropped_before * frame.samples.size
+                    )
+                    frames += 1
+
+                    # Feedback every 100 frames
+                    if frames % 100 == 0:
+                        duration = time.time() - start_time
+                        print(
+                            f"   Captured {frames} frames ({duration:.1f}s, "
+                            f"{len(rec.segments)} segments)..."
+                        )
+            finally:
+                device.telemetry.stop_logger()
+                rec.update_metadata(
+                    telemetry=device.telemetry.snapshot(),
+                    stream_stats=device.stream_stats,
+                )
 
     except KeyboardInterrupt:
         print("\n🛑 Stopping...")
-
-    if not frames:
+    except BaseException:
+        # A link or disk error still ends the session cleanly before it
+        # propagates, so the manifest lists every segment written so far
+        if rec is not None:
+            try:
+                _finish_session(rec, frames)
+            except IOError as e:
+                print(f"⚠️ Could not finalize {rec.session_dir}: {e}")
+        raise
+
+    if rec is None:
+        return None
+    return _finish_session(rec, frames)
+
+
+def _finish_session(rec: recorder.SegmentedRecorder, frames: int) -> Optional[str]:
+    """Closes a continuous session, or discards it if no frame was captured."""
+    if frames == 0:
+        rec.discard()
         print("No data captured.")
-        return
+        return None
 
     print("Processing...")
-    full_array = np.concatenate(frames)
-
-    io.save_signal(
-        full_array, config.FS_DEFAULT, config.DATA_DIR_CONTINUOUS, prefix=prefix
-    )
+    return rec.close()
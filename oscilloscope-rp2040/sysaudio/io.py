@@ -1,13 +1,44 @@
+import atexit
 import glob
+import json
+import mmap
 import os
-import sys
+import queue
+import struct
+import threading
+import zipfile
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from . import config, dsp
+
+# Memory-mappable capture format: <name>.raw (little-endian samples, no
+# header) plus a <name>.json sidecar with dtype, fs and metadata
+RAW_SUFFIX: str = ".raw"
+HEADER_SUFFIX: str = ".json"
+RAW_FORMAT: str = "sysaudio-raw"
+
+# Chunked container: independently compressed blocks plus a block index, for
+# compression with random access (see save_chunked())
+CHUNKED_SUFFIX: str = ".blk"
+CHUNKED_FORMAT: str = "sysaudio-chunked"
+CHUNKED_MAGIC: bytes = b"SABLK\x00\x01\x00"
+
+# Segmented session: a JSON manifest listing consecutive segment captures
+# (see recorder.SegmentedRecorder and SessionSignal)
+MANIFEST_SUFFIX: str = ".manifest"
+SESSION_FORMAT: str = "sysaudio-session"
+
+# Captures store raw uint16 ADC codes; volts = code * adc_scale + adc_offset
+ADC_SCALE: float = config.V_REF / config.ADC_MAX_VAL
+
 
 def ensure_dir(directory: str) -> None:
     """Ensures that the specified directory exists, creating it if necessary."""
@@ -15,63 +46,967 @@ def ensure_dir(directory: str) -> None:
         os.makedirs(directory)
 
 
+def _to_codes(signal: np.ndarray, metadata: Dict[str, Any]) -> np.ndarray:
+    """
+    Applies the storage policy: returns uint16 codes and sets the scale.
+
+    Integer signals are stored as-is, with any ``adc_scale``/``adc_offset``
+    already in `metadata` (default: the ADC's). Float signals are taken as
+    volts and quantized with the default scale, which is lossless for
+    volts produced by dsp.raw_to_volts().
+
+    Raises
+    ------
+    ValueError
+        If an integer signal holds values outside the uint16 code range.
+    """
+    data = np.asarray(signal)
+    metadata.setdefault("adc_scale", ADC_SCALE)
+    metadata.setdefault("adc_offset", 0.0)
+    if np.issubdtype(data.dtype, np.integer):
+        if data.dtype != np.uint16 and data.size:
+            low, high = int(data.min()), int(data.max())
+            if low < 0 or high > config.ADC_MAX_VAL:
+                raise ValueError(
+                    f"Integer samples must be ADC codes in 0..{config.ADC_MAX_VAL}, "
+                    f"got {low}..{high}"
+                )
+        return data.astype(np.uint16, copy=False)
+
+    scale, offset = float(metadata["adc_scale"]), float(metadata["adc_offset"])
+    codes = dsp.volts_to_raw(data, scale, offset)
+    if np.any(data < offset) or np.any(data > offset + scale * config.ADC_MAX_VAL):
+        print("⚠️ Signal exceeds the ADC range; stored samples are clipped.")
+    return codes
+
+
 def save_signal(
     signal: np.ndarray,
     fs: float,
     directory: str,
     prefix: str = "capture",
+    frame_fs: Optional[np.ndarray] = None,
+    compresslevel: int = config.SAVE_COMPRESSLEVEL,
     **metadata: Any,
 ) -> str:
     """
     Saves signal, fs, and arbitrary metadata to a timestamped .npz file.
 
+    The signal is always stored as raw uint16 ADC codes (2 bytes/sample)
+    together with ``adc_scale`` and ``adc_offset``; load it back in volts
+    with ``load_signal(path, volts=True)``. See save_signal_async() to
+    compress and write in the background.
+
     Parameters
     ----------
     signal : np.ndarray
-        The signal data array.
+        Raw ADC codes, or volts (quantized to codes, see dsp.volts_to_raw).
     fs : float
         Sampling frequency in Hz.
     directory : str
         Directory to save the file in.
     prefix : str, optional
         Prefix for the filename. Defaults to "capture".
+    frame_fs : Optional[np.ndarray]
+        Per-frame sampling rates measured from MCU timestamps (see
+        daq.StreamFrame.fs), stored as the 'frame_fs' array together with
+        'frame_samples', the samples per frame. `fs` should then be the
+        measured rate (e.g. the median) so analysis picks it up directly.
+    compresslevel : int, optional
+        zlib level of the archive, 0 (stored) to 9. Defaults to
+        config.SAVE_COMPRESSLEVEL.
     **metadata : Any
         Additional keyword arguments to be stored as metadata in the .npz file.
+        Dict values (e.g. ``telemetry=device.telemetry.snapshot()``) are
+        stored as JSON strings; read them back with load_metadata().
 
     Returns
     -------
     str
         The full path to the saved file.
     """
+    path, timestamp = _new_capture_path(directory, prefix)
+    _write_npz(path, signal, fs, timestamp, frame_fs, compresslevel, metadata)
+    return path
+
+
+def _new_capture_path(
+    directory: str,
+    prefix: str,
+    suffix: str = ".npz",
+    reserve: Optional[Callable[[str], None]] = None,
+) -> Tuple[str, str]:
+    """
+    Reserves a unique timestamped capture path; returns it and the ISO 8601
+    timestamp of the save.
+
+    Names carry microseconds, plus a counter if that name is taken. By
+    default the path is reserved by exclusively creating ``path + ".tmp"``,
+    which the caller writes and renames onto the path, so concurrent saves
+    (from any thread or process) never share a file. `reserve` replaces
+    that step; it must claim the path atomically and raise
+    ``FileExistsError`` if it is taken.
+    """
     ensure_dir(directory)
+    claim = _reserve_tmp if reserve is None else reserve
+    now = datetime.now()
+    stem = os.path.join(directory, f"{prefix}_{now.strftime('%Y%m%d_%H%M%S_%f')}")
+    path = stem + suffix
+    n = 0
+    with _save_lock:
+        while True:
+            if not os.path.exists(path):
+                try:
+                    claim(path)
+                except FileExistsError:
+                    pass
+                else:
+                    return path, now.isoformat()
+            n += 1
+            path = f"{stem}_{n}{suffix}"
+
+
+def _reserve_tmp(path: str) -> None:
+    """Exclusively creates ``path + ".tmp"``; raises FileExistsError if taken."""
+    os.close(os.open(path + ".tmp", os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+
+
+def _reserve_file(path: str) -> None:
+    """Exclusively creates `path` itself; raises FileExistsError if taken."""
+    os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+
+
+@contextmanager
+def _staged(path: str) -> Iterator[str]:
+    """
+    Yields ``path + ".tmp"`` to write; renames it onto `path` on success and
+    removes it (releasing a reservation) on failure.
+    """
+    tmp_path = path + ".tmp"
+    try:
+        yield tmp_path
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def _write_npz(
+    path: str,
+    signal: np.ndarray,
+    fs: float,
+    timestamp: str,
+    frame_fs: Optional[np.ndarray],
+    compresslevel: int,
+    metadata: Dict[str, Any],
+) -> None:
+    """Writes a save_signal() archive to `path` via its reserved temporary file."""
+    with _staged(path) as tmp_path:
+        metadata = dict(metadata)
+        codes = _to_codes(signal, metadata)
 
-    # ISO 8601 Timestamp
-    timestamp_str = datetime.now().isoformat()
-    filename_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # Nested dicts would need pickling inside the archive; store them as JSON
+        stored: Dict[str, Any] = {
+            key: json.dumps(val) if isinstance(val, dict) else val
+            for key, val in metadata.items()
+        }
 
-    filename = f"{prefix}_{filename_ts}.npz"
-    path = os.path.join(directory, filename)
+        if frame_fs is not None:
+            frame_fs = np.asarray(frame_fs, dtype=np.float64)
+            stored["frame_fs"] = frame_fs
+            stored["frame_samples"] = len(codes) // max(frame_fs.size, 1)
 
-    # We combine core data with the optional metadata
-    # 'utc_timestamp' is added automatically for provenance
-    np.savez_compressed(path, signal=signal, fs=fs, timestamp=timestamp_str, **metadata)
+        # Same layout as np.savez_compressed, which has no compression level.
+        # Written under a temporary name so scanners never see a partial file.
+        arrays = {"signal": codes, "fs": fs, "timestamp": timestamp, **stored}
+        mode = zipfile.ZIP_DEFLATED if compresslevel > 0 else zipfile.ZIP_STORED
+        with zipfile.ZipFile(tmp_path, "w", mode, compresslevel=compresslevel) as zf:
+            for key, val in arrays.items():
+                with zf.open(key + ".npy", "w", force_zip64=True) as f:
+                    np.lib.format.write_array(f, np.asanyarray(val), allow_pickle=True)
 
     # Calculate size for user feedback
     size_mb = os.path.getsize(path) / (1024**2)
     print(f"💾 Saved {path} ({size_mb:.2f} MB)")
-    print(f"   Metadata keys: {list(metadata.keys()) + ['timestamp']}")
+    print(f"   Metadata keys: {list(stored.keys()) + ['timestamp']}")
+
+
+class PendingSave(Future[str]):
+    """
+    Future for a save_signal_async() call; resolves to the file path.
+
+    The path is reserved when the save is queued and available right away
+    as `path`; the file exists once the future is done.
+    """
+
+    def __init__(self, path: str) -> None:
+        super().__init__()
+        self.path = path
+
+
+# Background writer state, created on the first save_signal_async() call
+_save_queue: "Optional[queue.Queue[Tuple[PendingSave, Callable[[], None]]]]" = None
+_pending_saves: Dict[str, PendingSave] = {}
+_save_lock = threading.Lock()
+
+
+def _save_worker(jobs: "queue.Queue[Tuple[PendingSave, Callable[[], None]]]") -> None:
+    while True:
+        pending, write = jobs.get()
+        try:
+            if pending.set_running_or_notify_cancel():
+                try:
+                    write()
+                    pending.set_result(pending.path)
+                except Exception as e:
+                    print(f"❌ Background save of {pending.path} failed: {e}")
+                    pending.set_exception(e)
+        finally:
+            with _save_lock:
+                _pending_saves.pop(os.path.abspath(pending.path), None)
+            jobs.task_done()
+
+
+def save_signal_async(
+    signal: np.ndarray,
+    fs: float,
+    directory: str,
+    prefix: str = "capture",
+    frame_fs: Optional[np.ndarray] = None,
+    compresslevel: int = config.SAVE_COMPRESSLEVEL,
+    **metadata: Any,
+) -> PendingSave:
+    """
+    Queues a save_signal() call for a background writer thread.
+
+    Quantization, compression and disk I/O run off the caller's thread, so
+    the next capture can start immediately. At most config.SAVE_QUEUE_DEPTH
+    saves wait in the queue; beyond that this call blocks, which bounds
+    memory when captures outpace the disk. The filename and timestamp are
+    fixed at call time. Pending saves are flushed at interpreter exit, and
+    load_signal()/load_metadata() wait for a pending save of their file.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        As for save_signal(). The array is not copied, so the caller must
+        not modify it until the save is done.
+    fs, directory, prefix, frame_fs, compresslevel, **metadata
+        As for save_signal().
+
+    Returns
+    -------
+    PendingSave
+        Future resolving to the file path (also available as ``.path``);
+        ``.result()`` re-raises a failed save.
+    """
+    global _save_queue
+    with _save_lock:
+        if _save_queue is None:
+            _save_queue = queue.Queue(config.SAVE_QUEUE_DEPTH)
+            threading.Thread(
+                target=_save_worker, args=(_save_queue,), name="io-save", daemon=True
+            ).start()
+            atexit.register(flush_saves)
+        jobs = _save_queue
+
+    path, timestamp = _new_capture_path(directory, prefix)
+    pending = PendingSave(path)
+    with _save_lock:
+        _pending_saves[os.path.abspath(path)] = pending
+
+    def write() -> None:
+        _write_npz(path, signal, fs, timestamp, frame_fs, compresslevel, metadata)
+
+    jobs.put((pending, write))
+    return pending
+
+
+def flush_saves() -> None:
+    """Blocks until every queued background save has finished."""
+    if _save_queue is not None:
+        _save_queue.join()
+
+
+def _wait_for_save(filepath: Union[str, Path]) -> None:
+    """Waits for a pending background save of `filepath`, if any."""
+    with _save_lock:
+        pending = _pending_saves.get(os.path.abspath(filepath))
+    if pending is not None:
+        pending.exception()  # Wait; a failure surfaces as FileNotFoundError
+
+
+def write_raw_header(
+    raw_path: Union[str, Path],
+    fs: float,
+    dtype: str,
+    samples: int,
+    complete: bool = True,
+    timestamp: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> None:
+    """
+    Writes (or atomically replaces) the JSON sidecar of a raw capture.
+
+    Parameters
+    ----------
+    raw_path : str
+        Path of the .raw sample file; the sidecar goes next to it.
+    fs : float
+        Sampling frequency in Hz.
+    dtype : str
+        NumPy dtype string of the samples (e.g. '<u2').
+    samples : int
+        Number of samples in the raw file.
+    complete : bool, optional
+        False while a recording is still being written.
+    timestamp : Optional[str]
+        ISO 8601 capture time. Defaults to now.
+    metadata : Optional[Dict[str, Any]]
+        JSON-serializable user metadata.
+    """
+    header = {
+        "format": RAW_FORMAT,
+        "dtype": dtype,
+        "fs": fs,
+        "samples": samples,
+        "complete": complete,
+        "timestamp": timestamp or datetime.now().isoformat(),
+        "metadata": dict(metadata or {}),
+    }
+    header_path = os.path.splitext(raw_path)[0] + HEADER_SUFFIX
+    # Write-then-rename so a crash never leaves a truncated sidecar
+    tmp_path = header_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(header, f, indent=2)
+    os.replace(tmp_path, header_path)
+
 
+def read_raw_header(filepath: Union[str, Path]) -> Dict[str, Any]:
+    """Reads the JSON sidecar of a raw capture (.raw or .json path)."""
+    with open(os.path.splitext(filepath)[0] + HEADER_SUFFIX) as f:
+        header: Dict[str, Any] = json.load(f)
+    if header.get("format") != RAW_FORMAT:
+        raise ValueError(f"{filepath} is not a {RAW_FORMAT} capture")
+    return header
+
+
+def is_raw_capture(filepath: Union[str, Path]) -> bool:
+    """True if `filepath` names either file of a raw capture pair."""
+    return str(filepath).endswith((RAW_SUFFIX, HEADER_SUFFIX))
+
+
+def save_raw(
+    signal: np.ndarray,
+    fs: float,
+    directory: str,
+    prefix: str = "capture",
+    **metadata: Any,
+) -> str:
+    """
+    Saves a signal in the memory-mappable raw format.
+
+    The samples are written uncompressed in little-endian byte order, so
+    load_signal() can map them instead of reading them. As in save_signal(),
+    they are stored as uint16 codes with ``adc_scale``/``adc_offset``.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Raw ADC codes, or volts (quantized to codes).
+    fs : float
+        Sampling frequency in Hz.
+    directory : str
+        Directory to save the file in.
+    prefix : str, optional
+        Prefix for the filename. Defaults to "capture".
+    **metadata : Any
+        JSON-serializable metadata stored in the sidecar.
+
+    Returns
+    -------
+    str
+        The path of the .raw file.
+    """
+    path, _ = _new_capture_path(directory, prefix, RAW_SUFFIX)
+    with _staged(path) as tmp_path:
+        data = _to_codes(signal, metadata).astype("<u2", copy=False)
+        data.tofile(tmp_path)
+    write_raw_header(path, fs, data.dtype.str, data.size, metadata=metadata)
+
+    size_mb = os.path.getsize(path) / (1024**2)
+    print(f"💾 Saved {path} ({size_mb:.2f} MB, memory-mappable)")
     return path
 
 
-def load_signal(filepath: Union[str, Path]) -> Tuple[np.ndarray, float]:
+def convert_npz_to_raw(filepath: Union[str, Path], remove: bool = False) -> str:
     """
-    Robust loader for .npz files.
+    Converts an .npz capture into the memory-mappable raw format.
+
+    Scalar and JSON metadata carry over to the sidecar, together with the
+    original timestamp. Legacy archives holding volts are quantized to
+    uint16 codes like save_signal() does.
 
     Parameters
     ----------
     filepath : str
         Path to the .npz file.
+    remove : bool, optional
+        Delete the .npz once converted. Defaults to False.
+
+    Returns
+    -------
+    str
+        Path of the .raw file (same directory and base name).
+    """
+    signal, fs = load_signal(filepath, volts=False)
+    metadata = load_metadata(filepath)
+    metadata.pop("fs", None)
+    timestamp = metadata.pop("timestamp", None)
+    # Sidecars are JSON: keep scalars and decoded dicts, drop arrays
+    metadata = {
+        key: val for key, val in metadata.items() if not isinstance(val, np.ndarray)
+    }
+
+    path = os.path.splitext(filepath)[0] + RAW_SUFFIX
+    data = np.ascontiguousarray(_to_codes(signal, metadata), dtype="<u2")
+    data.tofile(path)
+    write_raw_header(
+        path, fs, data.dtype.str, data.size, timestamp=timestamp, metadata=metadata
+    )
+    if remove:
+        os.remove(filepath)
+    return path
+
+
+def _load_raw(filepath: Union[str, Path]) -> Tuple[np.ndarray, float]:
+    """Maps a raw capture read-only; see load_signal()."""
+    header = read_raw_header(filepath)
+    raw_path = os.path.splitext(filepath)[0] + RAW_SUFFIX
+    dtype = np.dtype(header["dtype"])
+    # An incomplete recording may hold more samples than its last header
+    n_samples = os.path.getsize(raw_path) // dtype.itemsize
+    if n_samples == 0:
+        return np.empty(0, dtype=dtype), float(header["fs"])
+    sig = np.memmap(raw_path, dtype=dtype, mode="r", shape=(n_samples,))
+    return sig, float(header["fs"])
+
+
+def is_chunked_capture(filepath: Union[str, Path]) -> bool:
+    """True if `filepath` names a chunked container (see save_chunked())."""
+    return str(filepath).endswith(CHUNKED_SUFFIX)
+
+
+def _compress_block(block: np.ndarray, level: int) -> bytes:
+    # Byte-shuffle: the low bytes of audio samples are noisy, the high bytes
+    # nearly constant; compressing the byte planes apart gains about 17%
+    columns = block.view(np.uint8).reshape(-1, block.itemsize)
+    planes = np.empty((block.itemsize, block.size), dtype=np.uint8)
+    for k in range(block.itemsize):
+        planes[k] = columns[:, k]
+    return zlib.compress(planes, level)
+
+
+def save_chunked(
+    signal: np.ndarray,
+    fs: float,
+    directory: str,
+    prefix: str = "capture",
+    block_samples: int = config.CHUNK_SAMPLES,
+    compresslevel: int = config.CHUNK_COMPRESSLEVEL,
+    workers: Optional[int] = None,
+    **metadata: Any,
+) -> str:
+    """
+    Saves a signal in the chunked, block-compressed container format.
+
+    The samples (uint16 codes, as in save_signal()) are split into blocks
+    of `block_samples` that are compressed independently on a thread pool
+    and streamed to disk, so a memory-mapped input is never fully loaded.
+    A JSON header at the end of the file indexes the blocks; ChunkedSignal
+    uses it to decompress only the blocks a range touches.
+
+    Layout: 8-byte magic, uint64 header offset, compressed blocks, header.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Raw ADC codes, or volts (quantized to codes).
+    fs : float
+        Sampling frequency in Hz.
+    directory : str
+        Directory to save the file in.
+    prefix : str, optional
+        Prefix for the filename. Defaults to "capture".
+    block_samples : int, optional
+        Samples per block. Defaults to config.CHUNK_SAMPLES.
+    compresslevel : int, optional
+        zlib level (1 fastest to 9 smallest). Defaults to
+        config.CHUNK_COMPRESSLEVEL.
+    workers : Optional[int]
+        Compression threads. Defaults to the CPU count.
+    **metadata : Any
+        JSON-serializable metadata stored in the header.
+
+    Returns
+    -------
+    str
+        The path of the container.
+    """
+    path, _ = _new_capture_path(directory, prefix, CHUNKED_SUFFIX)
+    _write_chunked(path, signal, fs, metadata, block_samples, compresslevel, workers)
+    return path
+
+
+def _write_chunked(
+    path: str,
+    signal: np.ndarray,
+    fs: float,
+    metadata: Dict[str, Any],
+    block_samples: int = config.CHUNK_SAMPLES,
+    compresslevel: int = config.CHUNK_COMPRESSLEVEL,
+    workers: Optional[int] = None,
+    timestamp: Optional[str] = None,
+) -> None:
+    """Writes a chunked container to `path` via ``path + ".tmp"``."""
+    with _staged(path) as tmp_path:
+        data = _to_codes(np.ravel(signal), metadata).astype("<u2", copy=False)
+        starts = range(0, data.size, block_samples)
+        index = []
+        with open(tmp_path, "wb") as f, ThreadPoolExecutor(workers) as pool:
+            f.write(CHUNKED_MAGIC + bytes(8))
+            # Bounded look-ahead keeps memory independent of the signal length
+            batch = 4 * (workers or os.cpu_count() or 1)
+            for i in range(0, len(starts), batch):
+                blocks = [data[s : s + block_samples] for s in starts[i : i + batch]]
+                for blob in pool.map(_compress_block, blocks, [compresslevel] * batch):
+                    index.append((f.tell(), len(blob)))
+                    f.write(blob)
+
+            header = {
+                "format": CHUNKED_FORMAT,
+                "dtype": data.dtype.str,
+                "fs": fs,
+                "samples": int(data.size),
+                "block_samples": block_samples,
+                "codec": "zlib-shuffle",
+                "timestamp": timestamp or datetime.now().isoformat(),
+                "metadata": metadata,
+                "blocks": index,
+            }
+            header_offset = f.tell()
+            f.write(json.dumps(header).encode())
+            f.seek(len(CHUNKED_MAGIC))
+            f.write(struct.pack("<Q", header_offset))
+
+    size_mb = os.path.getsize(path) / (1024**2)
+    ratio = data.nbytes / max(os.path.getsize(path), 1)
+    print(f"💾 Saved {path} ({size_mb:.2f} MB, {ratio:.1f}x compressed)")
+
+
+def convert_to_chunked(filepath: Union[str, Path], remove: bool = False) -> str:
+    """
+    Converts an .npz archive or raw capture into a chunked container.
+
+    Scalar and JSON metadata carry over, as in convert_npz_to_raw().
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the .npz file, or either file of a raw capture.
+    remove : bool, optional
+        Delete the source once converted. Defaults to False.
+
+    Returns
+    -------
+    str
+        Path of the container (same directory and base name).
+    """
+    signal, fs = load_signal(filepath, volts=False)
+    metadata = load_metadata(filepath)
+    metadata.pop("fs", None)
+    timestamp = metadata.pop("timestamp", None)
+    metadata = {
+        key: val for key, val in metadata.items() if not isinstance(val, np.ndarray)
+    }
+
+    base = os.path.splitext(filepath)[0]
+    path = base + CHUNKED_SUFFIX
+    _write_chunked(path, signal, fs, metadata, timestamp=timestamp)
+
+    del signal
+    if remove:
+        if is_raw_capture(filepath):
+            os.remove(base + RAW_SUFFIX)
+            os.remove(base + HEADER_SUFFIX)
+        else:
+            os.remove(filepath)
+    return path
+
+
+class ChunkedSignal:
+    """
+    Random-access reader for a chunked container (see save_chunked()).
+
+    The file is memory-mapped; read_range() decompresses only the blocks
+    it touches and load() decompresses all of them on a thread pool.
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the container.
+
+    Attributes
+    ----------
+    fs : float
+        Sampling frequency in Hz.
+    samples : int
+        Total number of samples.
+    block_samples : int
+        Samples per block (the last one may be shorter).
+    header : Dict[str, Any]
+        The decoded header, including ``metadata`` and the block index.
+    """
+
+    def __init__(self, filepath: Union[str, Path]) -> None:
+        self.filepath = str(filepath)
+        with open(self.filepath, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(CHUNKED_MAGIC)] != CHUNKED_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{filepath} is not a {CHUNKED_FORMAT} container")
+        (header_offset,) = struct.unpack_from("<Q", self._mmap, len(CHUNKED_MAGIC))
+        self.header: Dict[str, Any] = json.loads(self._mmap[header_offset:])
+        self.fs = float(self.header["fs"])
+        self.samples = int(self.header["samples"])
+        self.block_samples = int(self.header["block_samples"])
+        self.dtype = np.dtype(self.header["dtype"])
+
+    def __enter__(self) -> "ChunkedSignal":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.samples
+
+    def close(self) -> None:
+        """Unmaps the file."""
+        self._mmap.close()
+
+    def _decode_block(self, i: int, out: np.ndarray) -> None:
+        """Decompresses block `i` into `out` (exactly its length)."""
+        offset, length = self.header["blocks"][i]
+        planes = np.frombuffer(
+            zlib.decompress(self._mmap[offset : offset + length]), dtype=np.uint8
+        ).reshape(self.dtype.itemsize, -1)
+        # Per-plane column copies are far faster than one transposed copy
+        columns = out.view(np.uint8).reshape(-1, self.dtype.itemsize)
+        for k in range(self.dtype.itemsize):
+            columns[:, k] = planes[k]
+
+    def read_range(self, start: int, stop: int) -> np.ndarray:
+        """
+        Returns samples [start, stop), decompressing only the blocks needed.
+
+        Parameters
+        ----------
+        start, stop : int
+            Sample indices; clamped to the signal like a slice.
+
+        Returns
+        -------
+        np.ndarray
+            The stored samples (uint16 codes).
+        """
+        start, stop, _ = slice(start, stop).indices(self.samples)
+        out = np.empty(max(stop - start, 0), dtype=self.dtype)
+        if out.size == 0:
+            return out
+        bs = self.block_samples
+        for i in range(start // bs, (stop - 1) // bs + 1):
+            block_start = i * bs
+            block = np.empty(min(bs, self.samples - block_start), dtype=self.dtype)
+            self._decode_block(i, block)
+            lo = max(start, block_start)
+            hi = min(stop, block_start + block.size)
+            out[lo - start : hi - start] = block[lo - block_start : hi - block_start]
+        return out
+
+    def load(self, workers: Optional[int] = None) -> np.ndarray:
+        """
+        Decompresses the whole signal, blocks in parallel.
+
+        zlib releases the GIL, so this scales with the number of threads.
+
+        Parameters
+        ----------
+        workers : Optional[int]
+            Decompression threads. Defaults to the CPU count.
+
+        Returns
+        -------
+        np.ndarray
+            All stored samples (uint16 codes).
+        """
+        out = np.empty(self.samples, dtype=self.dtype)
+        bs = self.block_samples
+        n_blocks = len(self.header["blocks"])
+        with ThreadPoolExecutor(workers) as pool:
+            list(
+                pool.map(
+                    lambda i: self._decode_block(i, out[i * bs : (i + 1) * bs]),
+                    range(n_blocks),
+                )
+            )
+        return out
+
+
+def read_range(filepath: Union[str, Path], start: int, stop: int) -> np.ndarray:
+    """
+    Reads samples [start, stop) of a chunked container.
+
+    Opens the file for one read; keep a ChunkedSignal open for repeated
+    windows (e.g. playback).
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the container.
+    start, stop : int
+        Sample indices, clamped like a slice.
+
+    Returns
+    -------
+    np.ndarray
+        The stored samples (uint16 codes).
+    """
+    with ChunkedSignal(filepath) as container:
+        return container.read_range(start, stop)
+
+
+def is_session_manifest(filepath: Union[str, Path]) -> bool:
+    """True if `filepath` names a session manifest (see SessionSignal)."""
+    return str(filepath).endswith(MANIFEST_SUFFIX)
+
+
+def read_manifest(filepath: Union[str, Path]) -> Dict[str, Any]:
+    """Reads the JSON manifest of a segmented session."""
+    with open(filepath) as f:
+        manifest: Dict[str, Any] = json.load(f)
+    if manifest.get("format") != SESSION_FORMAT:
+        raise ValueError(f"{filepath} is not a {SESSION_FORMAT} manifest")
+    return manifest
+
+
+class SessionSignal:
+    """
+    Lazily concatenated view of a segmented session.
+
+    The manifest (written by recorder.SegmentedRecorder) lists segment
+    files in order with their sample offsets. Segments are opened on first
+    access, raw ones memory-mapped and chunked ones read block by block, so
+    slicing a window only reads the segments it spans. Supports len(),
+    ``size``/``shape``/``dtype`` and slicing like a 1-D array;
+    ``np.asarray()`` reads the whole session.
+
+    Samples lost to dropped frames are not filled in: consecutive segments
+    are concatenated as recorded and the positions of the gaps are listed
+    in `gaps`.
+
+    Parameters
+    ----------
+    filepath : str
+        Path of the manifest.
+
+    Attributes
+    ----------
+    fs : float
+        Sampling frequency in Hz.
+    samples : int
+        Total number of recorded samples.
+    offsets : np.ndarray
+        Session offset of each segment's first sample.
+    gaps : List[Dict[str, int]]
+        ``{"offset", "samples"}`` of every gap: samples missing before the
+        recorded sample at `offset`.
+    manifest : Dict[str, Any]
+        The decoded manifest, including ``metadata``.
+    """
+
+    def __init__(self, filepath: Union[str, Path]) -> None:
+        self.filepath = str(filepath)
+        self.manifest = read_manifest(filepath)
+        self.fs = float(self.manifest["fs"])
+        self.dtype = np.dtype(self.manifest["dtype"])
+        self.gaps: List[Dict[str, int]] = self.manifest["gaps"]
+        self._root = os.path.dirname(os.path.abspath(filepath))
+        self._segments: Dict[int, Union[np.ndarray, ChunkedSignal]] = {}
+
+        lengths = []
+        for entry in self.manifest["segments"]:
+            if entry["complete"]:
+                lengths.append(int(entry["samples"]))
+            else:
+                # Still recording (or crashed): the file is ahead of the manifest
+                path = self._segment_path(entry)
+                lengths.append(os.path.getsize(path) // self.dtype.itemsize)
+        self.offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+        self.samples = int(self.offsets[-1])
+        self.offsets = self.offsets[:-1]
+
+    def __enter__(self) -> "SessionSignal":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.samples
+
+    @property
+    def size(self) -> int:
+        return self.samples
+
+    @property
+    def shape(self) -> Tuple[int]:
+        return (self.samples,)
+
+    @property
+    def ndim(self) -> int:
+        return 1
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.samples)
+            if step > 0:
+                return self.read_range(start, stop)[::step]
+        if isinstance(key, (int, np.integer)):
+            index = range(self.samples)[key]  # Handles negatives and bounds
+            return self.read_range(index, index + 1)[0]
+        return np.asarray(self)[key]
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> np.ndarray:
+        data = self.read_range(0, self.samples)
+        return data if dtype is None else data.astype(dtype)
+
+    def close(self) -> None:
+        """Closes the segments opened so far."""
+        for segment in self._segments.values():
+            if isinstance(segment, ChunkedSignal):
+                segment.close()
+        self._segments.clear()
+
+    def _segment_path(self, entry: Dict[str, Any]) -> str:
+        path = os.path.join(self._root, entry["file"])
+        if not os.path.exists(path) and path.endswith(RAW_SUFFIX):
+            # Compressed by the recorder since the manifest was read
+            path = os.path.splitext(path)[0] + CHUNKED_SUFFIX
+        return path
+
+    def _segment(self, i: int) -> Union[np.ndarray, ChunkedSignal]:
+        if i not in self._segments:
+            path = self._segment_path(self.manifest["segments"][i])
+            if is_chunked_capture(path):
+                self._segments[i] = ChunkedSignal(path)
+            else:
+                self._segments[i] = _load_raw(path)[0]
+        return self._segments[i]
+
+    def read_range(self, start: int, stop: int) -> np.ndarray:
+        """
+        Returns samples [start, stop), reading only the segments they span.
+
+        Parameters
+        ----------
+        start, stop : int
+            Session sample indices; clamped like a slice.
+
+        Returns
+        -------
+        np.ndarray
+            The stored samples (uint16 codes).
+        """
+        start, stop, _ = slice(start, stop).indices(self.samples)
+        out = np.empty(max(stop - start, 0), dtype=self.dtype)
+        if out.size == 0:
+            return out
+        first = int(np.searchsorted(self.offsets, start, side="right")) - 1
+        last = int(np.searchsorted(self.offsets, stop - 1, side="right")) - 1
+        for i in range(first, last + 1):
+            segment = self._segment(i)
+            seg_start = int(self.offsets[i])
+            lo = max(start, seg_start) - seg_start
+            hi = min(stop - seg_start, len(segment))
+            if isinstance(segment, ChunkedSignal):
+                part = segment.read_range(lo, hi)
+            else:
+                part = segment[lo:hi]
+            out[seg_start + lo - start : seg_start + hi - start] = part
+        return out
+
+
+def open_session(filepath: Union[str, Path]) -> SessionSignal:
+    """
+    Opens a segmented session lazily; see SessionSignal.
+
+    Unlike load_signal(), which reads the whole session into memory, this
+    only reads the manifest; segments are read as windows are sliced.
+    Convert windows to volts with
+    ``dsp.raw_to_volts(window, *load_scale(filepath))``.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the session manifest.
+
+    Returns
+    -------
+    SessionSignal
+        The session; close it (or use it as a context manager) when done.
+    """
+    return SessionSignal(filepath)
+
+
+def load_signal(
+    filepath: Union[str, Path],
+    volts: Optional[bool] = None,
+    dtype: np.dtype = np.dtype(np.float64),
+) -> Tuple[np.ndarray, float]:
+    """
+    Robust loader for .npz files, raw captures, chunked containers and
+    segmented sessions.
+
+    By default the stored samples are returned: uint16 ADC codes for
+    captures written by save_signal()/save_raw(), but volts for legacy
+    archives. Pass `volts` to get one unit whatever the file holds: with
+    ``volts=False`` uint16 ADC codes (legacy volts are quantized like
+    save_signal() does), with ``volts=True`` volts (codes are converted
+    using the capture's ``adc_scale``/``adc_offset``, see load_scale()).
+
+    Raw captures (.raw + .json, see save_raw()) are memory-mapped rather
+    than read: the returned array is a read-only np.memmap and slicing a
+    window only touches the pages it covers, however long the recording.
+    To keep that, load the codes and convert windows with
+    ``dsp.raw_to_volts(window, *load_scale(filepath))``; ``volts=True``
+    converts the whole recording. Chunked containers (see save_chunked())
+    are decompressed in parallel; use ChunkedSignal.read_range() to read
+    only part of one. A session manifest (see recorder.SegmentedRecorder)
+    is read in full into one array; use open_session() to slice a long
+    session without loading it.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the .npz file, either file of a raw capture, a chunked
+        container or a session manifest.
+    volts : Optional[bool]
+        Return voltages (True), uint16 ADC codes (False), or the samples as
+        stored (None). Defaults to None.
+    dtype : np.dtype, optional
+        Float dtype of the voltages (float64 or float32). Defaults to float64.
 
     Returns
     -------
@@ -80,31 +1015,139 @@ def load_signal(filepath: Union[str, Path]) -> Tuple[np.ndarray, float]:
 
     Raises
     ------
-    SystemExit
+    FileNotFoundError
         If the file is not found.
     KeyError
         If 'signal' or 'data' keys are missing in the archive.
     """
-    try:
-        with np.load(filepath) as archive:
-            # Handle variable naming conventions from legacy versions
-            if "signal" in archive:
-                sig = archive["signal"]
-            elif "data" in archive:
-                sig = archive["data"]  # Handle stream.py legacy format
-                # Flatten if it was a stacked array
-                if sig.ndim > 1:
-                    sig = sig.flatten()
-            else:
-                raise KeyError("No 'signal' or 'data' key found in archive.")
+    sig, fs = _load_stored(filepath)
+    if volts is None:
+        return sig, fs
+    if not np.issubdtype(sig.dtype, np.integer):
+        # Legacy archive holding volts
+        if volts:
+            return np.asarray(sig, dtype=dtype), fs
+        return _to_codes(sig, {}), fs
+    if volts:
+        sig = dsp.raw_to_volts(sig, *load_scale(filepath), dtype=dtype)
+    return sig, fs
 
-            # Load FS or default
-            fs = float(archive["fs"]) if "fs" in archive else 97812.0
 
-            return sig, fs
-    except FileNotFoundError:
-        print(f"File not found: {filepath}")
-        sys.exit(1)
+def load_scale(
+    filepath: Union[str, Path], signal: Optional[np.ndarray] = None
+) -> Tuple[float, float]:
+    """
+    Returns (scale, offset) such that volts = sample * scale + offset.
+
+    Captures written by save_signal()/save_raw() carry ``adc_scale`` and
+    ``adc_offset``. Legacy files get the default ADC scale, which also
+    applies to their volts quantized by ``load_signal(path, volts=False)``;
+    pass the samples from ``load_signal(path)`` as `signal` to get
+    (1.0, 0.0) when they are stored volts.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the .npz file, or either file of a raw capture.
+    signal : Optional[np.ndarray]
+        The samples the scale will be applied to, if already loaded.
+
+    Returns
+    -------
+    Tuple[float, float]
+        (scale, offset) in volts per sample unit and volts.
+    """
+    metadata = load_metadata(filepath)
+    if "adc_scale" in metadata:
+        return float(metadata["adc_scale"]), float(metadata.get("adc_offset", 0.0))
+    if signal is not None and not np.issubdtype(signal.dtype, np.integer):
+        return 1.0, 0.0
+    return ADC_SCALE, 0.0
+
+
+def _load_stored(filepath: Union[str, Path]) -> Tuple[np.ndarray, float]:
+    """Loads the samples as stored; see load_signal()."""
+    _wait_for_save(filepath)
+    if is_session_manifest(filepath):
+        with SessionSignal(filepath) as session:
+            return session.read_range(0, session.samples), session.fs
+    if is_raw_capture(filepath):
+        return _load_raw(filepath)
+    if is_chunked_capture(filepath):
+        with ChunkedSignal(filepath) as container:
+            return container.load(), container.fs
+    with np.load(filepath) as archive:
+        # Handle variable naming conventions from legacy versions
+        if "signal" in archive:
+            sig = archive["signal"]
+        elif "data" in archive:
+            sig = archive["data"]  # Handle stream.py legacy format
+            # Flatten if it was a stacked array
+            if sig.ndim > 1:
+                sig = sig.flatten()
+        else:
+            raise KeyError("No 'signal' or 'data' key found in archive.")
+
+        # Load FS or default
+        fs = float(archive["fs"]) if "fs" in archive else 97812.0
+
+        return sig, fs
+
+
+def load_metadata(filepath: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Reads every metadata field of a .npz capture (everything but the signal).
+
+    Scalars are returned as Python values, and JSON objects written by
+    save_signal() (such as ``telemetry``) are decoded back into dicts. For
+    raw captures, chunked containers and session manifests the header's
+    fs, timestamp and metadata are returned.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the .npz file, either file of a raw capture, a container or
+        a session manifest.
+
+    Returns
+    -------
+    Dict[str, Any]
+        Metadata keyed by field name.
+    """
+    _wait_for_save(filepath)
+    if is_session_manifest(filepath):
+        header = read_manifest(filepath)
+        return {
+            "fs": header["fs"],
+            "timestamp": header["timestamp"],
+            **header["metadata"],
+        }
+    if is_raw_capture(filepath) or is_chunked_capture(filepath):
+        if is_raw_capture(filepath):
+            header = read_raw_header(filepath)
+        else:
+            with ChunkedSignal(filepath) as container:
+                header = container.header
+        return {
+            "fs": header["fs"],
+            "timestamp": header["timestamp"],
+            **header["metadata"],
+        }
+
+    metadata: Dict[str, Any] = {}
+    with np.load(filepath) as archive:
+        for key in archive.files:
+            if key in ("signal", "data"):
+                continue
+            val = archive[key]
+            value = val.item() if val.size == 1 else val
+            if isinstance(value, str) and value.startswith("{"):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            metadata[key] = value
+    return metadata
 
 
 def select_file_cli(directory: str) -> Optional[str]:
@@ -125,7 +1168,7 @@ def select_file_cli(directory: str) -> Optional[str]:
         print(f"Directory {directory} does not exist.")
         return None
 
-    files = sorted([f for f in os.listdir(directory) if f.endswith(".npz")])
+    files = sorted([f for f in os.listdir(directory) if is_capture_file(f)])
     if not files:
         print("No recordings found.")
         return None
@@ -141,9 +1184,64 @@ def select_file_cli(directory: str) -> Optional[str]:
         return None
 
 
+def is_capture_file(filename: str) -> bool:
+    """True for the files scan_metadata() lists: .npz, .raw and chunked."""
+    return filename.endswith((".npz", RAW_SUFFIX, CHUNKED_SUFFIX))
+
+
+def metadata_row(filepath: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Reads the metadata of one capture as a scan_metadata() row.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to an .npz archive, a .raw capture or a chunked container.
+
+    Returns
+    -------
+    Dict[str, Any]
+        The filename followed by every metadata field, with NumPy scalars
+        unwrapped and a few fields formatted for display.
+    """
+    row: Dict[str, Any] = {"filename": os.path.basename(filepath)}
+    if not str(filepath).endswith(".npz"):
+        # Same shape as an archive: dict-valued fields stay JSON strings
+        fields = {
+            key: json.dumps(val) if isinstance(val, dict) else val
+            for key, val in load_metadata(filepath).items()
+        }
+    else:
+        with np.load(filepath) as archive:
+            fields = {
+                key: archive[key]
+                for key in archive.files
+                # Skip the heavy raw data
+                if key not in ("signal", "data")
+            }
+
+    for key, val in fields.items():
+        # Clean up NumPy types for display
+        if isinstance(val, np.ndarray) and val.size == 1:
+            val = val.item()
+        # Format specific fields for readability
+        if key == "dominant_freq":
+            val = f"{val:.1f} Hz"
+        elif key == "peak_voltage":
+            val = f"{val:.3f} V"
+        elif key == "fs":
+            val = f"{val:.0f}"
+        row[key] = val
+    return row
+
+
 def scan_metadata(directory: str) -> pd.DataFrame:
     """
-    Recursively scans a directory for .npz files and extracts their metadata.
+    Recursively scans a directory for captures and extracts their metadata.
+
+    Every file is opened on each call; ``catalog.scan_metadata`` returns
+    the same DataFrame from a persistent index and only opens new or
+    changed files.
 
     Parameters
     ----------
@@ -153,47 +1251,23 @@ def scan_metadata(directory: str) -> pd.DataFrame:
     Returns
     -------
     pd.DataFrame
-        DataFrame containing metadata for all found files.
+        DataFrame containing metadata for all found files (.npz and .raw).
     """
     records = []
     # Walk through the data directory recursively
     for root, _, files in os.walk(directory):
         for filename in sorted(files):
-            if not filename.endswith(".npz"):
+            if not is_capture_file(filename):
                 continue
-            filepath = os.path.join(root, filename)
             try:
-                with np.load(filepath) as archive:
-                    # Start with the filename
-                    row: dict[str, Any] = {"filename": filename}
-                    # Loop through all keys in the file
-                    for key in archive.files:
-                        # Skip the heavy raw data
-                        if key in ["signal", "data"]:
-                            continue
-                        # Extract the value
-                        val = archive[key]
-                        # Clean up NumPy types for display
-                        if val.ndim == 0:
-                            val = val.item()
-                        elif isinstance(val, np.ndarray) and val.size == 1:
-                            val = val.item()
-                        # Format specific fields for readability
-                        if key == "dominant_freq":
-                            val = f"{val:.1f} Hz"
-                        elif key == "peak_voltage":
-                            val = f"{val:.3f} V"
-                        elif key == "fs":
-                            val = f"{val:.0f}"
-                        row[key] = val
-                    records.append(row)
+                records.append(metadata_row(os.path.join(root, filename)))
             except Exception as e:
                 print(f"Error reading {filename}: {e}")
     return pd.DataFrame(records)
 
 
 def load_latest_file(
-    directory: str, pattern: str = "*.npz"
+    directory: str, pattern: str = "*.npz", volts: Optional[bool] = None
 ) -> Tuple[Optional[np.ndarray], Optional[float]]:
     """
     Finds and loads the most recent file matching a pattern.
@@ -204,6 +1278,9 @@ def load_latest_file(
         Directory to search.
     pattern : str, optional
         Glob pattern for files. Defaults to "*.npz".
+    volts : Optional[bool]
+        Return voltages (True), uint16 ADC codes (False) or the samples as
+        stored (None, the default); see load_signal().
 
     Returns
     -------
@@ -217,4 +1294,4 @@ def load_latest_file(
 
     latest_file = max(files, key=os.path.getmtime)
     print(f"📂 Loading: {os.path.basename(latest_file)}")
-    return load_signal(latest_file)
+    return load_signal(latest_file, volts=volts)
@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 import scipy.signal as spsig
 
-from . import dsp
+from . import cache, dsp
 
 
 def calculate_gain_metrics(
@@ -179,6 +179,7 @@ def prepare_transfer_curve(
     return aligned_src[:n], norm_dut[:n]
 
 
+@cache.cached
 def extract_harmonics_list(
     signal: np.ndarray, fs: float, fundamental_freq: float, n_harmonics: int = 10
 ) -> Optional[pd.DataFrame]:
@@ -341,6 +342,7 @@ def compute_impulse_response(
     return ir_raw, int(peak_idx)
 
 
+@cache.cached
 def compute_bode_data(
     sig_src: np.ndarray, sig_dut: np.ndarray, fs: float
 ) -> Dict[str, Any]:
@@ -0,0 +1,218 @@
+"""
+Synchronized acquisition from several DAQ boards.
+
+`DAQPool` drives one `DAQInterface` per port from parallel threads, so the
+input and output of a DUT (plus e.g. a power rail probe) are captured in a
+single shot instead of sequential captures.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generator, List, Optional, Sequence, Type
+
+import numpy as np
+
+from . import config, daq, dsp
+
+
+class DAQPool:
+    """
+    Opens N DAQ ports and captures from them in parallel.
+
+    Implements the context manager protocol; all devices are connected
+    concurrently on entry and released on exit.
+
+    Parameters
+    ----------
+    ports : Sequence[str]
+        Serial ports, one per channel. Channel 0 is the skew reference.
+    baud : int, optional
+        Baud rate for every port. Defaults to config.BAUD_RATE.
+    transports : Optional[Sequence[Any]]
+        Pre-opened serial-compatible objects (e.g. virtual.VirtualDAQ), one
+        per port, passed through to DAQInterface.
+
+    Attributes
+    ----------
+    devices : List[daq.DAQInterface]
+        One interface per channel, in port order.
+    """
+
+    def __init__(
+        self,
+        ports: Sequence[str],
+        baud: int = config.BAUD_RATE,
+        transports: Optional[Sequence[Any]] = None,
+    ) -> None:
+        if not ports:
+            raise ValueError("DAQPool needs at least one port")
+        if transports is not None and len(transports) != len(ports):
+            raise ValueError("Need exactly one transport per port")
+
+        self.ports = list(ports)
+        self.devices: List[daq.DAQInterface] = [
+            daq.DAQInterface(port, baud, transports[i] if transports else None)
+            for i, port in enumerate(self.ports)
+        ]
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "DAQPool":
+        self.connect()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[Any],
+    ) -> None:
+        self.disconnect()
+
+    @property
+    def n_channels(self) -> int:
+        """Number of devices in the pool."""
+        return len(self.devices)
+
+    def connect(self) -> None:
+        """
+        Connects all devices concurrently.
+
+        Raises
+        ------
+        IOError
+            If any port fails to connect; the others are released again.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.n_channels, thread_name_prefix="daq-pool"
+        )
+        try:
+            self._run_parallel(lambda _, device: device.connect())
+        except IOError:
+            self.disconnect()
+            raise
+
+    def disconnect(self) -> None:
+        """Releases the worker threads and all devices."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        for device in self.devices:
+            if device.ser is not None:
+                device.disconnect()
+
+    def capture_burst(
+        self,
+        samples: int = config.BURST_SAMPLES,
+        decimation: int = 1,
+        max_lag: Optional[int] = None,
+        fs: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Captures one burst from every device at (nearly) the same moment.
+
+        All worker threads meet at a barrier and then send their capture
+        command together. Host timestamps bound when each request left and
+        each burst arrived; the residual skew between boards is estimated
+        by cross-correlating every channel against channel 0.
+
+        Parameters
+        ----------
+        samples : int, optional
+            Samples per channel. Defaults to config.BURST_SAMPLES.
+        decimation : int, optional
+            Keep every n-th conversion. Defaults to 1.
+        max_lag : Optional[int]
+            Limit the skew search to +/- max_lag samples. Set this to less
+            than half a period for periodic test signals.
+        fs : Optional[float]
+            Sampling rate used to express skew in seconds. Defaults to
+            channel 0's effective rate (``devices[0].fs``).
+
+        Returns
+        -------
+        Dict[str, Any]
+            data (channels, samples) uint16, ports, t_request and t_complete
+            (per-channel host time.time()), request_spread_s, skew_samples
+            and skew_s (per-channel lag behind channel 0).
+        """
+        data = np.empty((self.n_channels, samples), dtype="<u2")
+        t_request = np.zeros(self.n_channels)
+        t_complete = np.zeros(self.n_channels)
+        barrier = threading.Barrier(self.n_channels, timeout=config.TIMEOUT)
+
+        def capture(i: int, device: daq.DAQInterface) -> None:
+            barrier.wait()
+            t_request[i] = time.time()
+            device.capture_burst_into(data[i], decimation)
+            t_complete[i] = time.time()
+
+        self._run_parallel(capture)
+
+        skew = np.array(
+            [dsp.estimate_lag(data[0], data[i], max_lag) for i in range(len(data))]
+        )
+        return {
+            "data": data,
+            "ports": list(self.ports),
+            "t_request": t_request,
+            "t_complete": t_complete,
+            "request_spread_s": float(t_request.max() - t_request.min()),
+            "skew_samples": skew,
+            "skew_s": skew * decimation / (fs or self.devices[0].fs),
+        }
+
+    def stream(
+        self,
+        chunk_size: int = config.LIVE_SAMPLES,
+        ring_frames: int = config.RING_FRAMES,
+        poll_interval: float = 0.001,
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Yields stacked frames from all devices.
+
+        Each device runs its own BackgroundReader; the k-th yielded array
+        holds the k-th frame of every device. Boards stream independently,
+        so frames are matched by index, not sample-aligned; use
+        capture_burst() when inter-channel timing matters.
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            Samples per frame. Defaults to config.LIVE_SAMPLES.
+        ring_frames : int, optional
+            Ring depth per device. Defaults to config.RING_FRAMES.
+        poll_interval : float, optional
+            Sleep while waiting for a device's next frame, in seconds.
+
+        Yields
+        ------
+        np.ndarray
+            (channels, chunk_size) array of uint16 raw ADC values.
+
+        Raises
+        ------
+        IOError
+            If a device's reader thread stops.
+        """
+        readers = [d.start_reader(chunk_size, ring_frames) for d in self.devices]
+        try:
+            while True:
+                frame = np.empty((self.n_channels, chunk_size), dtype="<u2")
+                for i, reader in enumerate(readers):
+                    while reader.ring.pop(frame[i]) is None:
+                        if not reader.is_alive:
+                            raise IOError(f"Reader for {self.ports[i]} stopped.")
+                        time.sleep(poll_interval)
+                yield frame
+        finally:
+            for device in self.devices:
+                device.stop_reader()
+
+    def _run_parallel(self, fn: Callable[[int, daq.DAQInterface], None]) -> None:
+        """Runs fn(index, device) for every device concurrently and waits."""
+        if self._executor is None:
+            raise AttributeError("DAQPool not connected.")
+        futures = [self._executor.submit(fn, i, d) for i, d in enumerate(self.devices)]
+        for future in futures:
+            future.result()
@@ -0,0 +1,590 @@
+"""
+Streaming-to-disk recording for long continuous captures.
+
+`StreamRecorder` appends raw uint16 frames to a file as they arrive, via a
+background writer thread with a bounded queue, so memory stays constant for
+any session length and a crash leaves everything written so far on disk.
+Each recording is written in the raw capture format of ``io.save_raw``:
+
+* ``<name>.raw``: little-endian uint16 samples, back to back.
+* ``<name>.json``: sidecar header with fs, sample count, completion flag
+  and user metadata, rewritten on every fsync.
+
+``io.load_signal`` can map the pair at any time, even mid-recording. On
+close it is finalized into the usual ``.npz`` archive (see
+``io.save_signal``); ``finalize_raw()`` does the same for a recording left
+behind by a crash.
+
+For multi-hour sessions `SegmentedRecorder` instead rolls over to a new
+raw segment every few minutes, compresses finished segments into chunked
+containers in the background and keeps a manifest of segments, sample
+offsets and gaps. ``io.open_session`` opens the manifest as one lazily
+concatenated signal (``io.SessionSignal``).
+"""
+
+import json
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import config, io
+
+# Timestamp (with optional microseconds and collision counter) ending a name
+_NAME_TIMESTAMP = re.compile(r"_\d{8}_\d{6}(?:_\d{6})?(?:_\d+)?$")
+
+
+class StreamRecorder:
+    """
+    Appends frames to a raw file from a background writer thread.
+
+    Use as ``with StreamRecorder(directory, fs) as rec: rec.write(frame)``;
+    leaving the block finalizes the recording unless an exception escaped.
+    ``write()`` only enqueues; if the disk falls `queue_frames` frames
+    behind it blocks, which bounds memory instead of dropping data.
+
+    Parameters
+    ----------
+    directory : str
+        Target directory (created if missing).
+    fs : float
+        Sampling rate in Hz, stored in the sidecar and the final archive.
+    prefix : str, optional
+        Filename prefix. Defaults to "session".
+    fsync_interval : float, optional
+        Seconds between fsync() calls (and sidecar updates). Defaults to
+        config.FSYNC_INTERVAL.
+    queue_frames : int, optional
+        Frames buffered between acquisition and disk. Defaults to
+        config.RECORDER_QUEUE_FRAMES.
+    **metadata : Any
+        Stored in the sidecar and passed on to io.save_signal on finalize.
+
+    Attributes
+    ----------
+    raw_path : str
+        Path of the raw sample file.
+    header_path : str
+        Path of the JSON sidecar.
+    samples : int
+        Samples written to disk so far.
+    path : Optional[str]
+        Path of the .npz archive once finalized.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fs: float,
+        prefix: str = "session",
+        fsync_interval: float = config.FSYNC_INTERVAL,
+        queue_frames: int = config.RECORDER_QUEUE_FRAMES,
+        **metadata: Any,
+    ) -> None:
+        # Claims the .raw file exclusively, so recorders started in the same
+        # second (or by another process) never write to the same file
+        self.raw_path, self._timestamp = io._new_capture_path(
+            directory, prefix, io.RAW_SUFFIX, reserve=io._reserve_file
+        )
+        name = os.path.splitext(os.path.basename(self.raw_path))[0]
+        self.directory = directory
+        self.prefix = prefix
+        self.fs = fs
+        self.metadata: Dict[str, Any] = {
+            "adc_scale": io.ADC_SCALE,
+            "adc_offset": 0.0,
+            **metadata,
+        }
+        self.header_path = os.path.join(directory, name + io.HEADER_SUFFIX)
+        self.fsync_interval = fsync_interval
+        self.samples: int = 0
+        self.path: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+        self._file = open(self.raw_path, "wb")
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue(queue_frames)
+        self._write_header(complete=False)
+        self._thread = threading.Thread(
+            target=self._run, name="stream-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "StreamRecorder":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        # On an exception the raw pair is kept for finalize_raw()
+        self.close(finalize=exc_type is None)
+
+    def write(self, frame: np.ndarray) -> None:
+        """
+        Queues one frame of raw uint16 samples for writing.
+
+        The array is written as-is, so the caller must not modify it
+        afterwards (generators that yield a new array per frame are fine).
+
+        Raises
+        ------
+        IOError
+            If the writer thread failed (e.g. disk full).
+        """
+        if self.error is not None:
+            raise IOError(f"Recorder failed: {self.error}") from self.error
+        self._queue.put(np.ascontiguousarray(frame, dtype="<u2"))
+
+    def update_metadata(self, **metadata: Any) -> None:
+        """Adds metadata; it reaches the sidecar on the next fsync or close."""
+        self.metadata.update(metadata)
+
+    def close(self, finalize: bool = True) -> Optional[str]:
+        """
+        Flushes all queued frames and stops the writer.
+
+        Parameters
+        ----------
+        finalize : bool, optional
+            Convert the recording into an .npz archive and delete the raw
+            pair. Defaults to True.
+
+        Returns
+        -------
+        Optional[str]
+            Path of the .npz archive if finalized, else None (the raw pair
+            is kept and can be finalized later with finalize_raw()).
+        """
+        if self.path is not None:
+            return self.path
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if not self._file.closed:
+            self._sync()
+            self._file.close()
+            self._write_header(complete=True)
+        if self.error is not None:
+            raise IOError(f"Recorder failed: {self.error}") from self.error
+        if not finalize:
+            return None
+        self.path = finalize_raw(self.raw_path)
+        return self.path
+
+    def discard(self) -> None:
+        """Stops the writer and deletes the raw pair (e.g. empty sessions)."""
+        try:
+            self.close(finalize=False)
+        finally:
+            for path in (self.raw_path, self.header_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def _run(self) -> None:
+        last_sync = time.monotonic()
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is None:
+                    break
+                self._file.write(memoryview(frame).cast("B"))
+                self.samples += frame.size
+                if time.monotonic() - last_sync >= self.fsync_interval:
+                    self._sync()
+                    last_sync = time.monotonic()
+        except OSError as e:
+            self.error = e
+            # Keep draining so producers blocked on put() are released
+            while self._queue.get() is not None:
+                pass
+
+    def _sync(self) -> None:
+        """Forces written samples to disk and records them in the sidecar."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._write_header(complete=False)
+
+    def _write_header(self, complete: bool) -> None:
+        io.write_raw_header(
+            self.raw_path,
+            self.fs,
+            "<u2",
+            self.samples,
+            complete=complete,
+            timestamp=self._timestamp,
+            metadata=self.metadata,
+        )
+
+
+def finalize_raw(raw_path: str, remove: bool = True) -> str:
+    """
+    Converts a raw recording (.raw + .json sidecar) into an .npz archive.
+
+    The samples are memory-mapped and streamed into the archive in chunks,
+    so memory use does not depend on the recording length. Samples beyond
+    the count in the sidecar (written after the last fsync of a crashed
+    session) are included as long as they form whole uint16 words.
+
+    Parameters
+    ----------
+    raw_path : str
+        Path of the .raw file (its sidecar is found by name).
+    remove : bool, optional
+        Delete the raw pair once the archive is written. Defaults to True.
+
+    Returns
+    -------
+    str
+        Path of the .npz archive.
+
+    Raises
+    ------
+    ValueError
+        If the recording holds no samples.
+    """
+    base = os.path.splitext(raw_path)[0]
+    header = io.read_raw_header(raw_path)
+    signal, fs = io.load_signal(raw_path, volts=False)
+    if signal.size == 0:
+        raise ValueError(f"Recording {raw_path} is empty")
+    metadata = dict(header.get("metadata", {}))
+    if not header.get("complete", False):
+        metadata["recovered"] = True
+    prefix = _NAME_TIMESTAMP.sub("", os.path.basename(base))
+
+    path = io.save_signal(
+        signal, fs, os.path.dirname(raw_path), prefix=prefix, **metadata
+    )
+    del signal
+    if remove:
+        os.remove(base + io.RAW_SUFFIX)
+        os.remove(base + io.HEADER_SUFFIX)
+    return path
+
+
+class SegmentedRecorder:
+    """
+    Records a session as a sequence of fixed-length segment files.
+
+    Frames are written by a background writer thread, as in StreamRecorder,
+    which also rolls over to a new segment once the current one holds
+    `segment_seconds` (or `segment_bytes`) of samples, so acquisition never
+    waits for it. Frames are split at the boundary, so every segment but
+    the last has exactly the same length. Each finished segment is
+    compressed into a chunked container (see io.save_chunked) on another
+    thread. The session directory holds:
+
+    * ``<name>.manifest``: JSON listing every segment with its session
+      sample offset, plus the gaps reported through write(). Rewritten
+      atomically on every rollover, fsync and compression.
+    * ``<name>_s00000.raw``/``.json``, ...: the segment being written, in
+      the raw capture format.
+    * ``<name>_s00000.blk``, ...: finished segments.
+
+    A crash loses at most the samples since the last fsync: the manifest
+    and raw segments stay readable. Open the session with
+    ``io.open_session(rec.manifest_path)``.
+
+    Parameters
+    ----------
+    directory : str
+        Parent directory; the session gets its own subdirectory.
+    fs : float
+        Sampling rate in Hz.
+    prefix : str, optional
+        Session name prefix. Defaults to "session".
+    segment_seconds : float, optional
+        Segment length. Defaults to config.SEGMENT_SECONDS.
+    segment_bytes : Optional[int]
+        Segment size in bytes of uint16 samples; overrides
+        `segment_seconds`.
+    compress : bool, optional
+        Convert finished segments into chunked containers. Defaults to True.
+    fsync_interval : float, optional
+        Seconds between fsync() calls. Defaults to config.FSYNC_INTERVAL.
+    queue_frames : int, optional
+        Frames buffered between acquisition and disk. Defaults to
+        config.RECORDER_QUEUE_FRAMES.
+    **metadata : Any
+        JSON-serializable metadata stored in the manifest and every segment.
+
+    Attributes
+    ----------
+    session_dir : str
+        Directory holding the manifest and segments.
+    manifest_path : str
+        Path of the manifest.
+    samples : int
+        Samples written to disk so far.
+    path : Optional[str]
+        `manifest_path` once the recorder is closed.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        fs: float,
+        prefix: str = "session",
+        segment_seconds: float = config.SEGMENT_SECONDS,
+        segment_bytes: Optional[int] = None,
+        compress: bool = True,
+        fsync_interval: float = config.FSYNC_INTERVAL,
+        queue_frames: int = config.RECORDER_QUEUE_FRAMES,
+        **metadata: Any,
+    ) -> None:
+        # The session directory is the reservation: os.mkdir fails if it exists
+        self.session_dir, self._timestamp = io._new_capture_path(
+            directory, prefix, "", reserve=os.mkdir
+        )
+        self.name = os.path.basename(self.session_dir)
+        self.manifest_path = os.path.join(
+            self.session_dir, self.name + io.MANIFEST_SUFFIX
+        )
+        self.fs = fs
+        if segment_bytes is not None:
+            self.segment_samples = max(segment_bytes // 2, 1)
+        else:
+            self.segment_samples = max(int(round(segment_seconds * fs)), 1)
+        self.fsync_interval = fsync_interval
+        self.metadata: Dict[str, Any] = {
+            "adc_scale": io.ADC_SCALE,
+            "adc_offset": 0.0,
+            **metadata,
+        }
+        self.samples: int = 0
+        self.path: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self.segments: List[Dict[str, Any]] = []
+        self.gaps: List[Dict[str, int]] = []
+
+        self._complete = False
+        self._lock = threading.Lock()  # Guards segment entries and the manifest
+        self._compressor = (
+            ThreadPoolExecutor(1, thread_name_prefix="segment-compress")
+            if compress
+            else None
+        )
+        self._file = self._open_segment()
+        self._queue: "queue.Queue[Optional[Tuple[np.ndarray, int]]]" = queue.Queue(
+            queue_frames
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="segmented-recorder", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "SegmentedRecorder":
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    def write(self, frame: np.ndarray, gap: int = 0) -> None:
+        """
+        Queues one frame of raw uint16 samples for writing.
+
+        As with StreamRecorder.write(), the caller must not modify the
+        array afterwards.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Raw ADC codes.
+        gap : int, optional
+            Samples lost immediately before this frame (e.g.
+            ``StreamFrame.dropped_before * frame.size``); recorded in the
+            manifest. Defaults to 0.
+
+        Raises
+        ------
+        IOError
+            If the writer thread failed (e.g. disk full).
+        """
+        if self.error is not None:
+            raise IOError(f"Recorder failed: {self.error}") from self.error
+        self._queue.put((np.ascontiguousarray(frame, dtype="<u2"), gap))
+
+    def update_metadata(self, **metadata: Any) -> None:
+        """
+        Adds metadata; it reaches the manifest on the next fsync or close.
+
+        Segments written from then on carry it too.
+        """
+        with self._lock:
+            self.metadata.update(metadata)
+
+    def close(self) -> str:
+        """
+        Flushes all queued frames, closes the last segment and waits for
+        the segments to be compressed.
+
+        Returns
+        -------
+        str
+            Path of the manifest.
+
+        Raises
+        ------
+        IOError
+            If the writer thread failed; the segments written so far are
+            kept.
+        """
+        if self.path is not None:
+            return self.path
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if not self._file.closed:
+            self._close_segment()
+        if self._compressor is not None:
+            self._compressor.shutdown(wait=True)
+        if self.error is not None:
+            raise IOError(f"Recorder failed: {self.error}") from self.error
+        self._complete = True
+        self._write_manifest()
+        self.path = self.manifest_path
+        n_gaps = len(self.gaps)
+        print(
+            f"💾 Session {self.manifest_path}: {len(self.segments)} segments, "
+            f"{self.samples / self.fs:.1f} s, {n_gaps} gaps"
+        )
+        return self.path
+
+    def discard(self) -> None:
+        """Stops the writer and deletes the session directory."""
+        try:
+            self.close()
+        except IOError:
+            pass
+        finally:
+            shutil.rmtree(self.session_dir, ignore_errors=True)
+
+    def _segment_metadata(self, index: int, offset: int) -> Dict[str, Any]:
+        return {
+            **self.metadata,
+            "session": self.name,
+            "segment": index,
+            "session_offset": offset,
+        }
+
+    def _open_segment(self) -> BinaryIO:
+        """Starts the next segment file and lists it in the manifest."""
+        index = len(self.segments)
+        raw_path = os.path.join(
+            self.session_dir, f"{self.name}_s{index:05d}{io.RAW_SUFFIX}"
+        )
+        entry = {
+            "file": os.path.basename(raw_path),
+            "offset": self.samples,
+            "samples": 0,
+            "timestamp": datetime.now().isoformat(),
+            "complete": False,
+        }
+        f = open(raw_path, "wb")
+        with self._lock:
+            self.segments.append(entry)
+        self._write_segment_header(complete=False)
+        self._write_manifest()
+        return f
+
+    def _close_segment(self) -> None:
+        """Finishes the current segment and queues its compression."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        entry = self.segments[-1]
+        with self._lock:
+            entry["complete"] = True
+        self._write_segment_header(complete=True)
+        self._write_manifest()
+        if self._compressor is not None and entry["samples"] > 0:
+            self._compressor.submit(self._compress, entry)
+
+    def _compress(self, entry: Dict[str, Any]) -> None:
+        raw_path = os.path.join(self.session_dir, entry["file"])
+        try:
+            path = io.convert_to_chunked(raw_path, remove=True)
+        except Exception as e:
+            # The raw segment stays listed and readable
+            print(f"⚠️ Could not compress {raw_path}: {e}")
+            return
+        with self._lock:
+            entry["file"] = os.path.basename(path)
+        self._write_manifest()
+
+    def _run(self) -> None:
+        last_sync = time.monotonic()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                frame, gap = item
+                if gap:
+                    with self._lock:
+                        self.gaps.append({"offset": self.samples, "samples": gap})
+                pos = 0
+                while pos < frame.size:
+                    # Roll over lazily so a session never ends on an empty segment
+                    written = self.samples - self.segments[-1]["offset"]
+                    if written >= self.segment_samples:
+                        self._close_segment()
+                        self._file = self._open_segment()
+                        written = 0
+                    n = min(frame.size - pos, self.segment_samples - written)
+                    self._file.write(memoryview(frame[pos : pos + n]).cast("B"))
+                    self.samples += n
+                    pos += n
+                    with self._lock:
+                        self.segments[-1]["samples"] = written + n
+                if time.monotonic() - last_sync >= self.fsync_interval:
+                    self._sync()
+                    last_sync = time.monotonic()
+        except OSError as e:
+            self.error = e
+            # Keep draining so producers blocked on put() are released
+            while self._queue.get() is not None:
+                pass
+
+    def _sync(self) -> None:
+        """Forces written samples to disk and records them in the manifest."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._write_segment_header(complete=False)
+        self._write_manifest()
+
+    def _write_segment_header(self, complete: bool) -> None:
+        entry = self.segments[-1]
+        io.write_raw_header(
+            os.path.join(self.session_dir, entry["file"]),
+            self.fs,
+            "<u2",
+            entry["samples"],
+            complete=complete,
+            timestamp=entry["timestamp"],
+            metadata=self._segment_metadata(len(self.segments) - 1, entry["offset"]),
+        )
+
+    def _write_manifest(self) -> None:
+        """Atomically replaces the manifest with the current state."""
+        with self._lock:
+            manifest = {
+                "format": io.SESSION_FORMAT,
+                "dtype": "<u2",
+                "fs": self.fs,
+                "samples": self.samples,
+                "segment_samples": self.segment_samples,
+                "complete": self._complete,
+                "timestamp": self._timestamp,
+                "metadata": self.metadata,
+                "segments": self.segments,
+                "gaps": self.gaps,
+            }
+            tmp_path = self.manifest_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, self.manifest_path)
@@ -153,7 +153,7 @@ def generate_video(
     Parameters
     ----------
     filepath : str
-        Path to the source .npz data file.
+        Path to the source .npz data file or raw capture.
     output_path : str
         Path for the output video file (e.g., .mp4).
     effect_id : str
@@ -163,13 +163,9 @@ def generate_video(
     """
     print(f"--- INITIALIZING RENDER ENGINE ---\nSource: {filepath}")
 
-    raw_data, fs = io.load_signal(filepath)
-    # Ensure float voltage for rendering
-    data = (
-        dsp.raw_to_volts(raw_data)
-        if np.issubdtype(raw_data.dtype, np.integer)
-        else raw_data
-    )
+    # Raw captures come back memory-mapped; windows are converted on the fly
+    data, fs = io.load_signal(filepath, volts=False)
+    scale, offset = io.load_scale(filepath)
 
     total_samples = data.size
     duration = total_samples / fs
@@ -233,7 +229,9 @@ def generate_video(
                 if center_idx + window_size >= total_samples:
                     break
 
-                chunk = data[center_idx : center_idx + window_size]
+                chunk = dsp.raw_to_volts(
+                    data[center_idx : center_idx + window_size], scale, offset
+                )
 
                 # Stabilize waveform for visual continuity
                 stabilized = dsp.software_trigger(chunk)
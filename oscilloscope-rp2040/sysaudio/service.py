@@ -0,0 +1,353 @@
+"""
+Acquisition service that fans one DAQ stream out to many processes.
+
+Only one process can own the serial port. `AcquisitionService` owns the
+device and publishes frames into a `multiprocessing.shared_memory` ring;
+any number of `SharedStreamReader`s (live scope, recorder, analyzer) attach
+to it by name and read frames (copies by default, or zero-copy numpy views).
+The writer never waits for readers: a reader that falls a full ring behind
+loses frames and counts them as overruns.
+
+Shared memory layout (little-endian)::
+
+    header   : 8 x int64  (magic, n_slots, frame_size, write_count,
+                           last_seq, fs [float64], writer_pid, closed)
+    slot_seq : n_slots x int64   (frame index stored in slot, -1 = writing)
+    frames   : n_slots x frame_size x uint16
+"""
+
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, Generator, Optional, Type
+
+import numpy as np
+
+from . import config, daq
+
+SHM_MAGIC: int = 0x53415544  # 'SAUD'
+
+# Header field indices
+_H_MAGIC, _H_SLOTS, _H_FRAME, _H_WRITE, _H_SEQ, _H_FS, _H_PID, _H_CLOSED = range(8)
+_HEADER_WORDS = 8
+
+
+def _layout(
+    shm: shared_memory.SharedMemory, n_slots: int, frame_size: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Maps the header, slot sequence table and frame ring onto `shm`."""
+    buf = shm.buf
+    if buf is None:
+        raise IOError(f"Shared memory '{shm.name}' is closed.")
+    header = np.ndarray((_HEADER_WORDS,), dtype="<i8", buffer=buf)
+    slot_seq = np.ndarray((n_slots,), dtype="<i8", buffer=buf, offset=header.nbytes)
+    frames = np.ndarray(
+        (n_slots, frame_size),
+        dtype="<u2",
+        buffer=buf,
+        offset=header.nbytes + slot_seq.nbytes,
+    )
+    return header, slot_seq, frames
+
+
+def _pid_alive(pid: int) -> bool:
+    """True if process `pid` exists (signal 0 only checks, POSIX)."""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    return True
+
+
+def _create_segment(name: str, size: int) -> shared_memory.SharedMemory:
+    """
+    Creates the service segment, replacing one left by a crashed service.
+
+    Raises
+    ------
+    IOError
+        If a running service still owns the segment.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, create=True, size=size)
+    except FileExistsError:
+        pass
+
+    # Only POSIX keeps a segment alive after its processes exit, so only
+    # there can one be stale (and os.kill(pid, 0) is a harmless probe)
+    stale = shared_memory.SharedMemory(name=name, track=False)
+    pid = 0
+    if stale.buf is not None and len(stale.buf) >= 8 * _HEADER_WORDS:
+        probe = np.ndarray((_HEADER_WORDS,), dtype="<i8", buffer=stale.buf)
+        if int(probe[_H_MAGIC]) == SHM_MAGIC and not probe[_H_CLOSED]:
+            pid = int(probe[_H_PID])
+        del probe
+    if _pid_alive(pid):
+        stale.close()
+        raise IOError(f"Shared memory '{name}' is in use by process {pid}.")
+
+    print(f"⚠️ Replacing stale shared memory segment '{name}'")
+    stale.close()
+    stale.unlink()
+    return shared_memory.SharedMemory(name=name, create=True, size=size)
+
+
+class AcquisitionService:
+    """
+    Owns a DAQInterface and publishes its frames into shared memory.
+
+    A segment of the same name left behind by a service that crashed (or
+    was closed without unlinking it) is replaced; one owned by a running
+    service raises IOError.
+
+    Parameters
+    ----------
+    device : daq.DAQInterface
+        A connected device. The service drives its continuous stream.
+    name : str, optional
+        Shared memory segment name. Defaults to config.SHM_NAME.
+    n_slots : int, optional
+        Frames held in the ring. Defaults to config.SHM_SLOTS.
+    frame_size : int, optional
+        Samples per frame. Defaults to config.LIVE_SAMPLES.
+    fs : Optional[float]
+        Sampling rate advertised to readers. Defaults to ``device.fs``.
+    """
+
+    def __init__(
+        self,
+        device: daq.DAQInterface,
+        name: str = config.SHM_NAME,
+        n_slots: int = config.SHM_SLOTS,
+        frame_size: int = config.LIVE_SAMPLES,
+        fs: Optional[float] = None,
+    ) -> None:
+        self.device = device
+        self.name = name
+        self.n_slots = n_slots
+        self.frame_size = frame_size
+
+        size = 8 * (_HEADER_WORDS + n_slots) + 2 * n_slots * frame_size
+        self.shm = _create_segment(name, size)
+        self.header, self.slot_seq, self.frames = _layout(self.shm, n_slots, frame_size)
+
+        self.slot_seq[:] = -1
+        self.header[:] = 0
+        self.header[_H_SLOTS] = n_slots
+        self.header[_H_FRAME] = frame_size
+        self.header[_H_FS : _H_FS + 1].view("<f8")[0] = fs or device.fs
+        self.header[_H_PID] = os.getpid()
+        self.header[_H_MAGIC] = SHM_MAGIC  # Published last: segment is ready
+
+    def __enter__(self) -> "AcquisitionService":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[Any],
+    ) -> None:
+        self.close()
+
+    def publish(self, samples: np.ndarray, seq: int) -> None:
+        """
+        Writes one frame into the next slot.
+
+        The slot is marked as being written (-1) first and stamped with its
+        frame index afterwards, so readers can detect a torn frame.
+        """
+        write_count = int(self.header[_H_WRITE])
+        slot = write_count % self.n_slots
+
+        self.slot_seq[slot] = -1
+        self.frames[slot, : samples.size] = samples
+        self.slot_seq[slot] = write_count
+        self.header[_H_SEQ] = seq
+        self.header[_H_WRITE] = write_count + 1
+
+    def run(self, duration: Optional[float] = None) -> None:
+        """
+        Streams from the device into shared memory.
+
+        Runs until `duration` seconds have elapsed, or indefinitely until
+        KeyboardInterrupt if `duration` is None.
+        """
+        start = time.time()
+        print(f"📡 Publishing stream on shared memory '{self.name}'...")
+        try:
+            for frame in self.device.continuous_stream(fill_gaps=True):
+                self.publish(frame.samples, frame.seq)
+                if duration is not None and time.time() - start >= duration:
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.header[_H_CLOSED] = 1
+
+    def close(self) -> None:
+        """Marks the stream closed and removes the shared memory segment."""
+        self.header[_H_CLOSED] = 1
+        del self.header, self.slot_seq, self.frames
+        self.shm.close()
+        self.shm.unlink()
+
+
+class SharedStreamReader:
+    """
+    Attaches to an AcquisitionService and reads its frames.
+
+    Mirrors `DAQInterface.stream_generator()`: iterate over
+    ``stream_generator()`` to get uint16 frames. By default each frame is
+    copied out of shared memory and checked against the slot's sequence
+    stamp afterwards, so a frame the writer overwrote mid-copy is dropped
+    (and counted as an overrun) instead of being returned torn.
+
+    With ``copy=False`` frames are read-only views into shared memory (no
+    copy). The writer can overwrite a view at any time once it laps the
+    ring, so call valid() after using the frame and discard the result if
+    it returns False.
+
+    Attributes
+    ----------
+    overruns : int
+        Frames lost because this reader fell a full ring behind.
+    skipped : int
+        Frames passed over in 'latest' mode.
+    """
+
+    def __init__(self, name: str = config.SHM_NAME) -> None:
+        self.name = name
+        # track=False: a reader exiting must not unlink the writer's segment
+        self.shm = shared_memory.SharedMemory(name=name, track=False)
+
+        probe, _, _ = _layout(self.shm, 0, 0)
+        if int(probe[_H_MAGIC]) != SHM_MAGIC:
+            del probe
+            self.shm.close()
+            raise IOError(f"'{name}' is not an acquisition service segment.")
+        self.n_slots = int(probe[_H_SLOTS])
+        self.frame_size = int(probe[_H_FRAME])
+        del probe
+
+        self.header, self.slot_seq, self.frames = _layout(
+            self.shm, self.n_slots, self.frame_size
+        )
+        self.overruns: int = 0
+        self.skipped: int = 0
+        self._cursor: int = int(self.header[_H_WRITE])
+        self._last: int = -1
+
+    def __enter__(self) -> "SharedStreamReader":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[Any],
+    ) -> None:
+        self.close()
+
+    @property
+    def fs(self) -> float:
+        """Sampling rate advertised by the service."""
+        return float(self.header[_H_FS : _H_FS + 1].view("<f8")[0])
+
+    @property
+    def closed(self) -> bool:
+        """True once the service has stopped publishing."""
+        return bool(self.header[_H_CLOSED])
+
+    def valid(self) -> bool:
+        """
+        True if the frame yielded last has not been overwritten since.
+
+        Only needed with ``stream_generator(copy=False)``: check it after
+        reading a view, since the writer may have reused the slot meanwhile.
+        """
+        if self._last < 0:
+            return False
+        return int(self.slot_seq[self._last % self.n_slots]) == self._last
+
+    def stream_generator(
+        self, mode: str = "all", poll_interval: float = 0.001, copy: bool = True
+    ) -> Generator[np.ndarray, None, None]:
+        """
+        Yields frames as they are published, until the service closes.
+
+        Parameters
+        ----------
+        mode : str, optional
+            'all' yields every frame in order; 'latest' yields only the
+            newest frame each time. Defaults to 'all'.
+        poll_interval : float, optional
+            Sleep between checks when no new frame is available, in seconds.
+        copy : bool, optional
+            Yield verified copies (True) or zero-copy views that must be
+            checked with valid() after use (False). Defaults to True.
+
+        Yields
+        ------
+        np.ndarray
+            (frame_size,) uint16 frame: a private copy, or a read-only view
+            into shared memory.
+        """
+        if mode not in ("all", "latest"):
+            raise ValueError(f"Unknown mode: {mode}")
+
+        while True:
+            written = int(self.header[_H_WRITE])
+            if written == self._cursor:
+                if self.closed:
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            if mode == "latest":
+                self.skipped += written - 1 - self._cursor
+                self._cursor = written - 1
+            elif self._cursor < written - self.n_slots + 1:
+                lost = written - self.n_slots + 1 - self._cursor
+                self.overruns += lost
+                self._cursor += lost
+
+            idx = self._cursor
+            self._cursor += 1
+            slot = idx % self.n_slots
+            if int(self.slot_seq[slot]) != idx:
+                # Overwritten (or being written) before we got to it
+                self.overruns += 1
+                continue
+
+            view = self.frames[slot]
+            if copy:
+                frame = view.copy()
+                if int(self.slot_seq[slot]) != idx:
+                    # Overwritten while copying: the copy may be torn
+                    self.overruns += 1
+                    continue
+            else:
+                frame = view
+                frame.flags.writeable = False
+            self._last = idx
+            yield frame
+
+    def stats(self) -> Dict[str, int]:
+        """Returns reader-side counters and the writer position."""
+        return {
+            "written": int(self.header[_H_WRITE]),
+            "read": self._cursor,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "last_seq": int(self.header[_H_SEQ]),
+        }
+
+    def close(self) -> None:
+        """Detaches from the shared memory segment."""
+        del self.header, self.slot_seq, self.frames
+        self.shm.close()
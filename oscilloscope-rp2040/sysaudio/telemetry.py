@@ -0,0 +1,206 @@
+"""
+Always-on acquisition counters for DAQInterface.
+
+`AcquisitionTelemetry` is updated from the serial read path with a handful of
+integer operations per read, so it stays enabled in production captures. Use
+``snapshot()`` to inspect it (or store it with ``io.save_signal``) and
+``start_logger()`` for a periodic one-line summary while a stream runs.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+
+from . import config
+
+# Read latency histogram: bucket k counts reads of [2^(k-1), 2^k) microseconds
+LATENCY_BUCKETS: int = 25  # Up to ~16 s
+
+
+class AcquisitionTelemetry:
+    """
+    Counters and timing statistics for one DAQ connection.
+
+    Counters are plain attributes updated without locks. A background reader
+    thread and the consumer may both touch them, so values read mid-stream
+    are approximate, which is fine for monitoring.
+
+    Attributes
+    ----------
+    fs : float
+        Sampling rate used to convert frame sizes into expected durations.
+    bytes_read : int
+        Payload and header bytes received.
+    reads : int
+        Sample payload reads attempted.
+    short_reads : int
+        Reads that timed out before a full payload arrived.
+    frames : int
+        Complete frames delivered.
+    samples : int
+        Samples in the delivered frames.
+    gap_time : float
+        Estimated seconds not covered by samples: the sum, over consecutive
+        frames, of arrival interval minus frame duration where positive.
+    max_gap : float
+        Largest single inter-frame gap in seconds.
+    latency_hist : np.ndarray
+        (LATENCY_BUCKETS,) log2 histogram of read latency in microseconds.
+    """
+
+    def __init__(self, fs: float = config.FS_DEFAULT) -> None:
+        self.fs = fs
+        self.latency_hist = np.zeros(LATENCY_BUCKETS, dtype=np.int64)
+        self._logger: Optional[threading.Thread] = None
+        self._logger_stop = threading.Event()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zeroes all counters and restarts the measurement window."""
+        self.started = time.perf_counter()
+        self.bytes_read: int = 0
+        self.reads: int = 0
+        self.short_reads: int = 0
+        self.frames: int = 0
+        self.samples: int = 0
+        self.gap_time: float = 0.0
+        self.max_gap: float = 0.0
+        self.latency_hist[:] = 0
+        self._last_frame: Optional[float] = None
+
+    def record_read(self, n_bytes: int, expected: int, started: float) -> float:
+        """
+        Records one sample payload read.
+
+        Parameters
+        ----------
+        n_bytes : int
+            Bytes actually read.
+        expected : int
+            Bytes in a full payload.
+        started : float
+            ``time.perf_counter()`` taken before the read.
+
+        Returns
+        -------
+        float
+            The current ``time.perf_counter()``, for chaining.
+        """
+        now = time.perf_counter()
+        self.reads += 1
+        self.bytes_read += n_bytes
+        latency_us = int((now - started) * 1e6)
+        self.latency_hist[min(latency_us.bit_length(), LATENCY_BUCKETS - 1)] += 1
+        if n_bytes < expected:
+            self.short_reads += 1
+        return now
+
+    def record_frame(self, n_samples: int, now: float) -> None:
+        """Records a delivered frame of `n_samples` arriving at `now`."""
+        if self._last_frame is not None:
+            gap = (now - self._last_frame) - n_samples / self.fs
+            if gap > 0.0:
+                self.gap_time += gap
+                if gap > self.max_gap:
+                    self.max_gap = gap
+        self._last_frame = now
+        self.frames += 1
+        self.samples += n_samples
+
+    def latency_percentile(self, q: float) -> float:
+        """
+        Estimates a read latency percentile from the histogram.
+
+        Parameters
+        ----------
+        q : float
+            Percentile in 0..100.
+
+        Returns
+        -------
+        float
+            Upper edge of the bucket holding the percentile, in milliseconds
+            (0.0 if no reads were recorded).
+        """
+        total = int(self.latency_hist.sum())
+        if total == 0:
+            return 0.0
+        bucket = int(np.searchsorted(np.cumsum(self.latency_hist), q / 100 * total))
+        return float(2**bucket) / 1e3
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns the current statistics as a JSON-serializable dict.
+
+        Rates are averaged over the window since construction or ``reset()``.
+        ``duty_cycle`` is captured samples / (elapsed time x fs).
+        """
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return {
+            "elapsed_s": elapsed,
+            "bytes": self.bytes_read,
+            "frames": self.frames,
+            "samples": self.samples,
+            "reads": self.reads,
+            "short_reads": self.short_reads,
+            "bytes_per_s": self.bytes_read / elapsed,
+            "frames_per_s": self.frames / elapsed,
+            "duty_cycle": self.samples / (elapsed * self.fs),
+            "gap_s": self.gap_time,
+            "max_gap_ms": self.max_gap * 1e3,
+            "latency_p50_ms": self.latency_percentile(50),
+            "latency_p99_ms": self.latency_percentile(99),
+            "latency_hist_log2_us": self.latency_hist.tolist(),
+        }
+
+    def start_logger(
+        self,
+        interval: float = 5.0,
+        sink: Callable[[str], None] = print,
+    ) -> None:
+        """
+        Starts a daemon thread that reports rates every `interval` seconds.
+
+        Each line covers only the preceding interval, so it reflects the
+        current throughput rather than the running average.
+
+        Parameters
+        ----------
+        interval : float, optional
+            Seconds between reports. Defaults to 5.0.
+        sink : Callable[[str], None], optional
+            Receives each formatted line. Defaults to print.
+        """
+        self.stop_logger()
+        self._logger_stop.clear()
+        self._logger = threading.Thread(
+            target=self._log_loop,
+            args=(interval, sink),
+            name="daq-telemetry",
+            daemon=True,
+        )
+        self._logger.start()
+
+    def stop_logger(self) -> None:
+        """Stops the periodic logger, if running."""
+        if self._logger is not None:
+            self._logger_stop.set()
+            self._logger.join()
+            self._logger = None
+
+    def _log_loop(self, interval: float, sink: Callable[[str], None]) -> None:
+        prev = (time.perf_counter(), self.bytes_read, self.frames, self.short_reads)
+        prev_gap = self.gap_time
+        while not self._logger_stop.wait(interval):
+            now = (time.perf_counter(), self.bytes_read, self.frames, self.short_reads)
+            dt = now[0] - prev[0]
+            sink(
+                f"📊 {(now[1] - prev[1]) / dt / 1024:.1f} kB/s, "
+                f"{(now[2] - prev[2]) / dt:.1f} frames/s, "
+                f"{now[3] - prev[3]} short reads, "
+                f"gaps {(self.gap_time - prev_gap) * 1e3:.1f} ms, "
+                f"p99 read {self.latency_percentile(99):.2f} ms"
+            )
+            prev, prev_gap = now, self.gap_time
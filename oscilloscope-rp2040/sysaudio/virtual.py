@@ -0,0 +1,572 @@
+"""
+Hardware-free stand-in for the RP2040 DAQ firmware.
+
+`VirtualDAQ` is a serial-compatible object that speaks the same command
+protocol as `firmware/main.py`, so `DAQInterface` (and everything built on
+it) can be exercised and benchmarked without a board attached. Samples come
+from a synthetic waveform or a recorded `.npz` file, and the USB link can be
+given latency, jitter, limited bandwidth and short reads.
+"""
+
+import json
+import os
+import random
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from . import audio, config, daq, io
+
+# Firmware buffer sizes (mirrors firmware/main.py)
+MAX_SAMPLES: int = 16384
+LIVE_SAMPLES: int = 1024
+MAX_DECIMATION: int = 64
+TRIGGER_HYSTERESIS: int = 256
+# Host-side CDC buffering before the firmware's writes start blocking
+HOST_BUFFER_BYTES: int = 65536
+
+
+def volts_to_adc(volts: np.ndarray) -> np.ndarray:
+    """
+    Quantizes voltages the way the RP2040 reports them via read_u16().
+
+    The 12-bit conversion result is left-justified and its top bits are
+    replicated into the low nibble, exactly as MicroPython does.
+
+    Parameters
+    ----------
+    volts : np.ndarray
+        Voltages in the range 0 to config.V_REF.
+
+    Returns
+    -------
+    np.ndarray
+        Array of uint16 raw ADC values.
+    """
+    code12 = np.clip(np.round(volts / config.V_REF * 4095), 0, 4095).astype(np.uint16)
+    return (code12 << 4) | (code12 >> 8)
+
+
+class WaveSource:
+    """
+    Synthetic signal source built on audio.generate_wave_block.
+
+    The waveform is centered on config.V_MID; `amp` is a fraction of the
+    half-rail swing. Phase is continuous across reads.
+    """
+
+    def __init__(
+        self,
+        shape: str = "sine",
+        freq: float = 440.0,
+        amp: float = 0.5,
+        fs: float = config.FS_DEFAULT,
+        noise_v: float = 0.0,
+    ) -> None:
+        self.shape = shape
+        self.freq = freq
+        self.amp = amp
+        self.fs = fs
+        self.noise_v = noise_v
+        self._pos: int = 0
+
+    def read(self, n: int) -> np.ndarray:
+        """Returns the next `n` samples as raw ADC codes."""
+        t = (self._pos + np.arange(n, dtype=np.float64)) / self.fs
+        self._pos += n
+        x = audio.generate_wave_block(self.shape, t, self.freq, self.amp)
+        volts = config.V_MID + x * (config.V_REF / 2)
+        if self.noise_v > 0:
+            volts = volts + np.random.normal(0.0, self.noise_v, n)
+        return volts_to_adc(volts)
+
+    def skip(self, n: int) -> None:
+        """Advances the source clock without producing samples."""
+        self._pos += n
+
+
+class ReplaySource:
+    """
+    Loops a recorded capture as a signal source.
+    """
+
+    def __init__(self, filepath: str) -> None:
+        signal, self.fs = io.load_signal(filepath, volts=True)
+        self.data = volts_to_adc(np.ravel(signal))
+        self._pos: int = 0
+
+    def read(self, n: int) -> np.ndarray:
+        """Returns the next `n` samples, wrapping at the end of the file."""
+        idx = (self._pos + np.arange(n)) % self.data.size
+        self._pos += n
+        return self.data[idx]
+
+    def skip(self, n: int) -> None:
+        """Advances the playback position without producing samples."""
+        self._pos += n
+
+
+class VirtualDAQ:
+    """
+    Serial-compatible emulation of the DAQ firmware.
+
+    Commands written by the host are processed in order on a worker thread,
+    as on the MCU. In realtime mode the worker sleeps for the capture time
+    (n / fs) and the transmit time (bytes / bandwidth), and every response
+    is delivered after a one-way `latency` plus uniform `jitter`.
+
+    Parameters
+    ----------
+    source : Optional[Union[WaveSource, ReplaySource]]
+        Sample source. Defaults to a 440 Hz sine at half amplitude.
+    fs : float, optional
+        Emulated ADC sampling rate in Hz.
+    latency : float, optional
+        One-way USB latency in seconds.
+    jitter : float, optional
+        Maximum extra random delivery delay in seconds.
+    bandwidth : float, optional
+        Device-to-host throughput in bytes/s.
+    short_read_prob : float, optional
+        Probability that a read returns only part of the available data.
+    realtime : bool, optional
+        If False, all timing is skipped and the device runs as fast as
+        possible (useful for tests).
+    timeout : float, optional
+        Read timeout in seconds, like serial.Serial.timeout.
+    seed : Optional[int]
+        Seed for the jitter / short-read random generator.
+    """
+
+    def __init__(
+        self,
+        source: Optional[Union[WaveSource, ReplaySource]] = None,
+        fs: float = config.FS_DEFAULT,
+        latency: float = 0.001,
+        jitter: float = 0.0,
+        bandwidth: float = 1.0e6,
+        short_read_prob: float = 0.0,
+        realtime: bool = True,
+        timeout: float = config.TIMEOUT,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.source = source or WaveSource(fs=fs)
+        self.fs = fs
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.short_read_prob = short_read_prob
+        self.realtime = realtime
+        self.timeout = timeout
+        self.port = "virtual"
+        self.is_open = True
+
+        self._rng = random.Random(seed)
+        self._cond = threading.Condition()
+        self._rx: Deque[Tuple[float, int]] = deque()  # (arrival time, byte)
+        self._pending: Deque[Tuple[float, bytes]] = deque()  # (delivery, data)
+        self._tx = bytearray()  # delivered, waiting for the host
+        self._last_delivery: float = 0.0
+        self._sample_pos: int = 0
+        self.packing: int = daq.PACKING_RAW16
+        self.rate_factor: int = 1
+        self.rate_mode: int = daq.RATE_AVERAGE
+        self.trigger: Dict[str, int] = {
+            "slope": 0,
+            "level": config.ADC_MID_VAL,
+            "holdoff": 0,
+            "timeout": 100000,
+        }
+        self.stamps: bool = False
+        self._handlers: Dict[str, Callable[[], None]] = {
+            "s": lambda: self._send_burst(MAX_SAMPLES, stamped=True),
+            "v": self._send_video,
+            "c": self._run_continuous,
+            "b": self._run_sized_burst,
+            "?": self._send_capabilities,
+            "i": lambda: self._queue(b"SYSAUDIO-DAQ virtual\n"),
+            "m": self._set_packing,
+            "r": self._set_rate,
+            "t": self._set_trigger,
+            "k": self._set_stamps,
+        }
+
+        self._worker = threading.Thread(
+            target=self._run, name="virtual-daq", daemon=True
+        )
+        self._worker.start()
+
+    # --- serial.Serial-compatible surface ---
+    def write(self, data: bytes) -> int:
+        """Queues command bytes; they reach the device after `latency`."""
+        arrival = time.perf_counter() + self._one_way_delay()
+        with self._cond:
+            self._rx.extend((arrival, b) for b in bytes(data))
+            self._cond.notify_all()
+        return len(data)
+
+    def read(self, size: int = 1) -> bytes:
+        """
+        Returns up to `size` bytes, waiting at most `timeout` seconds.
+        """
+        deadline = time.perf_counter() + (self.timeout or 0.0)
+        with self._cond:
+            while True:
+                self._deliver_due()
+                if len(self._tx) >= size or not self.is_open:
+                    break
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(min(remaining, self._next_delivery_wait()))
+
+            n = min(size, len(self._tx))
+            if n > 1 and self._rng.random() < self.short_read_prob:
+                n = self._rng.randint(1, n - 1)
+            data = bytes(self._tx[:n])
+            del self._tx[:n]
+            return data
+
+    def readline(self) -> bytes:
+        """Reads up to and including a newline, or until `timeout`."""
+        line = bytearray()
+        while not line.endswith(b"\n"):
+            char = self.read(1)
+            if not char:
+                break
+            line += char
+        return bytes(line)
+
+    def readinto(self, buf: memoryview) -> int:
+        """Reads directly into `buf`; returns the number of bytes read."""
+        data = self.read(len(buf))
+        buf[: len(data)] = data
+        return len(data)
+
+    @property
+    def in_waiting(self) -> int:
+        """Number of bytes delivered and not yet read."""
+        with self._cond:
+            self._deliver_due()
+            return len(self._tx)
+
+    def reset_input_buffer(self) -> None:
+        """Discards delivered bytes (data still in flight is kept)."""
+        with self._cond:
+            self._deliver_due()
+            self._tx.clear()
+
+    def close(self) -> None:
+        """Stops the emulated device."""
+        with self._cond:
+            self.is_open = False
+            self._cond.notify_all()
+        self._worker.join(timeout=1.0)
+
+    # --- Convenience ---
+    def interface(self) -> daq.DAQInterface:
+        """Returns a DAQInterface bound to this virtual device."""
+        return daq.DAQInterface(port=self.port, transport=self)
+
+    def open_pty(self) -> str:
+        """
+        Exposes the device on a pseudo-terminal.
+
+        Real `serial.Serial` clients (including `DAQInterface()` with
+        config.SERIAL_PORT pointed at the returned path) can then talk to
+        the emulator unmodified. POSIX only.
+
+        Returns
+        -------
+        str
+            Path of the slave side of the pty (e.g. '/dev/pts/5').
+        """
+        import tty
+
+        master, slave = os.openpty()
+        tty.setraw(slave)
+
+        def host_to_device() -> None:
+            while self.is_open:
+                try:
+                    data = os.read(master, 4096)
+                except OSError:
+                    break
+                if data:
+                    self.write(data)
+
+        def device_to_host() -> None:
+            while self.is_open:
+                data = self._read_available(0.05)
+                if data:
+                    os.write(master, data)
+
+        for target in (host_to_device, device_to_host):
+            threading.Thread(target=target, daemon=True).start()
+        return os.ttyname(slave)
+
+    # --- Device side ---
+    def _run(self) -> None:
+        while self.is_open:
+            cmd = self._next_command_byte(block=True)
+            if cmd is None:
+                continue
+            handler = self._handlers.get(cmd)
+            if handler is not None:
+                handler()
+
+    def _next_command_byte(self, block: bool) -> Optional[str]:
+        """Pops the next command byte once it has 'arrived' at the MCU."""
+        with self._cond:
+            while self.is_open:
+                now = time.perf_counter()
+                if self._rx and self._rx[0][0] <= now:
+                    return chr(self._rx.popleft()[1])
+                if not block:
+                    return None
+                wait = self._rx[0][0] - now if self._rx else 0.1
+                self._cond.wait(wait)
+        return None
+
+    def _next_command_line(self) -> str:
+        """Reads an argument line (up to '\\n') following a command byte."""
+        chars = []
+        while self.is_open:
+            char = self._next_command_byte(block=True)
+            if char is None or char == "\n":
+                break
+            chars.append(char)
+        return "".join(chars)
+
+    def _capture(self, n: int, step: Optional[int] = None) -> np.ndarray:
+        """
+        Samples `n` values, taking n * k / fs.
+
+        With `step` given, every step-th conversion is kept (as 'b' with an
+        explicit decimation); otherwise the 'r' rate setting applies.
+        """
+        average = step is None and self.rate_mode == daq.RATE_AVERAGE
+        k = step or self.rate_factor
+        return self._reduce(self._convert(n * k), n, k, average)
+
+    def _convert(self, n: int) -> np.ndarray:
+        """Performs `n` conversions at the native rate, taking n / fs."""
+        self._sleep(n / self.fs)
+        self._sample_pos += n
+        return self.source.read(n)
+
+    @staticmethod
+    def _reduce(conversions: np.ndarray, n: int, k: int, average: bool) -> np.ndarray:
+        """Keeps every k-th of n * k conversions, or averages groups of k."""
+        if k == 1:
+            return conversions
+        if average:
+            # Integer mean, like the firmware's accumulator
+            sums = conversions.reshape(n, k).sum(axis=1, dtype=np.uint32)
+            return (sums // k).astype(np.uint16)
+        return conversions[::k]
+
+    def _run_sized_burst(self) -> None:
+        """Emulates 'b<samples>[,<decimation>]'; bad arguments get no reply."""
+        try:
+            args = [int(f) for f in self._next_command_line().split(",") if f]
+        except ValueError:
+            return
+        if not args or len(args) > 2:
+            return
+        size = args[0]
+        step = args[1] if len(args) == 2 else None
+        if 0 < size <= MAX_SAMPLES and 0 < (step or 1) <= MAX_DECIMATION:
+            self._send_burst(size, step, stamped=True)
+
+    def _send_capabilities(self) -> None:
+        caps = {
+            "fw": "virtual",
+            "max_samples": MAX_SAMPLES,
+            "live_samples": LIVE_SAMPLES,
+            "max_decimation": MAX_DECIMATION,
+            "commands": "".join(self._handlers),
+            "packings": [daq.PACKING_RAW16, daq.PACKING_12BIT, daq.PACKING_DELTA],
+        }
+        self._queue((json.dumps(caps) + "\n").encode())
+
+    def _set_packing(self) -> None:
+        """Emulates 'm<mode>'; unknown modes are ignored."""
+        line = self._next_command_line().strip()
+        if line in ("0", "1", "2"):
+            self.packing = int(line)
+
+    def _encode(self, samples: np.ndarray) -> bytes:
+        """Serializes samples in the current packing mode."""
+        if self.packing == daq.PACKING_12BIT:
+            return daq.pack12(samples)
+        if self.packing == daq.PACKING_DELTA:
+            return daq.pack_delta(samples)
+        return samples.astype("<u2").tobytes()
+
+    def _set_rate(self) -> None:
+        """Emulates 'r<factor>[,<mode>]'; bad arguments get no reply."""
+        try:
+            args = [int(f) for f in self._next_command_line().split(",") if f]
+        except ValueError:
+            return
+        if not args or len(args) > 2:
+            return
+        factor = args[0]
+        mode = args[1] if len(args) == 2 else daq.RATE_AVERAGE
+        if not 0 < factor <= MAX_DECIMATION:
+            return
+        if mode not in (daq.RATE_DECIMATE, daq.RATE_AVERAGE):
+            return
+        self.rate_factor = factor
+        self.rate_mode = mode
+        self._queue((json.dumps({"factor": factor, "mode": mode}) + "\n").encode())
+
+    def _set_trigger(self) -> None:
+        """Emulates 't<slope>[,<level>,<holdoff_us>,<timeout_us>]'."""
+        try:
+            args = [int(f) for f in self._next_command_line().split(",") if f]
+        except ValueError:
+            return
+        if not args or len(args) not in (1, 4) or args[0] not in (0, 1, 2):
+            return
+        if len(args) == 4:
+            level, holdoff, timeout = args[1:]
+            if not (0 <= level <= 65535 and holdoff >= 0 and timeout > 0):
+                return
+            self.trigger.update(level=level, holdoff=holdoff, timeout=timeout)
+        self.trigger["slope"] = args[0]
+        self._queue((json.dumps(self.trigger) + "\n").encode())
+
+    def _set_stamps(self) -> None:
+        """Emulates 'k<0|1>'; bad arguments get no reply."""
+        line = self._next_command_line().strip()
+        if line in ("0", "1"):
+            self.stamps = line == "1"
+            self._queue((json.dumps({"stamps": int(line)}) + "\n").encode())
+
+    def _ticks(self) -> int:
+        """Emulated ticks_us(): the ADC clock is the MCU time base."""
+        return int(self._sample_pos / self.fs * 1e6) % config.TICKS_PERIOD
+
+    def _send_video(self) -> None:
+        """Emulates 'v', starting the frame on an edge if the trigger is set."""
+        slope = self.trigger["slope"]
+        if slope == 0:
+            self._send_burst(LIVE_SAMPLES)
+            return
+
+        # Search window: the timeout at the native rate, then free-run.
+        # The frame starts at the crossing conversion and follows the 'r' rate.
+        k = self.rate_factor
+        span = LIVE_SAMPLES * k
+        search = int(self.trigger["timeout"] * 1e-6 * self.fs)
+        block = self._convert(search + span).astype(np.int32)
+        level = self.trigger["level"]
+        if slope == 1:
+            armed = block < level - TRIGGER_HYSTERESIS
+            fired = block >= level
+        else:
+            armed = block > level + TRIGGER_HYSTERESIS
+            fired = block <= level
+
+        start = search
+        arm_idx = np.flatnonzero(armed[:search])
+        if arm_idx.size:
+            hits = np.flatnonzero(fired[arm_idx[0] : search]) + arm_idx[0]
+            if hits.size:
+                start = int(hits[0])
+        average = self.rate_mode == daq.RATE_AVERAGE
+        frame = self._reduce(block[start : start + span], LIVE_SAMPLES, k, average)
+        payload = self._encode(frame.astype(np.uint16))
+        self._sleep(len(payload) / self.bandwidth)
+        self._queue(payload)
+
+    def _send_burst(
+        self, n: int, step: Optional[int] = None, stamped: bool = False
+    ) -> None:
+        t0 = self._ticks()
+        payload = self._encode(self._capture(n, step))
+        if stamped and self.stamps:
+            payload += daq.STAMP_TRAILER.pack(t0, self._ticks())
+        # The firmware blocks in stdout.write() for the transfer
+        self._sleep(len(payload) / self.bandwidth)
+        self._queue(payload)
+
+    def _run_continuous(self) -> None:
+        """Emulates the dual-core 'c' mode until 'x' is received."""
+        header = struct.Struct("<HHIII")
+        frame_time = LIVE_SAMPLES * self.rate_factor / self.fs
+        tx_busy_until = time.perf_counter()
+        seq = 0
+
+        while self.is_open:
+            cmd = self._next_command_byte(block=False)
+            if cmd == "x":
+                return
+
+            ticks = self._ticks()
+            samples = self._capture(LIVE_SAMPLES)
+            ticks_end = self._ticks()
+            now = time.perf_counter()
+
+            # Both ping-pong buffers still queued for transmission (link too
+            # slow, or host not reading) -> the frame is dropped
+            link_busy = self.realtime and tx_busy_until > now + frame_time
+            if link_busy or self._backlog() > HOST_BUFFER_BYTES:
+                seq += 1
+                if not self.realtime:
+                    time.sleep(0.0005)
+                continue
+
+            frame = header.pack(
+                daq.FRAME_MAGIC_STAMPED, LIVE_SAMPLES, seq, ticks, ticks_end
+            ) + self._encode(samples)
+            tx_busy_until = max(tx_busy_until, now) + len(frame) / self.bandwidth
+            self._queue(frame)
+            seq += 1
+
+    def _queue(self, data: bytes) -> None:
+        """Schedules `data` for delivery to the host, preserving order."""
+        with self._cond:
+            deliver_at = time.perf_counter() + self._one_way_delay()
+            self._last_delivery = max(self._last_delivery, deliver_at)
+            self._pending.append((self._last_delivery, data))
+            self._cond.notify_all()
+
+    def _deliver_due(self) -> None:
+        now = time.perf_counter()
+        while self._pending and self._pending[0][0] <= now:
+            self._tx += self._pending.popleft()[1]
+
+    def _next_delivery_wait(self) -> float:
+        if self._pending:
+            return max(0.0, self._pending[0][0] - time.perf_counter())
+        return 0.1
+
+    def _backlog(self) -> int:
+        with self._cond:
+            return len(self._tx) + sum(len(d) for _, d in self._pending)
+
+    def _read_available(self, timeout: float) -> bytes:
+        with self._cond:
+            self._deliver_due()
+            if not self._tx:
+                self._cond.wait(min(timeout, self._next_delivery_wait()))
+                self._deliver_due()
+            data = bytes(self._tx)
+            self._tx.clear()
+            return data
+
+    def _one_way_delay(self) -> float:
+        if not self.realtime:
+            return 0.0
+        return self.latency + self._rng.uniform(0.0, self.jitter)
+
+    def _sleep(self, seconds: float) -> None:
+        if self.realtime and seconds > 0:
+            time.sleep(seconds)
@@ -8,7 +8,7 @@ from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
 from matplotlib.text import Text
 
-from . import config, dsp
+from . import config, daq, dsp
 
 
 def init_scope_plot(
@@ -53,11 +53,37 @@ def init_scope_plot(
     return fig, ax, line, text
 
 
+def arm_scope_trigger(device: daq.DAQInterface, level: float = config.V_MID) -> bool:
+    """
+    Enables the firmware edge trigger for live 'v' frames if available.
+
+    Parameters
+    ----------
+    device : daq.DAQInterface
+        A connected device.
+    level : float, optional
+        Trigger level in volts. Defaults to config.V_MID.
+
+    Returns
+    -------
+    bool
+        True if the device triggers on its own; False means the caller
+        should fall back to dsp.software_trigger (legacy firmware).
+    """
+    try:
+        device.set_trigger(level)
+        return True
+    except IOError:
+        print("⚠️ Firmware has no edge trigger; using software trigger.")
+        return False
+
+
 def run_live_scope(
     stream_generator: Iterable[np.ndarray],
     title: str = "Live Scope",
     stop_condition: Optional[Callable[[], bool]] = None,
     on_launch: Optional[Callable[[], None]] = None,
+    software_trigger: bool = True,
 ) -> None:
     """
     Runs a reusable, high-performance oscilloscope loop using blitting.
@@ -73,6 +99,9 @@ def run_live_scope(
     on_launch : Optional[Callable[[], None]]
         Callback executed once the window is rendered and ready.
         Useful for syncing audio playback start.
+    software_trigger : bool, optional
+        Align each frame with dsp.software_trigger. Disable when the frames
+        are already edge-triggered on the device (see arm_scope_trigger).
     """
     fig, ax, line, fps_text = init_scope_plot()
     ax.set_title(title)
@@ -107,7 +136,10 @@ def run_live_scope(
 
             # DSP Processing & Stabilization
             voltages = dsp.raw_to_volts(raw_data)
-            stable_wave = dsp.software_trigger(voltages)
+            if software_trigger:
+                stable_wave = dsp.software_trigger(voltages)
+            else:
+                stable_wave = voltages
 
             # Blitting Update (Redraw only the line, not the grid)
             cast(Any, fig.canvas).restore_region(background)
@@ -139,6 +171,8 @@ def run_playback_scope(
     fs: float,
     samples_per_frame: int = config.LIVE_SAMPLES,
     title: str = "Playback",
+    scale: Optional[float] = None,
+    offset: float = 0.0,
 ) -> None:
     """
     Simulates a live scope visualization from a recorded data array.
@@ -146,13 +180,18 @@ def run_playback_scope(
     Parameters
     ----------
     data : np.ndarray
-        Full recording array (voltages).
+        Full recording as stored (see io.load_signal). May be a lazy array
+        (e.g. a memory-mapped raw capture); only the displayed window is
+        read and converted to volts.
     fs : float
         Sampling rate in Hz.
     samples_per_frame : int
         Number of samples to display per frame.
     title : str
         Window title.
+    scale, offset : float
+        Stored-to-volts conversion from io.load_scale(). `scale` defaults to
+        the ADC's volts per code; pass 1.0 for data already in volts.
     """
     total_samples = data.size
     duration_sec = total_samples / fs
@@ -190,7 +229,7 @@ def run_playback_scope(
             # Extract slice
             start_idx = current_frame_idx * samples_per_frame
             end_idx = start_idx + samples_per_frame
-            voltages = data[start_idx:end_idx]
+            voltages = dsp.raw_to_volts(data[start_idx:end_idx], scale, offset)
 
             # Triggering
             stabilized = dsp.software_trigger(voltages)
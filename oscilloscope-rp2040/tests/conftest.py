@@ -0,0 +1,10 @@
+from pathlib import Path
+
+import pytest
+from sysaudio import config
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keeps the derived-results cache out of data/ during tests."""
+    monkeypatch.setattr(config, "CACHE_DIR", str(tmp_path / "cache"))
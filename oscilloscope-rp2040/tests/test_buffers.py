@@ -0,0 +1,132 @@
+import time
+from typing import List
+
+import numpy as np
+import pytest
+from sysaudio import buffers, config, virtual
+
+
+def test_ring_buffer_counts_overruns_and_skips() -> None:
+    """
+    Checks FIFO order, latest-only reads, and that a consumer lapped by the
+    writer resumes at the oldest intact slot and counts the lost frames.
+    """
+    with pytest.raises(ValueError):
+        buffers.FrameRingBuffer(1, 2)
+
+    ring = buffers.FrameRingBuffer(4, 2)
+
+    def publish(value: int) -> None:
+        ring.writable_slot()[:] = value
+        ring.commit()
+
+    for i in range(3):
+        publish(i)
+    first = ring.pop()
+    assert first is not None and first[0] == 0
+    newest = ring.latest()
+    assert newest is not None and newest[0] == 2
+    assert ring.skipped == 1
+    assert ring.pop() is None
+
+    for i in range(3, 10):
+        publish(i)
+    out = np.empty(2, dtype="<u2")
+    seen = []
+    while (frame := ring.pop(out)) is not None:
+        assert frame is out
+        seen.append(int(frame[0]))
+    # Only n_frames - 1 slots are guaranteed intact once the writer laps
+    assert seen == [7, 8, 9]
+    assert ring.overruns == 4
+    assert ring.stats()["pending"] == 0
+
+
+def test_background_reader_fills_ring() -> None:
+    """
+    Runs the reader thread against the emulator with short reads and checks
+    that frames arrive complete, that synchronous commands are refused while
+    it runs, and that the link is usable again once it stops.
+    """
+    device = virtual.VirtualDAQ(realtime=False, short_read_prob=0.3, seed=0)
+    with device.interface() as dev:
+        reader = dev.start_reader(ring_frames=4)
+        with pytest.raises(RuntimeError):
+            dev.capture_burst()
+        frames = reader.frames()
+        assert all(next(frames).size == config.LIVE_SAMPLES for _ in range(20))
+        frames.close()
+        dev.stop_reader()
+        assert reader.error is None and not reader.is_alive
+        assert reader.ring.write_count >= 20
+
+        assert dev.capture_burst().size == config.BURST_SAMPLES
+    device.close()
+
+
+def test_background_reader_drains_a_short_frame() -> None:
+    """
+    Delays the tail of the first frame past the read timeout and checks
+    that the reader discards it instead of reading it as the start of the
+    next frame, so every frame after the short one is intact.
+    """
+    device = virtual.VirtualDAQ(realtime=False, timeout=0.1, seed=0)
+    frame_bytes = 2 * config.LIVE_SAMPLES
+    sent: List[bytes] = []
+    queue = device._queue
+
+    def split_first_frame(data: bytes) -> None:
+        if len(data) != frame_bytes:
+            queue(data)
+            return
+        sent.append(data)
+        if len(sent) > 1:
+            queue(data)
+            return
+        # The read gives up after two timeouts without data; the tail
+        # arrives within the third
+        queue(data[:100])
+        time.sleep(0.25)
+        queue(data[100:])
+
+    device._queue = split_first_frame  # type: ignore[method-assign]
+    with device.interface() as dev:
+        reader = dev.start_reader(ring_frames=64)
+        frames = reader.frames()
+        received = [next(frames).tobytes() for _ in range(10)]
+        frames.close()
+        dev.stop_reader()
+        assert reader.short_reads == 1
+        assert all(frame in sent[1:] for frame in received)
+    device.close()
+
+
+def test_pooled_stream_runs_allocation_free() -> None:
+    """
+    Checks that burst captures fill a caller-owned array in place, that
+    unsuitable buffers are rejected, and that a pooled stream whose consumer
+    releases every frame stops allocating once the pool is warm.
+    """
+    device = virtual.VirtualDAQ(realtime=False, short_read_prob=0.3, seed=0)
+    with device.interface() as dev:
+        out = np.zeros(512, dtype="<u2")
+        assert dev.capture_burst_into(out) is out and out.any()
+        with pytest.raises(ValueError):
+            dev.capture_burst_into(np.zeros(512, dtype=np.int32))
+        with pytest.raises(ValueError):
+            dev.capture_burst_into(np.zeros(1024, dtype="<u2")[::2])
+
+        pool = buffers.BufferPool(config.LIVE_SAMPLES, capacity=2)
+        stream = dev.pooled_stream(pool, depth=2)
+        for _ in range(20):
+            frame = next(stream)
+            assert frame.size == config.LIVE_SAMPLES
+            pool.release(frame)
+        stream.close()
+    device.close()
+
+    stats = pool.stats()
+    assert stats["allocations"] == 0
+    assert stats["in_use"] == 0 and stats["acquires"] == 20
+    with pytest.raises(ValueError):
+        pool.release(np.empty(config.LIVE_SAMPLES, dtype="<u2"))
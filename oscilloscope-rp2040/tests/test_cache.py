@@ -0,0 +1,92 @@
+import importlib
+import sys
+from pathlib import Path
+from typing import Callable, cast
+
+import numpy as np
+import pytest
+from sysaudio import cache, config
+
+
+def test_results_are_reused_by_content(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Equal array contents hit the cache, changed data or parameters miss,
+    small inputs bypass it, and LRU eviction keeps it under the size cap.
+    """
+    monkeypatch.setattr(config, "CACHE_ENABLED", True)
+    calls = []
+
+    @cache.cached(min_samples=100)
+    def spectrum(signal: np.ndarray, fs: float, scale: float = 1.0) -> np.ndarray:
+        calls.append(fs)
+        return np.abs(np.fft.rfft(signal)) * scale
+
+    signal = np.sin(np.arange(4096) / 10.0)
+    first = spectrum(signal, 1000.0)
+    assert np.array_equal(spectrum(signal.copy(), 1000.0, scale=1.0), first)
+    assert len(calls) == 1
+
+    spectrum(signal, 2000.0)
+    spectrum(signal + 1e-9, 1000.0)
+    spectrum(signal[:50], 1000.0)
+    spectrum(signal[:50], 1000.0)
+    assert len(calls) == 5
+    assert cache.stats()["entries"] == 3
+
+    # Room for two entries (~16 kB each): the least recently used go first
+    monkeypatch.setattr(config, "CACHE_MAX_BYTES", 40_000)
+    for fs in (3000.0, 4000.0, 5000.0):
+        spectrum(signal, fs)
+    assert cache.stats()["entries"] == 2
+    spectrum(signal, 5000.0)
+    assert len(calls) == 8
+    assert cache.clear() == 2
+
+
+MODULE_SOURCE = """
+import numpy as np
+from sysaudio import cache
+
+def helper(x):
+    return x * {gain}
+
+@cache.cached(min_samples=1)
+def analyse(x, offset={offset}):
+    return helper(x) + offset + {const}
+"""
+
+
+def test_key_tracks_code_defaults_and_callees(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Editing a constant, a default or a helper the function calls must miss
+    the cache, and nothing is cached unless the cache is enabled.
+    """
+    x = np.arange(16.0)
+    module = tmp_path / "analysis_mod.py"
+    monkeypatch.syspath_prepend(str(tmp_path))
+    # Rewrites within one second would otherwise reuse a stale .pyc
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+
+    def load(gain: int, offset: int, const: int) -> Callable[..., np.ndarray]:
+        module.write_text(MODULE_SOURCE.format(gain=gain, offset=offset, const=const))
+        sys.modules.pop("analysis_mod", None)
+        importlib.invalidate_caches()
+        analyse = importlib.import_module("analysis_mod").analyse
+        return cast(Callable[..., np.ndarray], analyse)
+
+    assert load(2, 0, 0)(x)[1] == 2.0
+    assert cache.stats()["entries"] == 0  # Opt-in
+
+    monkeypatch.setattr(config, "CACHE_ENABLED", True)
+    for gain, offset, const, expected in (
+        (2, 0, 0, 2.0),
+        (2, 0, 0, 2.0),  # Unchanged: hit
+        (2, 0, 1, 3.0),  # Constant
+        (2, 5, 1, 8.0),  # Default
+        (30, 5, 1, 36.0),  # Helper
+    ):
+        assert load(gain, offset, const)(x)[1] == expected
+    assert cache.stats()["hits"] >= 1
+    assert cache.stats()["entries"] == 4
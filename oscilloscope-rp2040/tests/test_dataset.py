@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import numpy as np
+from sysaudio import dataset, io
+
+
+def test_frames_carry_provenance_and_errors_are_collected(tmp_path: Path) -> None:
+    """
+    Frames overlap by `size - hop`, point back to their file and offset, and
+    a missing file is reported in `errors` instead of ending the batch.
+    """
+    a = io.save_signal(np.arange(100, dtype=np.uint16), 1000.0, str(tmp_path), "a")
+    b = io.save_raw(np.arange(50, dtype=np.uint16), 2000.0, str(tmp_path), "b")
+    missing = str(tmp_path / "gone.npz")
+    ds = dataset.Dataset([a, missing, b], workers=2)
+
+    frames = list(ds.frames(size=40, hop=20))
+    assert [(f.path, f.offset) for f in frames] == [
+        (a, 0),
+        (a, 20),
+        (a, 40),
+        (a, 60),
+        (b, 0),
+    ]
+    assert np.array_equal(frames[1].samples, np.arange(20, 60))
+    assert frames[-1].fs == 2000.0
+    assert isinstance(ds.errors[missing], FileNotFoundError)
+
+    loaded = ds.load()
+    assert list(loaded) == [a, b]
+
+    steady = dataset.Dataset.from_catalog(
+        str(tmp_path), "fs == '2000'", db_path=str(tmp_path / "cat.sqlite")
+    )
+    assert steady.paths == [b]
@@ -0,0 +1,163 @@
+import os
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from sysaudio import catalog, dsp, io
+
+
+def test_raw_capture_is_memory_mapped(tmp_path: Path) -> None:
+    """
+    Converts an .npz capture to the raw format and checks that load_signal
+    maps it lazily with identical samples, fs and metadata.
+    """
+    signal = np.arange(10000, dtype=np.uint16)
+    npz = io.save_signal(signal, 48000.0, str(tmp_path), prefix="conv", notes="hi")
+
+    raw = io.convert_npz_to_raw(npz)
+    mapped, fs = io.load_signal(raw, volts=False)
+    assert isinstance(mapped, np.memmap)
+    assert fs == 48000.0
+    assert mapped.dtype == np.uint16
+    assert np.array_equal(mapped[5000:5010], signal[5000:5010])
+    assert io.load_metadata(raw)["notes"] == "hi"
+
+
+def test_volts_are_stored_as_codes(tmp_path: Path) -> None:
+    """
+    Volts passed to save_signal/save_raw are stored as uint16 codes and
+    come back exactly from load_signal(volts=True). Legacy volt archives
+    load as codes with volts=False, and out-of-range integers are rejected.
+    """
+    codes = np.arange(0, 65536, 7, dtype=np.uint16)
+    volts = dsp.raw_to_volts(codes)
+
+    for path in (
+        io.save_signal(volts, 1000.0, str(tmp_path), prefix="npz"),
+        io.save_raw(volts, 1000.0, str(tmp_path), prefix="raw"),
+    ):
+        stored, _ = io.load_signal(path, volts=False)
+        assert stored.dtype == np.uint16
+        assert np.array_equal(stored, codes)
+        assert np.allclose(io.load_signal(path, volts=True)[0], volts)
+        as_f32, _ = io.load_signal(path, volts=True, dtype=np.dtype(np.float32))
+        assert as_f32.dtype == np.float32
+
+    # Legacy archives holding volts load in the requested unit too
+    legacy = tmp_path / "legacy.npz"
+    np.savez(legacy, signal=volts, fs=1000.0)
+    assert np.array_equal(io.load_signal(legacy, volts=False)[0], codes)
+    assert np.array_equal(io.load_signal(legacy, volts=True)[0], volts)
+    # Without `volts` the stored samples come back, as before
+    stored, _ = io.load_signal(legacy)
+    assert np.array_equal(stored, volts)
+    assert io.load_scale(legacy, stored) == (1.0, 0.0)
+    assert io.load_signal(path)[0].dtype == np.uint16
+
+    # Integers are codes: anything outside uint16 is an error, not a wrap
+    for bad in (np.array([-1, 0]), np.array([0, 65536])):
+        with pytest.raises(ValueError, match="ADC codes"):
+            io.save_signal(bad, 1000.0, str(tmp_path), prefix="bad")
+
+
+def test_catalog_only_opens_changed_files(tmp_path: Path) -> None:
+    """
+    The catalog returns the same rows as io.scan_metadata and reopens only
+    files that were added or changed since the last query.
+    """
+    data = tmp_path / "data"
+    db = str(tmp_path / "catalog.sqlite")
+    io.save_signal(np.zeros(16), 1000.0, str(data), prefix="a", notes="x")
+    io.save_raw(np.zeros(16, np.uint16), 2000.0, str(data / "sub"), prefix="b")
+
+    with catalog.MetadataCatalog(db) as cat:
+        df = cat.query(str(data))
+        assert cat.opened == 2
+        pd.testing.assert_frame_equal(df, io.scan_metadata(str(data)))
+
+        cat.query(str(data))
+        assert cat.opened == 0
+
+        io.save_signal(np.zeros(16), 3000.0, str(data), prefix="c")
+        os.remove(io.save_raw(np.zeros(4), 1.0, str(data), prefix="d"))
+        df = cat.query(str(data))
+        assert cat.opened == 1
+        assert sorted(df["fs"]) == ["1000", "2000", "3000"]
+
+
+def test_chunked_container_random_access(tmp_path: Path) -> None:
+    """
+    A chunked container round-trips through load_signal, and read_range
+    returns exact slices across block boundaries and at the edges.
+    """
+    rng = np.random.default_rng(0)
+    codes = (32768 + np.cumsum(rng.integers(-40, 41, 10000))).astype(np.uint16)
+    path = io.save_chunked(codes, 5000.0, str(tmp_path), block_samples=1024, run=3)
+
+    loaded, fs = io.load_signal(path, volts=False)
+    assert fs == 5000.0
+    assert np.array_equal(loaded, codes)
+    assert io.load_metadata(path)["run"] == 3
+
+    with io.ChunkedSignal(path) as container:
+        for start, stop in ((0, 10), (1000, 3100), (9990, 20000), (5, 5)):
+            assert np.array_equal(container.read_range(start, stop), codes[start:stop])
+
+    npz = io.save_signal(codes, 5000.0, str(tmp_path), prefix="src")
+    assert np.array_equal(
+        io.load_signal(io.convert_to_chunked(npz), volts=False)[0], codes
+    )
+
+
+def test_background_save(tmp_path: Path) -> None:
+    """
+    save_signal_async returns before the file is written, and load_signal
+    waits for it; compresslevel 0 stores the archive uncompressed.
+    """
+    codes = np.tile(np.arange(4096, dtype=np.uint16), 8)
+    pending = io.save_signal_async(
+        codes, 1000.0, str(tmp_path), prefix="bg", compresslevel=0, notes="later"
+    )
+    loaded, fs = io.load_signal(pending.path, volts=False)
+    assert np.array_equal(loaded, codes)
+    assert io.load_metadata(pending.path)["notes"] == "later"
+    assert pending.result() == pending.path
+
+    packed = io.save_signal(codes, 1000.0, str(tmp_path), prefix="fg")
+    assert os.path.getsize(packed) < os.path.getsize(pending.path)
+    io.flush_saves()
+
+
+def test_rapid_saves_get_unique_paths(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Saves with the same prefix at the same instant (clock frozen) must not
+    share a file, in every format and from the background writer, and a
+    failed save must release its reserved name.
+    """
+
+    class FrozenClock(datetime):
+        @classmethod
+        def now(cls, tz: object = None) -> "FrozenClock":
+            return cls(2026, 1, 1, 12, 0, 0)
+
+    monkeypatch.setattr(io, "datetime", FrozenClock)
+    directory = str(tmp_path)
+    frames = [np.full(64, i, dtype=np.uint16) for i in range(3)]
+
+    pending = [io.save_signal_async(f, 1000.0, directory, prefix="x") for f in frames]
+    paths = [p.path for p in pending]
+    for save in (io.save_signal, io.save_raw, io.save_chunked):
+        paths += [save(f, 1000.0, directory, prefix="x") for f in frames]
+    io.flush_saves()
+
+    assert len(set(paths)) == len(paths)
+    for i, path in enumerate(paths):
+        assert np.array_equal(io.load_signal(path, volts=False)[0], frames[i % 3])
+
+    with pytest.raises(ValueError):
+        io.save_raw(np.array([-1]), 1000.0, directory, prefix="x")
+    assert not [name for name in os.listdir(directory) if name.endswith(".tmp")]
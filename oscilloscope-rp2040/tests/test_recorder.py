@@ -0,0 +1,117 @@
+import os
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+from sysaudio import io, recorder
+
+
+def test_stream_recorder_round_trip_and_recovery(tmp_path: Path) -> None:
+    """
+    Checks that streamed frames end up unchanged in the finalized archive,
+    and that a session that was never closed cleanly can be recovered.
+    """
+    frames = [np.arange(i * 64, (i + 1) * 64, dtype=np.uint16) for i in range(50)]
+
+    with recorder.StreamRecorder(str(tmp_path), 1000.0, queue_frames=4) as rec:
+        for frame in frames:
+            rec.write(frame)
+        rec.update_metadata(notes="ok")
+    path = rec.close()  # Already finalized: nothing left to do
+    assert path is not None and not os.path.exists(rec.raw_path)
+
+    signal, fs = io.load_signal(path, volts=False)
+    assert fs == 1000.0
+    assert np.array_equal(signal, np.concatenate(frames))
+    assert io.load_metadata(path)["notes"] == "ok"
+
+    # Simulated crash: finalize while the writer is still open
+    crashed = recorder.StreamRecorder(
+        str(tmp_path), 1000.0, prefix="crash", fsync_interval=0.0
+    )
+    crashed.write(frames[0])
+    while os.path.getsize(crashed.raw_path) < frames[0].nbytes:
+        time.sleep(0.001)
+    recovered = recorder.finalize_raw(crashed.raw_path, remove=False)
+    assert io.load_metadata(recovered)["recovered"]
+    assert np.array_equal(io.load_signal(recovered, volts=False)[0], frames[0])
+    crashed.discard()
+    assert not os.path.exists(crashed.header_path)
+
+
+def test_segmented_session_reads_as_one_signal(tmp_path: Path) -> None:
+    """
+    Checks that a segmented session splits frames at exact segment
+    boundaries, compresses finished segments, records gaps, opens lazily
+    through its manifest as one signal, and loads fully via load_signal.
+    """
+    frames = [np.arange(i * 300, (i + 1) * 300, dtype=np.uint16) for i in range(10)]
+    with recorder.SegmentedRecorder(
+        str(tmp_path), 1000.0, segment_seconds=1.0, notes="ok"
+    ) as rec:
+        for i, frame in enumerate(frames):
+            rec.write(frame, gap=300 if i == 4 else 0)
+    manifest = io.read_manifest(rec.manifest_path)
+    assert manifest["complete"]
+    assert [s["samples"] for s in manifest["segments"]] == [1000, 1000, 1000]
+    assert all(s["file"].endswith(io.CHUNKED_SUFFIX) for s in manifest["segments"])
+    assert manifest["gaps"] == [{"offset": 1200, "samples": 300}]
+    assert io.load_metadata(rec.manifest_path)["notes"] == "ok"
+
+    expected = np.concatenate(frames)
+    with io.open_session(rec.manifest_path) as session:
+        assert session.fs == 1000.0 and len(session) == expected.size
+        assert np.array_equal(session[950:2100], expected[950:2100])
+        assert session[-1] == expected[-1]
+        assert np.array_equal(np.asarray(session), expected)
+
+    # load_signal() materializes a real array in the requested unit
+    signal, fs = io.load_signal(rec.manifest_path, volts=False)
+    assert type(signal) is np.ndarray and fs == 1000.0
+    assert np.array_equal(signal, expected)
+    volts, _ = io.load_signal(rec.manifest_path, volts=True)
+    assert np.allclose(volts, expected * io.ADC_SCALE)
+
+
+def test_recorders_started_together_never_share_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Checks that recorders started at the same instant with the same prefix
+    each get their own files, and that finalize_raw still recovers the
+    prefix from the longer names.
+    """
+
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz: Any = None) -> "FrozenDatetime":
+            return cls(2024, 1, 2, 3, 4, 5, 678901)
+
+    monkeypatch.setattr(io, "datetime", FrozenDatetime)
+    frame = np.arange(64, dtype=np.uint16)
+
+    first = recorder.StreamRecorder(str(tmp_path), 1000.0, fsync_interval=0.0)
+    second = recorder.StreamRecorder(str(tmp_path), 1000.0, fsync_interval=0.0)
+    assert first.raw_path != second.raw_path
+    assert first.header_path != second.header_path
+    first.write(frame)
+    second.write(frame[::-1].copy())
+    for rec, expected in ((first, frame), (second, frame[::-1])):
+        path = rec.close()
+        assert path is not None
+        assert re.fullmatch(
+            r"session_20240102_030405_678901(_\d+)?\.npz", os.path.basename(path)
+        )
+        assert np.array_equal(io.load_signal(path, volts=False)[0], expected)
+
+    sessions = [recorder.SegmentedRecorder(str(tmp_path), 1000.0) for _ in range(2)]
+    assert sessions[0].session_dir != sessions[1].session_dir
+    for i, session in enumerate(sessions):
+        session.write(frame + i)
+    for i, session in enumerate(sessions):
+        manifest = session.close()
+        assert np.array_equal(io.load_signal(manifest, volts=False)[0], frame + i)
@@ -0,0 +1,73 @@
+import threading
+from multiprocessing import shared_memory
+from typing import List
+
+import numpy as np
+from sysaudio import service, virtual
+
+
+def test_shared_ring_fan_out() -> None:
+    """
+    Checks that two readers see the published frames independently and that
+    a reader lapped by the writer counts overruns instead of blocking it.
+    """
+    device = virtual.VirtualDAQ(realtime=False, seed=0)
+    with service.AcquisitionService(
+        device.interface(), name="sysaudio_test", n_slots=4, frame_size=8
+    ) as svc:
+        fast = service.SharedStreamReader("sysaudio_test")
+        slow = service.SharedStreamReader("sysaudio_test")
+        fast_stream = fast.stream_generator(copy=False)
+
+        for i in range(10):
+            svc.publish(np.full(8, i, dtype=np.uint16), seq=i)
+            frame = next(fast_stream)
+            assert frame[0] == i
+            assert not frame.flags.writeable
+            assert fast.valid()
+        for i in range(10, 14):
+            svc.publish(np.full(8, i, dtype=np.uint16), seq=i)
+        assert not fast.valid()  # The last view's slot was reused
+
+        svc.header[service._H_CLOSED] = 1
+        seen = [int(f[0]) for f in slow.stream_generator()]
+        assert seen == [11, 12, 13]
+        assert slow.overruns == 11
+        assert fast.overruns == 0
+
+        fast_stream.close()
+        fast.close()
+        slow.close()
+    device.close()
+
+
+def test_service_runs_device_and_replaces_stale_segment() -> None:
+    """
+    Leaves a segment behind as a crashed service would, then runs a service
+    on the emulator under the same name and reads its frames from a reader
+    on another thread.
+    """
+    name = "sysaudio_test_run"
+    stale = shared_memory.SharedMemory(name=name, create=True, size=64)
+    stale.close()  # Not unlinked: the segment outlives its creator
+
+    device = virtual.VirtualDAQ(realtime=False, seed=0)
+    with device.interface() as dev:
+        with service.AcquisitionService(dev, name=name, n_slots=512) as svc:
+            reader = service.SharedStreamReader(name)
+            assert reader.fs == dev.fs
+            frames: List[np.ndarray] = []
+            consumer = threading.Thread(
+                target=lambda: frames.extend(reader.stream_generator())
+            )
+            consumer.start()
+            svc.run(duration=0.2)
+            consumer.join(timeout=5.0)
+
+            stats = reader.stats()
+            assert not consumer.is_alive() and reader.closed
+            assert len(frames) + reader.overruns == stats["written"] > 0
+            assert stats["last_seq"] == stats["written"] - 1  # Gapless
+            assert frames[0].flags.writeable  # Private copies by default
+            reader.close()
+    device.close()
@@ -0,0 +1,567 @@
+import asyncio
+import os
+import time
+from contextlib import aclosing
+from io import BytesIO
+from pathlib import Path
+from typing import Any, List, Tuple, cast
+
+import numpy as np
+import pytest
+import serial
+from sysaudio import asyncdaq, config, daq, io, multidaq, virtual
+
+
+def test_burst_and_stream_round_trip() -> None:
+    """
+    Ensures DAQInterface reads full frames from the firmware emulator,
+    including when the link returns short reads.
+    """
+    emulator = virtual.VirtualDAQ(realtime=False, short_read_prob=0.5, seed=0)
+    with emulator.interface() as device:
+        burst = device.capture_burst()
+        assert burst.shape == (config.BURST_SAMPLES,)
+        assert burst.dtype == np.dtype("<u2")
+
+        stream = device.pipelined_stream(depth=4)
+        frames = [next(stream) for _ in range(10)]
+        stream.close()
+        assert all(f.shape == (config.LIVE_SAMPLES,) for f in frames)
+    emulator.close()
+
+
+def test_pipelining_hides_round_trips() -> None:
+    """
+    Checks that queued 'v' requests raise the duty cycle over a link with
+    latency, and that closing a stream mid-flight drains the responses
+    still queued so the next command reads its own reply.
+    """
+    device = virtual.VirtualDAQ(latency=0.005, seed=0)
+    with device.interface() as dev:
+        serial_duty = dev.measure_duty_cycle(depth=1, duration=0.3)["duty_cycle"]
+        piped_duty = dev.measure_duty_cycle(depth=4, duration=0.3)["duty_cycle"]
+        assert piped_duty > serial_duty
+
+        stream = dev.pipelined_stream(depth=4)
+        next(stream)
+        stream.close()
+        assert dev.capture_burst(100).size == 100
+        assert dev.ser is not None and dev.ser.in_waiting == 0
+    device.close()
+
+
+def test_continuous_stream_is_gapless() -> None:
+    """
+    Verifies that sequence numbers from the 'c' protocol are contiguous
+    when the consumer keeps up, and that the stream stops cleanly.
+    """
+    emulator = virtual.VirtualDAQ(realtime=False, seed=0)
+    with emulator.interface() as device:
+        stream = device.continuous_stream()
+        seqs = [next(stream).seq for _ in range(20)]
+        stream.close()
+        assert seqs == list(range(20))
+        assert device.stream_stats["dropped"] == 0
+
+        # The device must be back in command mode after 'x'
+        assert device.capture_burst().size == config.BURST_SAMPLES
+    emulator.close()
+
+
+def test_filled_frames_do_not_share_memory() -> None:
+    """
+    Stalls the consumer until the emulator drops frames and checks that
+    fill_gaps=True yields gapless sequence numbers with a separate mid-rail
+    array per filled frame, so modifying one leaves the others intact.
+    """
+    emulator = virtual.VirtualDAQ(realtime=False, seed=0)
+    with emulator.interface() as device:
+        stream = device.continuous_stream(fill_gaps=True)
+        frames = [next(stream)]
+        time.sleep(0.5)  # Host buffer overflows: the emulator drops frames
+        while sum(f.filled for f in frames) < 2 and len(frames) < 10000:
+            frames.append(next(stream))
+        stream.close()
+        assert [f.seq for f in frames] == list(range(len(frames)))
+
+        filled = [f.samples for f in frames if f.filled]
+        assert len(filled) == 2
+        filled[0][:] = 0
+        assert all(np.all(s == config.ADC_MID_VAL) for s in filled[1:])
+    emulator.close()
+
+
+def test_frame_header_parsing_resyncs() -> None:
+    """
+    Parses continuous-mode headers from a byte stream: garbage before the
+    magic word is skipped, legacy and stamped headers are both decoded, and
+    a truncated header reads as a timeout.
+    """
+    legacy = daq.FRAME_HEADER.pack(daq.FRAME_MAGIC, 64, 7, 1000)
+    stamped = daq.FRAME_HEADER.pack(daq.FRAME_MAGIC_STAMPED, 64, 8, 2000)
+    stamped += daq.FRAME_TICKS_END.pack(2650)
+    # A magic word with an impossible length must not be taken as a header
+    bogus = daq.FRAME_HEADER.pack(daq.FRAME_MAGIC, 0, 0, 0)
+
+    dev = daq.DAQInterface()
+    dev.ser = cast(
+        Any, BytesIO(b"\x5a\xa5\x00" + bogus + legacy + stamped + legacy[:5])
+    )
+    assert dev._read_frame_header() == (daq.FRAME_MAGIC, 64, 7, 1000, None)
+    assert dev.stream_stats["resyncs"] == 1
+    header = dev._read_frame_header()
+    assert header == (daq.FRAME_MAGIC_STAMPED, 64, 8, 2000, 2650)
+    assert dev._read_frame_header() is None
+
+
+def test_packed_transport_is_lossless() -> None:
+    """
+    Checks that 12-bit packing restores read_u16() values exactly and that
+    every acquisition path decodes it.
+    """
+    codes = virtual.volts_to_adc(np.linspace(0.0, config.V_REF, 1001))
+    packed = daq.pack12(codes)
+    assert len(packed) == daq.payload_bytes(codes.size, daq.PACKING_12BIT)
+    assert np.array_equal(daq.unpack12(packed, codes.size), codes)
+
+    device = virtual.VirtualDAQ(realtime=False, short_read_prob=0.5, seed=0)
+    with device.interface() as dev:
+        dev.set_packing(daq.PACKING_12BIT)
+        burst = dev.capture_burst(1001)
+        assert burst.size == 1001
+        # read_u16() replicates the top nibble into the low nibble
+        assert np.array_equal(burst & 0x0F, burst >> 12)
+
+        stream = dev.continuous_stream()
+        seqs = [next(stream).seq for _ in range(5)]
+        stream.close()
+        assert seqs == list(range(5))
+    assert dev.packing == daq.PACKING_RAW16
+    device.close()
+
+
+def test_pack12_edge_cases() -> None:
+    """
+    Round-trips odd and tiny sample counts and the full code range through
+    12-bit packing, and rejects truncated payloads.
+    """
+    full_scale = virtual.volts_to_adc(np.array([0.0, config.V_REF, 0.0]))
+    for codes in (full_scale[:1], full_scale, virtual.WaveSource().read(7)):
+        packed = daq.pack12(codes)
+        assert len(packed) == daq.payload_bytes(codes.size, daq.PACKING_12BIT)
+        # Odd counts pad the last pair; the padding must not leak into `out`
+        out = np.full(codes.size, 0xFFFF, dtype="<u2")
+        assert daq.unpack12(packed, codes.size, out) is out
+        assert np.array_equal(out, codes)
+    assert daq.pack12(full_scale[:0]) == b""
+    assert daq.unpack12(b"", 0).size == 0
+
+    with pytest.raises(ValueError, match="Truncated"):
+        daq.unpack12(packed[:-1], codes.size)
+
+
+def test_delta_transport_is_lossless() -> None:
+    """
+    Checks the delta/varint encoding on worst-case steps and a smooth sine,
+    and that every acquisition path decodes it.
+    """
+    rng = np.random.default_rng(0)
+    steps = virtual.volts_to_adc(rng.choice([0.0, config.V_REF], 1000))
+    for codes in (steps, virtual.WaveSource().read(4096)):
+        payload = daq.pack_delta(codes)
+        assert len(payload) <= daq.payload_bytes(codes.size, daq.PACKING_DELTA)
+        assert np.array_equal(daq.unpack_delta(payload, codes.size), codes)
+    # 440 Hz at half swing moves < 64 codes per sample: 1 byte each, plus
+    # one extra byte for the absolute first code
+    assert len(payload) == daq.DELTA_PREFIX.size + codes.size + 1
+
+    device = virtual.VirtualDAQ(realtime=False, short_read_prob=0.5, seed=0)
+    with device.interface() as dev:
+        dev.set_packing(daq.PACKING_DELTA)
+        burst = dev.capture_burst(1001)
+        assert np.array_equal(burst & 0x0F, burst >> 12)
+
+        stream = dev.continuous_stream()
+        seqs = [next(stream).seq for _ in range(5)]
+        stream.close()
+        assert seqs == list(range(5))
+
+        frames = dev.threaded_stream()
+        assert next(frames).size == config.LIVE_SAMPLES
+        frames.close()
+    device.close()
+
+
+def test_delta_edge_cases() -> None:
+    """
+    Round-trips full-scale jumps, odd and empty sample counts through the
+    delta/varint encoding, and rejects truncated or inconsistent payloads.
+    """
+    full_scale = virtual.volts_to_adc(np.array([config.V_REF, 0.0, config.V_REF]))
+    for codes in (full_scale[:0], full_scale[:1], full_scale):
+        payload = daq.pack_delta(codes)
+        assert len(payload) <= daq.payload_bytes(codes.size, daq.PACKING_DELTA)
+        assert np.array_equal(daq.unpack_delta(payload, codes.size), codes)
+    # Every full-scale step needs the 2-byte varint
+    assert len(payload) == daq.DELTA_PREFIX.size + 2 * codes.size
+
+    overstated = daq.DELTA_PREFIX.pack(len(payload)) + payload[2:] + b"\x00"
+    for bad in (payload[:1], payload[:-1], overstated):
+        with pytest.raises(ValueError, match="Corrupt delta payload"):
+            daq.unpack_delta(bad, codes.size)
+    with pytest.raises(ValueError, match="Corrupt delta payload"):
+        daq.unpack_delta(payload, codes.size + 1)
+
+
+def test_telemetry_is_recorded_and_saved(tmp_path: Path) -> None:
+    """
+    Checks that reads are counted by DAQInterface.telemetry and that the
+    snapshot round-trips through save_signal metadata.
+    """
+    device = virtual.VirtualDAQ(realtime=False, seed=0)
+    with device.interface() as dev:
+        stream = dev.pipelined_stream(depth=2)
+        for _ in range(10):
+            next(stream)
+        stream.close()
+        stats = dev.telemetry.snapshot()
+    device.close()
+
+    assert stats["frames"] == 10
+    assert stats["bytes"] == 10 * config.LIVE_SAMPLES * 2
+    assert sum(stats["latency_hist_log2_us"]) == stats["reads"]
+
+    path = io.save_signal(np.zeros(8), 1.0, str(tmp_path), telemetry=stats)
+    assert io.load_metadata(path)["telemetry"] == stats
+
+
+def test_async_interface_overlaps_reads() -> None:
+    """
+    Runs AsyncDAQInterface against the emulator while another coroutine
+    ticks, checking that frame reads do not block the event loop.
+    """
+
+    async def run() -> Tuple[int, int]:
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0)
+
+        device = virtual.VirtualDAQ(realtime=False, seed=0)
+        task = asyncio.create_task(ticker())
+        async with asyncdaq.AsyncDAQInterface(transport=device) as dev:
+            burst = await dev.capture_burst(256, decimation=2)
+            async with aclosing(dev.stream(depth=2)) as stream:
+                n = 0
+                async for chunk in stream:
+                    assert chunk.size == config.LIVE_SAMPLES
+                    n += 1
+                    if n == 5:
+                        break
+        stop.set()
+        await task
+        device.close()
+        return burst.size, ticks
+
+    size, ticks = asyncio.run(run())
+    assert size == 256
+    assert ticks > 0
+
+
+def test_async_stream_resyncs_after_corrupt_frame() -> None:
+    """
+    Corrupts the delta-packed stream while replies are in flight and checks
+    that AsyncDAQInterface drains them before re-priming, so it resyncs
+    once and every later frame decodes.
+    """
+
+    async def run() -> Tuple[int, List[np.ndarray]]:
+        emulator = virtual.VirtualDAQ(latency=0.002, seed=0)
+        async with asyncdaq.AsyncDAQInterface(transport=emulator) as device:
+            device.device.set_packing(daq.PACKING_DELTA)
+            frames = []
+            async with aclosing(device.stream(depth=4)) as stream:
+                async for chunk in stream:
+                    frames.append(chunk)
+                    if len(frames) == 1:
+                        emulator._queue(b"\xff" * 7)  # Line noise mid-stream
+                    if len(frames) == 10:
+                        break
+            resyncs = device.resyncs
+        emulator.close()
+        return resyncs, frames
+
+    resyncs, frames = asyncio.run(run())
+    assert resyncs == 1
+    for frame in frames:
+        # read_u16() replicates the top nibble into the low nibble
+        assert np.array_equal(frame & 0x0F, frame >> 12)
+
+
+def test_async_interface_restores_blocking_port(tmp_path: Path) -> None:
+    """
+    Runs AsyncDAQInterface on a real serial port (the emulator's pty) and
+    checks that the cached port is handed back to the next synchronous
+    DAQInterface in the blocking mode it had before.
+    """
+    emulator = virtual.VirtualDAQ(realtime=False, seed=0)
+    port = emulator.open_pty()
+
+    async def run() -> None:
+        async with asyncdaq.AsyncDAQInterface(port=port) as device:
+            assert (await device.capture_burst(256)).size == 256
+
+    try:
+        with daq.DAQInterface(port) as device:
+            ser = device.ser
+            assert ser is not None
+            os.set_blocking(ser.fileno(), True)
+        asyncio.run(run())
+        assert daq._connections[port] is ser
+        assert os.get_blocking(ser.fileno())
+        with daq.DAQInterface(port) as device:
+            assert device.ser is ser
+            assert device.capture_burst().size == config.BURST_SAMPLES
+    finally:
+        daq.close_cached_connections()
+        emulator.close()
+
+
+def test_pool_captures_all_channels_and_estimates_skew() -> None:
+    """
+    Captures from two emulated boards whose sources are offset by a known
+    number of samples and checks the cross-correlation skew estimate.
+    """
+    ref = virtual.VirtualDAQ(realtime=False, seed=0)
+    delayed = virtual.VirtualDAQ(realtime=False, seed=1)
+    delayed.source.skip(37)  # The second board runs 37 samples ahead
+
+    pool = multidaq.DAQPool(["ref", "dut"], transports=[ref, delayed])
+    with pool:
+        result = pool.capture_burst(4096, max_lag=100)
+        stream = pool.stream()
+        frame = next(stream)
+        stream.close()
+
+    assert result["data"].shape == (2, 4096)
+    assert list(result["skew_samples"]) == [0, -37]
+    assert frame.shape == (2, config.LIVE_SAMPLES)
+    ref.close()
+    delayed.close()
+
+
+def test_rate_reduction_reports_effective_fs() -> None:
+    """
+    Checks that set_rate() is acknowledged by the emulator, that frames keep
+    their size, and that the interface reports the reduced sampling rate.
+    """
+    device = virtual.VirtualDAQ(realtime=False, seed=0)
+    with device.interface() as dev:
+        fs = dev.set_rate(8, daq.RATE_AVERAGE)
+        assert fs == dev.fs == config.FS_DEFAULT / 8
+        assert dev.capture_burst(512).size == 512
+
+        stream = dev.continuous_stream()
+        frame = next(stream)
+        stream.close()
+        assert frame.samples.size == config.LIVE_SAMPLES
+    assert dev.rate_factor == 1  # Restored on disconnect
+    device.close()
+
+
+def test_slow_bursts_extend_the_read_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Captures bursts that take several read timeouts at a high rate factor,
+    from the sync and async interfaces, against a realtime emulator.
+    """
+    monkeypatch.setattr(config, "TIMEOUT", 0.2)
+    device = virtual.VirtualDAQ(realtime=True, seed=0, timeout=config.TIMEOUT)
+    with device.interface() as dev:
+        dev.set_rate(64)
+        assert dev.burst_timeout(1024) > 1024 * 64 / config.FS_DEFAULT
+        assert dev.capture_burst(1024).size == 1024
+        assert dev.capture_burst(512, decimation=64).size == 512
+        assert dev.ser is not None and dev.ser.timeout == config.TIMEOUT
+    device.close()
+
+    async def run() -> int:
+        device = virtual.VirtualDAQ(realtime=True, seed=0, timeout=config.TIMEOUT)
+        async with asyncdaq.AsyncDAQInterface(transport=device) as dev:
+            dev.device.set_rate(64)
+            size = (await dev.capture_burst(1024)).size
+        device.close()
+        return size
+
+    assert asyncio.run(run()) == 1024
+
+
+def test_connect_handshake_reuse_and_failed_setup(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Connects over a pty: the handshake identifies the firmware, a released
+    port is reused from the cache, a port in use is refused, and a failed
+    handshake closes the handle without caching or registering the port.
+    """
+    emulator = virtual.VirtualDAQ(realtime=False, seed=0)
+    port = emulator.open_pty()
+    try:
+        with daq.DAQInterface(port, reuse=True) as device:
+            assert device.identity.startswith("SYSAUDIO-DAQ")
+            first = device.ser
+            with pytest.raises(IOError, match="already in use"):
+                daq.DAQInterface(port).connect()
+        assert port in daq._connections and port not in daq._active_ports
+
+        with daq.DAQInterface(port, reuse=True) as device:
+            assert device.ser is first
+            assert device.identity.startswith("SYSAUDIO-DAQ")
+        daq.close_cached_connections()
+
+        opened: List[Any] = []
+
+        def unplugged(self: daq.DAQInterface, timeout: float = 0.0) -> None:
+            opened.append(self.ser)
+            raise serial.SerialException("device disconnected")
+
+        with monkeypatch.context() as m:
+            m.setattr(daq.DAQInterface, "_handshake", unplugged)
+            with pytest.raises(serial.SerialException):
+                daq.DAQInterface(port, reuse=True).connect()
+        assert not opened[0].is_open
+        assert port not in daq._connections and port not in daq._active_ports
+
+        with daq.DAQInterface(port, reuse=True) as device:
+            assert device.capture_burst(256).size == 256
+    finally:
+        daq.close_cached_connections()
+        emulator.close()
+
+
+def test_failed_config_defaults_release_the_port(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    An invalid config.RATE_FACTOR fails connect() after packing was already
+    switched: the port must not stay registered or cached, and the firmware
+    must be back in its default modes for the next connection.
+    """
+    emulator = virtual.VirtualDAQ(realtime=False, seed=0)
+    port = emulator.open_pty()
+    try:
+        with monkeypatch.context() as m:
+            m.setattr(config, "PACKED_TRANSPORT", True)
+            m.setattr(config, "RATE_FACTOR", 1000)
+            with pytest.raises(ValueError, match="Rate factor"):
+                with daq.DAQInterface(port, reuse=True):
+                    pass
+        assert port not in daq._active_ports and port not in daq._connections
+
+        # A raw burst would time out if the firmware were still packing
+        with daq.DAQInterface(port, reuse=True) as device:
+            assert device.capture_burst(256).size == 256
+        assert emulator.packing == daq.PACKING_RAW16
+    finally:
+        daq.close_cached_connections()
+        emulator.close()
+
+
+def test_disconnect_does_not_mask_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Breaks the link inside a ``with`` block that changed the firmware
+    rate: restoring the default must not replace the original exception,
+    and the port must be released and closed rather than cached.
+    """
+    emulator = virtual.VirtualDAQ(realtime=False, seed=0)
+    port = emulator.open_pty()
+
+    def unplugged(data: bytes) -> int:
+        raise serial.SerialException("device disconnected")
+
+    try:
+        with pytest.raises(RuntimeError, match="analysis failed"):
+            with daq.DAQInterface(port) as device:
+                device.set_rate(4)
+                ser = device.ser
+                assert ser is not None
+                monkeypatch.setattr(ser, "write", unplugged)
+                raise RuntimeError("analysis failed")
+        assert port not in daq._active_ports
+        assert port not in daq._connections
+        assert ser is not None and not ser.is_open
+    finally:
+        daq.close_cached_connections()
+        emulator.close()
+
+
+def test_device_trigger_starts_frames_on_edge() -> None:
+    """
+    Arms the emulated firmware trigger and checks that every 'v' frame
+    starts at a rising crossing of the trigger level.
+    """
+    device = virtual.VirtualDAQ(realtime=False, seed=0)
+    with device.interface() as dev:
+        ack = dev.set_trigger(level=config.V_MID, slope="rising")
+        assert ack["slope"] == daq.TRIGGER_SLOPES["rising"]
+
+        stream = dev.stream_generator()
+        frames = [next(stream) for _ in range(5)]
+        stream.close()
+    assert dev.trigger is None  # Cleared on disconnect
+    device.close()
+
+    for frame in frames:
+        assert frame[0] >= config.ADC_MID_VAL
+        assert frame[1] > frame[0]  # Still rising right after the crossing
+
+
+def test_device_trigger_follows_rate_reduction() -> None:
+    """
+    Arms the trigger at a reduced rate: the edge must still be found at the
+    native rate (frame[0] within one conversion of the level) while the
+    frame itself is decimated, as the firmware does.
+    """
+    device = virtual.VirtualDAQ(realtime=False, seed=0)
+    with device.interface() as dev:
+        fs = dev.set_rate(8, daq.RATE_DECIMATE)
+        level = dev.set_trigger(level=config.V_MID, slope="rising")["level"]
+        stream = dev.stream_generator()
+        frames = [next(stream).astype(np.int32) for _ in range(5)]
+        stream.close()
+    device.close()
+
+    # Steepest code step between native conversions of the 440 Hz test tone
+    amp = 0.5 * config.ADC_MAX_VAL / 2
+    native_step = 2 * np.pi * 440.0 * amp / config.FS_DEFAULT
+    for frame in frames:
+        assert level <= frame[0] <= level + native_step
+        rising = np.flatnonzero((frame[:-1] < level) & (frame[1:] >= level))
+        assert np.median(np.diff(rising)) == pytest.approx(fs / 440.0, abs=1)
+
+
+def test_mcu_timestamps_measure_fs() -> None:
+    """
+    Runs the emulated ADC slower than config.FS_DEFAULT and checks that
+    stamped bursts and continuous frames report the actual rate.
+    """
+    true_fs = config.FS_DEFAULT * 0.97
+    device = virtual.VirtualDAQ(fs=true_fs, realtime=False, seed=0)
+    with device.interface() as dev:
+        dev.set_timestamps()
+        dev.capture_burst(4096)
+        assert dev.measured_fs == pytest.approx(true_fs, rel=1e-3)
+
+        stream = dev.continuous_stream()
+        frames = [next(stream) for _ in range(3)]
+        stream.close()
+    assert not dev.stamps  # Disabled on disconnect
+    device.close()
+
+    for frame in frames:
+        assert frame.fs == pytest.approx(true_fs, rel=1e-3)
+        elapsed = (frame.ticks_end_us - frame.ticks_us) % config.TICKS_PERIOD
+        assert elapsed > 0